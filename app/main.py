@@ -1,14 +1,12 @@
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
-import pandas as pd
 import streamlit as st
 
 from app.models.state import AnalysisSelection, SessionSelection
 from app.plots.comparison import (
-    export_data_for_analysis,
     figure_to_png_bytes,
     plot_corner_annotated_speed_trace,
+    plot_cross_year_comparison,
     plot_fastest_lap,
     plot_fastest_sectors,
     plot_full_telemetry,
@@ -23,17 +21,37 @@ from app.plots.comparison import (
     plot_team_pace,
     plot_tyre_strategy,
 )
+from app.plots.interactive import build_interactive_chart
+from app.plots.qualifying import plot_ideal_lap
+from app.plots.race import (
+    plot_pit_stops,
+    plot_race_events,
+    plot_race_trace,
+    plot_stint_pace,
+)
+from app.plots.rendering import enforce_artist_budget
+from app.plots.season import plot_season_overview
+from app.plots.track import plot_corner_comparison, plot_speed_heatmap
+from app.services.datasets import (
+    dataframe_to_csv_bytes,
+    dataframe_to_parquet_bytes,
+    prepare_dataset,
+)
 from app.services.sessions import (
     get_available_events,
     get_drivers_in_session,
     get_session,
 )
+from app.ui.admin import ADMIN_ENABLED, render_admin_page
 from app.ui.controls import (
     get_analysis_options,
     render_analysis_controls,
     render_driver_controls,
     render_session_controls,
 )
+from app.ui.dashboard import render_dashboard
+from app.ui.history import render_history_panel
+from app.ui.live import render_live_mode
 from app.ui.summary import render_session_summary
 from app.utils.validation import validate_analysis_selection
 
@@ -46,10 +64,19 @@ PLOT_HANDLERS = {
     "Full Telemetry": plot_full_telemetry,
     "Gear Shifts On Track": plot_gear_shifts_on_track,
     "Corner-Annotated Speed Trace": plot_corner_annotated_speed_trace,
+    "Corner Comparison": plot_corner_comparison,
+    "Cross-Year Comparison": plot_cross_year_comparison,
+    "Ideal Lap Leaderboard": plot_ideal_lap,
     "Qualifying Overview": plot_qualifying_overview,
     "Speed Map": plot_speed_map,
+    "Speed Heatmap": plot_speed_heatmap,
+    "Season Overview": plot_season_overview,
     "Lap Time Distribution": plot_lap_distribution,
+    "Overtakes and Battles": plot_race_events,
+    "Pit Stop Analysis": plot_pit_stops,
     "Position Changes": plot_position_changes,
+    "Race Trace": plot_race_trace,
+    "Stint Pace Model": plot_stint_pace,
     "Team Pace Comparison": plot_team_pace,
     "Tyre Strategy": plot_tyre_strategy,
     "Weather and Track Evolution": plot_weather_track_evolution,
@@ -61,81 +88,135 @@ def render_plot(session, selection: AnalysisSelection):
         lap_selection = (
             "fastest"
             if selection.use_fastest_laps
-            else (selection.driver1_lap, selection.driver2_lap)
-        )
-        return plot_fastest_sectors(
-            session, selection.driver1_code, selection.driver2_code, lap_selection
+            else selection.driver_laps
         )
+        return plot_fastest_sectors(session, selection.driver_codes, lap_selection)
 
     if selection.analysis_type == "Speed Map":
         return plot_speed_map(session, selection.driver_for_map)
 
+    if selection.analysis_type == "Speed Heatmap":
+        return plot_speed_heatmap(session, selection.heatmap_drivers)
+
     if selection.analysis_type == "Gear Shifts On Track":
         return plot_gear_shifts_on_track(session, selection.driver_for_map)
 
     if selection.analysis_type == "Corner-Annotated Speed Trace":
         return plot_corner_annotated_speed_trace(session, selection.driver_for_map)
 
+    if selection.analysis_type == "Corner Comparison":
+        return plot_corner_comparison(
+            session, selection.corner, selection.corner_metric
+        )
+
+    if selection.analysis_type == "Cross-Year Comparison":
+        return plot_cross_year_comparison(
+            session, selection.session_type, selection.compare_years
+        )
+
     if selection.analysis_type == "Lap Time Distribution":
-        return plot_lap_distribution(session)
+        return plot_lap_distribution(session, selection.lap_filter)
 
     if selection.analysis_type == "Position Changes":
         return plot_position_changes(session)
 
+    if selection.analysis_type == "Overtakes and Battles":
+        return plot_race_events(session)
+
+    if selection.analysis_type == "Pit Stop Analysis":
+        return plot_pit_stops(session)
+
+    if selection.analysis_type == "Race Trace":
+        return plot_race_trace(session)
+
+    if selection.analysis_type == "Stint Pace Model":
+        return plot_stint_pace(
+            session,
+            selection.start_fuel_kg,
+            selection.fuel_seconds_per_kg,
+            selection.lap_filter,
+        )
+
+    if selection.analysis_type == "Ideal Lap Leaderboard":
+        return plot_ideal_lap(session)
+
     if selection.analysis_type == "Qualifying Overview":
         return plot_qualifying_overview(session)
 
     if selection.analysis_type == "Team Pace Comparison":
-        return plot_team_pace(session)
+        return plot_team_pace(session, selection.lap_filter)
 
     if selection.analysis_type == "Tyre Strategy":
         return plot_tyre_strategy(session)
 
+    if selection.analysis_type == "Season Overview":
+        return plot_season_overview(session)
+
     if selection.analysis_type == "Weather and Track Evolution":
         return plot_weather_track_evolution(session)
 
     handler = PLOT_HANDLERS[selection.analysis_type]
-    return handler(session, selection.driver1_code, selection.driver2_code)
-
-
-def dataframe_to_csv_bytes(df: pd.DataFrame) -> bytes:
-    export_df = df.copy()
-    for column in export_df.columns:
-        if pd.api.types.is_timedelta64_dtype(export_df[column]):
-            export_df[column] = export_df[column].astype(str)
-    return export_df.to_csv(index=False).encode("utf-8")
+    return handler(session, selection.driver_codes)
 
 
 def render_export_actions(session, selection: AnalysisSelection, fig):
-    export_col1, export_col2 = st.columns(2)
-    png_bytes = figure_to_png_bytes(fig)
+    export_col1, export_col2, export_col3 = st.columns(3)
+    file_stem = selection.analysis_type.lower().replace(" ", "_")
     with export_col1:
-        st.download_button(
-            "Download PNG",
-            data=png_bytes,
-            file_name=f"{selection.analysis_type.lower().replace(' ', '_')}.png",
-            mime="image/png",
-            use_container_width=True,
-        )
+        if fig is not None:
+            st.download_button(
+                "Download PNG",
+                data=figure_to_png_bytes(fig),
+                file_name=f"{file_stem}.png",
+                mime="image/png",
+                use_container_width=True,
+            )
+        else:
+            st.button("Download PNG", disabled=True, use_container_width=True)
 
-    export_df = export_data_for_analysis(session, selection)
+    export_df = prepare_dataset(session, selection)
+    has_data = export_df is not None and not export_df.empty
     with export_col2:
-        if export_df is not None and not export_df.empty:
+        if has_data:
             st.download_button(
                 "Download CSV",
                 data=dataframe_to_csv_bytes(export_df),
-                file_name=f"{selection.analysis_type.lower().replace(' ', '_')}.csv",
+                file_name=f"{file_stem}.csv",
                 mime="text/csv",
                 use_container_width=True,
             )
         else:
             st.button("Download CSV", disabled=True, use_container_width=True)
 
+    parquet_bytes = dataframe_to_parquet_bytes(export_df) if has_data else None
+    with export_col3:
+        if parquet_bytes is not None:
+            st.download_button(
+                "Download Parquet",
+                data=parquet_bytes,
+                file_name=f"{file_stem}.parquet",
+                mime="application/vnd.apache.parquet",
+                use_container_width=True,
+            )
+        else:
+            st.button("Download Parquet", disabled=True, use_container_width=True)
+
 
 def main():
     st.set_page_config(page_title="F1 Session Analysis Dashboard", layout="wide")
     st.title("F1 Session Analysis Dashboard")
 
+    modes = ["Completed Session", "Live Replay"]
+    if ADMIN_ENABLED:
+        modes.append("Admin")
+    mode = st.radio("Mode", modes, horizontal=True, label_visibility="collapsed")
+    if mode == "Live Replay":
+        render_live_mode()
+        return
+    if mode == "Admin":
+        render_admin_page()
+        return
+
     col1, col2 = st.columns([1, 3])
 
     with col1:
@@ -169,28 +250,44 @@ def main():
             driver_selection = render_driver_controls(drivers_info)
 
         with analysis_tab:
-            analysis_options = get_analysis_options(session_selection.session_type)
+            analysis_options = get_analysis_options(session_selection.session_type, session)
             analysis_selection = render_analysis_controls(
                 session=session,
                 session_type=session_selection.session_type,
                 drivers_info=drivers_info,
-                driver1_name=driver_selection.driver1_name,
-                driver2_name=driver_selection.driver2_name,
+                driver_names=driver_selection.driver_names,
                 analysis_options=analysis_options,
             )
 
     with col2:
+        render_history_panel(session)
+
+        if analysis_selection.generate_plot and analysis_selection.dashboard_analyses:
+            render_dashboard(session, analysis_selection, render_plot)
+            return
+
         if analysis_selection.generate_plot:
             error = validate_analysis_selection(analysis_selection)
             if error:
                 st.error(error)
                 return
 
+            if analysis_selection.interactive:
+                try:
+                    data, spec = build_interactive_chart(session, analysis_selection)
+                    st.vega_lite_chart(data, spec, use_container_width=True)
+                    st.caption(f"{len(data):,} points sent to the browser")
+                    render_export_actions(session, analysis_selection, None)
+                except Exception as exc:
+                    st.error(f"Error generating chart: {exc}")
+                return
+
             with st.spinner("Generating plot..."):
                 try:
                     fig = render_plot(session, analysis_selection)
+                    artists = enforce_artist_budget(fig)
                     st.pyplot(fig, use_container_width=True)
+                    st.caption(f"{artists:,} matplotlib artists")
                     render_export_actions(session, analysis_selection, fig)
-                    plt.close(fig)
                 except Exception as exc:
                     st.error(f"Error generating plot: {exc}")
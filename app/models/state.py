@@ -12,18 +12,24 @@ class SessionSelection:
 
 @dataclass(frozen=True)
 class DriverSelection:
-    driver1_name: str
-    driver2_name: str
+    driver_names: tuple[str, ...]
 
 
 @dataclass(frozen=True)
 class AnalysisSelection:
     session_type: str
     analysis_type: str
-    driver1_code: str
-    driver2_code: str
+    driver_codes: tuple[str, ...]
     driver_for_map: str | None
     use_fastest_laps: bool
-    driver1_lap: int | None
-    driver2_lap: int | None
+    driver_laps: tuple[int | None, ...]
     generate_plot: bool
+    start_fuel_kg: float = 100.0
+    fuel_seconds_per_kg: float = 0.03
+    corner: str | None = None
+    corner_metric: str = "CornerTime"
+    heatmap_drivers: tuple[str, ...] = ()
+    lap_filter: str = "All Pace Laps"
+    compare_years: tuple[int, ...] = ()
+    dashboard_analyses: tuple[str, ...] = ()
+    interactive: bool = False
@@ -7,22 +7,52 @@ import matplotlib
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from fastf1 import plotting as ff1_plotting, utils
-from matplotlib import pyplot as plt
+from fastf1 import plotting as ff1_plotting
 from matplotlib.collections import LineCollection
-
-from app.services.sessions import get_driver_color, get_driver_style, get_team_color
-
-
-def plot_laptime(session, driver1, driver2):
-    laps_d1 = session.laps.pick_driver(driver1)
-    laps_d2 = session.laps.pick_driver(driver2)
-    style1 = get_driver_style(session, driver1, ["color", "linestyle"])
-    style2 = get_driver_style(session, driver2, ["color", "linestyle"])
-
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(laps_d1["LapNumber"], laps_d1["LapTime"], label=driver1, linewidth=2, **style1)
-    ax.plot(laps_d2["LapNumber"], laps_d2["LapTime"], label=driver2, linewidth=2, **style2)
+from matplotlib.colors import Normalize
+from matplotlib.lines import Line2D
+from matplotlib.patches import Rectangle
+
+from app.plots.rendering import (
+    batched_kde,
+    beeswarm_offsets,
+    draw_bars,
+    draw_markers,
+    draw_spans,
+    draw_violins,
+    merge_true_runs,
+    subplots,
+)
+from app.plots.track import draw_track_outline
+from app.services.cross_year import get_cross_year_laps
+from app.services.datasets import (
+    QUALIFYING_PARTS,
+    get_fastest_lap_telemetry,
+    get_pace_laps,
+    get_qualifying_times,
+    get_stint_table,
+)
+from app.services.driver_comparison import get_aligned_laps, get_driver_laps
+from app.services.race_trace import get_race_trace
+from app.services.sessions import (
+    get_compound_colors,
+    get_driver_color,
+    get_driver_colors,
+    get_driver_style,
+    get_team_color,
+)
+from app.services.track_geometry import get_track_geometry
+
+
+def plot_laptime(session, drivers):
+    laps = get_driver_laps(session.laps, drivers)
+
+    fig, ax = subplots(figsize=(12, 6))
+    for driver, driver_laps in laps.groupby("Driver", sort=False):
+        style = get_driver_style(session, driver, ["color", "linestyle"])
+        ax.plot(
+            driver_laps["LapNumber"], driver_laps["LapTime"], label=driver, linewidth=2, **style
+        )
     ax.set_xlabel("Lap Number")
     ax.set_ylabel("Lap Time")
     ax.legend()
@@ -30,17 +60,15 @@ def plot_laptime(session, driver1, driver2):
     return fig
 
 
-def plot_fastest_lap(session, driver1, driver2):
-    fastest_d1 = session.laps.pick_driver(driver1).pick_fastest()
-    fastest_d2 = session.laps.pick_driver(driver2).pick_fastest()
-    tel_d1 = fastest_d1.get_car_data().add_distance()
-    tel_d2 = fastest_d2.get_car_data().add_distance()
-    style1 = get_driver_style(session, driver1, ["color", "linestyle"])
-    style2 = get_driver_style(session, driver2, ["color", "linestyle"])
+def plot_fastest_lap(session, drivers):
+    aligned = get_aligned_laps(session, tuple(drivers))
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(tel_d1["Distance"], tel_d1["Speed"], label=driver1, linewidth=2, **style1)
-    ax.plot(tel_d2["Distance"], tel_d2["Speed"], label=driver2, linewidth=2, **style2)
+    fig, ax = subplots(figsize=(12, 6))
+    for row, driver in enumerate(aligned.drivers):
+        style = get_driver_style(session, driver, ["color", "linestyle"])
+        ax.plot(
+            aligned.distance, aligned.channels["Speed"][row], label=driver, linewidth=2, **style
+        )
     ax.set_xlabel("Distance (m)")
     ax.set_ylabel("Speed (km/h)")
     ax.legend()
@@ -50,76 +78,49 @@ def plot_fastest_lap(session, driver1, driver2):
     return fig
 
 
-def plot_fastest_sectors(session, driver1, driver2, lap_selection="fastest"):
-    laps = session.laps
-    if lap_selection == "fastest":
-        lap_d1 = laps.pick_driver(driver1).pick_fastest()
-        lap_d2 = laps.pick_driver(driver2).pick_fastest()
-    else:
-        lap_d1 = laps.pick_driver(driver1).pick_lap(lap_selection[0])
-        lap_d2 = laps.pick_driver(driver2).pick_lap(lap_selection[1])
-
-    tel_d1 = lap_d1.get_telemetry().add_distance().copy()
-    tel_d2 = lap_d2.get_telemetry().add_distance().copy()
-    tel_d1["Driver"] = driver1
-    tel_d2["Driver"] = driver2
-    telemetry = pd.concat([tel_d1, tel_d2], ignore_index=True)
+def plot_fastest_sectors(session, drivers, lap_selection="fastest"):
+    lap_numbers = None if lap_selection == "fastest" else tuple(lap_selection)
+    aligned = get_aligned_laps(session, tuple(drivers), lap_numbers)
+    drivers = aligned.drivers
 
+    # Fastest driver per minisector: least time between its boundaries
     total_minisectors = 25
-    telemetry["Minisector"] = (
-        pd.cut(telemetry["Distance"], total_minisectors, labels=False, duplicates="drop")
-        + 1
-    )
-
-    average_speed = (
-        telemetry.groupby(["Driver", "Minisector"], dropna=False)["Speed"]
-        .mean()
-        .reset_index()
-    )
-
-    speed_lookup = average_speed.pivot(
-        index="Minisector", columns="Driver", values="Speed"
-    )
-    valid_minisectors = speed_lookup.dropna(subset=[driver1, driver2]).index.tolist()
-    telemetry = telemetry[telemetry["Minisector"].isin(valid_minisectors)].copy()
-
-    telemetry["Fastest Driver"] = telemetry["Minisector"].map(
-        lambda sector: driver1
-        if speed_lookup.loc[sector, driver1] > speed_lookup.loc[sector, driver2]
-        else driver2
-    )
-    telemetry["Fastest Driver int"] = telemetry["Fastest Driver"].map(
-        {driver1: 1, driver2: 2}
+    minisector = np.minimum(
+        (aligned.distance / aligned.distance[-1] * total_minisectors).astype(int),
+        total_minisectors - 1,
     )
+    boundaries = np.r_[np.flatnonzero(np.diff(minisector)) + 1, len(minisector) - 1]
+    boundary_times = aligned.elapsed[:, np.r_[0, boundaries]]
+    minisector_times = np.diff(boundary_times, axis=1)
+    fastest_driver = np.argmin(minisector_times, axis=0)[minisector]
 
-    x = np.array(telemetry["X"].values)
-    y = np.array(telemetry["Y"].values)
+    geometry = get_track_geometry(session)
+    x, y = geometry.xy_at(aligned.distance / aligned.distance[-1] * geometry.length)
     points = np.array([x, y]).T.reshape(-1, 1, 2)
     segments = np.concatenate([points[:-1], points[1:]], axis=1)
 
-    colors = [
-        matplotlib.colors.to_rgb(get_team_color(session, driver1)),
-        matplotlib.colors.to_rgb(get_team_color(session, driver2)),
-    ]
+    colors = [matplotlib.colors.to_rgb(get_team_color(session, driver)) for driver in drivers]
     cmap = matplotlib.colors.ListedColormap(colors)
 
-    fig, ax = plt.subplots(figsize=(18, 10))
-    lc_comp = LineCollection(segments, norm=plt.Normalize(1, cmap.N + 1), cmap=cmap)
-    lc_comp.set_array(telemetry["Fastest Driver int"].to_numpy().astype(float))
+    fig, ax = subplots(figsize=(18, 10))
+    draw_track_outline(ax, geometry, linewidth=10)
+    lc_comp = LineCollection(segments, norm=Normalize(1, cmap.N + 1), cmap=cmap)
+    lc_comp.set_array(fastest_driver[:-1].astype(float) + 1)
     lc_comp.set_linewidth(5)
 
     ax.add_collection(lc_comp)
     ax.axis("equal")
     ax.tick_params(labelleft=False, left=False, labelbottom=False, bottom=False)
 
-    cbar = plt.colorbar(mappable=lc_comp, boundaries=np.arange(1, 4))
-    cbar.set_ticks([1.5, 2.5])
-    cbar.set_ticklabels([driver1, driver2])
+    cbar = fig.colorbar(lc_comp, ax=ax, boundaries=np.arange(1, len(drivers) + 2))
+    cbar.set_ticks(np.arange(len(drivers)) + 1.5)
+    cbar.set_ticklabels(drivers)
 
     lap_text = (
         "Fastest Laps"
         if lap_selection == "fastest"
-        else f"Laps: {driver1}:{lap_selection[0]}, {driver2}:{lap_selection[1]}"
+        else "Laps: "
+        + ", ".join(f"{driver}:{lap}" for driver, lap in zip(drivers, aligned.lap_numbers))
     )
     fig.suptitle(
         f"Fastest Sectors Comparison - {lap_text}\n"
@@ -128,21 +129,18 @@ def plot_fastest_sectors(session, driver1, driver2, lap_selection="fastest"):
     return fig
 
 
-def plot_full_telemetry(session, driver1, driver2):
-    fastest_d1 = session.laps.pick_driver(driver1).pick_fastest()
-    fastest_d2 = session.laps.pick_driver(driver2).pick_fastest()
-
-    tel_d1 = fastest_d1.get_car_data().add_distance()
-    tel_d2 = fastest_d2.get_car_data().add_distance()
-    delta_time, ref_tel, _ = utils.delta_time(fastest_d1, fastest_d2)
-
-    style1 = get_driver_style(session, driver1, ["color", "linestyle"])
-    style2 = get_driver_style(session, driver2, ["color", "linestyle"])
+def plot_full_telemetry(session, drivers):
+    aligned = get_aligned_laps(session, tuple(drivers))
+    delta_time = aligned.delta_to(0)
+    styles = [
+        get_driver_style(session, driver, ["color", "linestyle"]) for driver in aligned.drivers
+    ]
 
-    fig, axes = plt.subplots(6, 1, figsize=(12, 16), sharex=True)
-    axes[0].plot(ref_tel["Distance"], delta_time, linewidth=2, **style1)
+    fig, axes = subplots(6, 1, figsize=(12, 16), sharex=True)
+    for row in range(1, len(aligned.drivers)):
+        axes[0].plot(aligned.distance, delta_time[row], linewidth=2, **styles[row])
     axes[0].axhline(y=0, color="white", linestyle="-", alpha=0.5)
-    axes[0].set_ylabel("Delta (s)")
+    axes[0].set_ylabel(f"Delta to {aligned.drivers[0]} (s)")
 
     plot_pairs = [
         ("Speed", "Speed (km/h)"),
@@ -152,8 +150,14 @@ def plot_full_telemetry(session, driver1, driver2):
         ("nGear", "Gear"),
     ]
     for axis, (column, label) in zip(axes[1:], plot_pairs):
-        axis.plot(tel_d1["Distance"], tel_d1[column], linewidth=2, label=driver1, **style1)
-        axis.plot(tel_d2["Distance"], tel_d2[column], linewidth=2, label=driver2, **style2)
+        for row, driver in enumerate(aligned.drivers):
+            axis.plot(
+                aligned.distance,
+                aligned.channels[column][row],
+                linewidth=2,
+                label=driver,
+                **styles[row],
+            )
         axis.set_ylabel(label)
 
     axes[-1].set_xlabel("Distance (m)")
@@ -164,25 +168,55 @@ def plot_full_telemetry(session, driver1, driver2):
     return fig
 
 
-def plot_sectors(session, driver1, driver2):
-    laps_d1 = session.laps.pick_driver(driver1)
-    laps_d2 = session.laps.pick_driver(driver2)
-    color1 = get_driver_color(session, driver1)
-    color2 = get_driver_color(session, driver2)
+def plot_cross_year_comparison(session, session_type, years):
+    event_name = session.event["EventName"]
+    years = tuple(sorted({int(session.event.year), *years}))
+    aligned, skipped = get_cross_year_laps(
+        years, event_name, session_type, session.event.get("Location")
+    )
+    delta_time = aligned.delta_to(0)
 
-    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+    fig, (speed_ax, delta_ax) = subplots(
+        2, 1, figsize=(14, 10), sharex=True, gridspec_kw={"height_ratios": [3, 2]}
+    )
+    colors = matplotlib.colormaps["viridis"](np.linspace(0.95, 0.1, len(aligned.drivers)))
+    for row, (label, color) in enumerate(zip(aligned.drivers, colors)):
+        speed_ax.plot(
+            aligned.distance, aligned.channels["Speed"][row], label=label, color=color, linewidth=2
+        )
+        delta_ax.plot(aligned.distance, delta_time[row], color=color, linewidth=2)
+
+    geometry = get_track_geometry(session)
+    draw_markers(speed_ax, geometry.corners["Distance"], color="grey", linestyle=":", linewidth=0.8)
+    speed_ax.set_ylabel("Speed (km/h)")
+    speed_ax.legend()
+    delta_ax.axhline(y=0, color="white", linestyle="-", alpha=0.5)
+    delta_ax.set_ylabel(f"Delta to {aligned.drivers[0]} (s)")
+    delta_ax.set_xlabel(f"Distance on the {session.event.year} layout (m)")
+
+    skipped_text = (
+        "\nNot available: " + ", ".join(str(year) for year in skipped) if skipped else ""
+    )
+    fig.suptitle(f"{event_name} Fastest Laps Across Seasons{skipped_text}")
+    return fig
+
+
+def plot_sectors(session, drivers):
+    laps = get_driver_laps(session.laps, drivers)
+    sector_laps = {driver: driver_laps for driver, driver_laps in laps.groupby("Driver")}
+    drivers = [driver for driver in drivers if driver in sector_laps]
+    colors = [get_driver_color(session, driver) for driver in drivers]
+
+    fig, axes = subplots(1, 3, figsize=(max(15, len(drivers) * 3), 5))
     sectors = ["Sector1Time", "Sector2Time", "Sector3Time"]
 
     for sector, ax in zip(sectors, axes):
         bp = ax.boxplot(
-            [
-                laps_d1[sector].dt.total_seconds().dropna(),
-                laps_d2[sector].dt.total_seconds().dropna(),
-            ],
+            [sector_laps[driver][sector].dt.total_seconds().dropna() for driver in drivers],
             patch_artist=True,
         )
-        bp["boxes"][0].set_facecolor(color1)
-        bp["boxes"][1].set_facecolor(color2)
+        for box, color in zip(bp["boxes"], colors):
+            box.set_facecolor(color)
 
         for box in bp["boxes"]:
             box.set_edgecolor("white")
@@ -193,7 +227,7 @@ def plot_sectors(session, driver1, driver2):
         for median in bp["medians"]:
             median.set_color("white")
 
-        ax.set_xticklabels([driver1, driver2])
+        ax.set_xticklabels(drivers)
         ax.set_title(f"{sector[:-4]} {sector[-4:]}")
         ax.grid(True, alpha=0.2)
 
@@ -204,25 +238,26 @@ def plot_sectors(session, driver1, driver2):
 
 
 def plot_speed_map(session, driver):
-    lap = session.laps.pick_driver(driver).pick_fastest()
-    x = lap.telemetry["X"]
-    y = lap.telemetry["Y"]
-    speed = lap.telemetry["Speed"]
+    telemetry = get_fastest_lap_telemetry(session, driver)
+    geometry = get_track_geometry(session)
+    x, y = geometry.rotate(telemetry["X"], telemetry["Y"])
+    speed = telemetry["Speed"]
 
     points = np.array([x, y]).T.reshape(-1, 1, 2)
     segments = np.concatenate([points[:-1], points[1:]], axis=1)
 
-    fig, ax = plt.subplots(sharex=True, sharey=True, figsize=(12, 6.75))
+    fig, ax = subplots(sharex=True, sharey=True, figsize=(12, 6.75))
     fig.suptitle(
         f'{session.event["EventName"]} {session.event.year}\n{driver} - Speed',
         size=24,
         y=0.97,
     )
-    plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.12)
+    fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.12)
     ax.axis("off")
-    ax.plot(x, y, color="black", linestyle="-", linewidth=16, zorder=0)
+    ax.axis("equal")
+    draw_track_outline(ax, geometry, linewidth=16, corner_labels=True)
 
-    norm = plt.Normalize(speed.min(), speed.max())
+    norm = Normalize(speed.min(), speed.max())
     line_collection = LineCollection(
         segments, cmap="plasma", norm=norm, linestyle="-", linewidth=5
     )
@@ -241,23 +276,19 @@ def plot_speed_map(session, driver):
 
 
 def plot_gear_shifts_on_track(session, driver):
-    lap = session.laps.pick_driver(driver).pick_fastest()
-    if lap is None:
-        raise ValueError("No fastest lap is available for this driver in the selected session.")
-
-    telemetry = lap.get_telemetry().copy()
+    telemetry = get_fastest_lap_telemetry(session, driver)
     telemetry = telemetry.dropna(subset=["X", "Y", "nGear"])
     if telemetry.empty:
         raise ValueError("No telemetry is available for gear shift analysis.")
 
-    x = telemetry["X"].to_numpy()
-    y = telemetry["Y"].to_numpy()
+    geometry = get_track_geometry(session)
+    x, y = geometry.rotate(telemetry["X"], telemetry["Y"])
     gear = telemetry["nGear"].astype(int).to_numpy()
 
     points = np.array([x, y]).T.reshape(-1, 1, 2)
     segments = np.concatenate([points[:-1], points[1:]], axis=1)
 
-    fig, ax = plt.subplots(figsize=(12, 6.75))
+    fig, ax = subplots(figsize=(12, 6.75))
     fig.suptitle(
         f'{session.event["EventName"]} {session.event.year}\n{driver} - Gear Shifts',
         size=22,
@@ -265,13 +296,13 @@ def plot_gear_shifts_on_track(session, driver):
     )
 
     ax.axis("off")
-    ax.plot(x, y, color="black", linestyle="-", linewidth=12, zorder=0)
+    draw_track_outline(ax, geometry, linewidth=12)
 
-    cmap = plt.cm.get_cmap("Paired", 8)
+    cmap = matplotlib.colormaps["Paired"].resampled(8)
     line_collection = LineCollection(
         segments,
         cmap=cmap,
-        norm=plt.Normalize(1, 8),
+        norm=Normalize(1, 8),
         linewidth=5,
     )
     line_collection.set_array(gear[:-1])
@@ -288,21 +319,17 @@ def plot_gear_shifts_on_track(session, driver):
     colorbar.set_ticks(range(1, 9))
     colorbar.set_label("Gear", size=12)
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
 def plot_corner_annotated_speed_trace(session, driver):
-    lap = session.laps.pick_driver(driver).pick_fastest()
-    if lap is None:
-        raise ValueError("No fastest lap is available for this driver in the selected session.")
-
-    telemetry = lap.get_car_data().add_distance().copy()
+    telemetry = get_fastest_lap_telemetry(session, driver)
     telemetry = telemetry.dropna(subset=["Distance", "Speed"])
     if telemetry.empty:
         raise ValueError("No telemetry is available for speed trace analysis.")
 
-    fig, ax = plt.subplots(figsize=(14, 6))
+    fig, ax = subplots(figsize=(14, 6))
     ax.plot(
         telemetry["Distance"],
         telemetry["Speed"],
@@ -319,21 +346,16 @@ def plot_corner_annotated_speed_trace(session, driver):
 
     if not corners.empty and {"Distance", "Number", "Letter"}.issubset(corners.columns):
         corners = corners.dropna(subset=["Distance"])
-        max_speed = telemetry["Speed"].max()
-
-        for _, corner in corners.iterrows():
-            distance = float(corner["Distance"])
-            label = f"{int(corner['Number'])}{corner['Letter'] or ''}".strip()
-            ax.axvline(distance, color="white", linestyle="--", linewidth=0.7, alpha=0.25)
-            ax.text(
-                distance,
-                max_speed + 2,
-                label,
-                fontsize=8,
-                ha="center",
-                va="bottom",
-                rotation=90,
-            )
+        labels = corners["Number"].astype(int).astype(str) + corners["Letter"].fillna("").astype(str)
+        draw_markers(
+            ax,
+            corners["Distance"],
+            labels,
+            color="white",
+            linestyle="--",
+            linewidth=0.7,
+            alpha=0.25,
+        )
 
     ax.set_xlabel("Distance (m)")
     ax.set_ylabel("Speed (km/h)")
@@ -343,7 +365,7 @@ def plot_corner_annotated_speed_trace(session, driver):
     fig.suptitle(
         f'{session.event["EventName"]} {session.event.year}\n{driver} - Corner Speed Trace'
     )
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -368,7 +390,7 @@ def plot_weather_track_evolution(session):
     if not available_metrics:
         raise ValueError("No supported weather metrics are available for this session.")
 
-    fig, axes = plt.subplots(len(available_metrics), 1, figsize=(14, 3.2 * len(available_metrics)), sharex=True)
+    fig, axes = subplots(len(available_metrics), 1, figsize=(14, 3.2 * len(available_metrics)), sharex=True)
     if len(available_metrics) == 1:
         axes = [axes]
 
@@ -379,75 +401,78 @@ def plot_weather_track_evolution(session):
 
     if "Rainfall" in weather.columns:
         rainfall = weather["Rainfall"].fillna(False).astype(bool)
-        rain_times = weather_seconds[rainfall]
-        if not rain_times.empty:
-            for ax in axes:
-                for timestamp in rain_times:
-                    ax.axvline(timestamp, color="#4da6ff", linewidth=0.8, alpha=0.15)
+        rain_spans = merge_true_runs(weather_seconds, rainfall)
+        for ax in axes:
+            draw_spans(ax, rain_spans, color="#4da6ff", alpha=0.15, linewidth=0)
 
     axes[-1].set_xlabel("Session Time (s)")
     fig.suptitle(
         f"{session.event.year} {session.event['EventName']} Weather and Track Evolution"
     )
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
-def plot_lap_distribution(session):
-    point_finishers = session.drivers[:10]
-    driver_laps = session.laps.pick_drivers(point_finishers).pick_quicklaps().reset_index()
-    driver_laps["LapTime(s)"] = driver_laps["LapTime"].dt.total_seconds()
-    finishing_order = [session.get_driver(i)["Abbreviation"] for i in point_finishers]
-
-    fig, ax = plt.subplots(figsize=(18, 10))
-    sns.violinplot(
-        data=driver_laps,
-        x="Driver",
-        y="LapTime(s)",
-        hue="Driver",
-        inner=None,
-        density_norm="area",
-        order=finishing_order,
-        palette=ff1_plotting.get_driver_color_mapping(session=session),
-        ax=ax,
-    )
-    if ax.legend_ is not None:
-        ax.legend_.remove()
-
-    compounds = driver_laps["Compound"].dropna().unique()
-    sns.swarmplot(
-        data=driver_laps,
-        x="Driver",
-        y="LapTime(s)",
-        order=finishing_order,
-        hue="Compound",
-        palette=ff1_plotting.get_compound_mapping(session=session),
-        hue_order=compounds,
+def plot_lap_distribution(session, lap_filter=None):
+    finishing_order = [session.get_driver(i)["Abbreviation"] for i in session.drivers]
+    driver_laps = get_pace_laps(session, lap_filter)
+    driver_laps = driver_laps[driver_laps["Driver"].isin(finishing_order)]
+    if driver_laps.empty:
+        raise ValueError("No laps match the selected lap filter.")
+
+    lap_seconds = driver_laps["LapTimeSeconds"].to_numpy()
+    columns = driver_laps["Driver"].map(
+        {driver: column for column, driver in enumerate(finishing_order)}
+    ).to_numpy()
+
+    fig, ax = subplots(figsize=(max(18, len(finishing_order) * 0.9), 10))
+    grid, density = batched_kde(lap_seconds, columns, len(finishing_order))
+    driver_colors = get_driver_colors(session)
+    draw_violins(
+        ax,
+        grid,
+        density,
+        np.arange(len(finishing_order)),
+        [driver_colors.get(driver, "#888888") for driver in finishing_order],
         linewidth=0,
-        size=4,
-        ax=ax,
     )
 
+    # Bins of about one marker diameter on the final axis scale
+    value_span = np.ptp(lap_seconds) or 1.0
+    offsets = beeswarm_offsets(
+        lap_seconds, columns, bin_size=value_span / 120, step=0.05, max_offset=0.4
+    )
+    compound_colors = get_compound_colors(session)
+    compounds = driver_laps["Compound"].fillna("UNKNOWN").astype(str)
+    ax.scatter(
+        columns + offsets,
+        lap_seconds,
+        c=[compound_colors.get(compound, "#888888") for compound in compounds],
+        s=16,
+        linewidths=0,
+        zorder=3,
+    )
+    handles = [
+        Line2D([], [], marker="o", linestyle="", color=compound_colors.get(compound, "#888888"))
+        for compound in compounds.unique()
+    ]
+    ax.legend(handles, compounds.unique(), title="Compound", loc="upper right")
+
+    ax.set_xticks(np.arange(len(finishing_order)))
+    ax.set_xticklabels(finishing_order)
+    ax.set_xlim(-0.6, len(finishing_order) - 0.4)
     ax.set_xlabel("Driver")
     ax.set_ylabel("Lap Time (s)")
     fig.suptitle(
         f"{session.event.year} {session.event['EventName']} Lap Time Distributions"
     )
-    sns.despine(left=True, bottom=True)
-    plt.tight_layout()
+    sns.despine(ax=ax, left=True, bottom=True)
+    fig.tight_layout()
     return fig
 
 
 def plot_tyre_strategy(session):
-    laps = session.laps[["Driver", "Stint", "Compound", "LapNumber"]].copy()
-    laps = laps.dropna(subset=["Driver", "Stint", "Compound", "LapNumber"])
-    laps["Stint"] = laps["Stint"].astype(int)
-
-    stint_data = (
-        laps.groupby(["Driver", "Stint", "Compound"])
-        .size()
-        .reset_index(name="StintLength")
-    )
+    stint_data = get_stint_table(session)
 
     if hasattr(session, "results") and session.results is not None and not session.results.empty:
         driver_order = (
@@ -456,25 +481,20 @@ def plot_tyre_strategy(session):
     else:
         driver_order = sorted(stint_data["Driver"].unique().tolist())
 
-    compound_colors = ff1_plotting.get_compound_mapping(session=session)
-
-    fig, ax = plt.subplots(figsize=(14, max(6, len(driver_order) * 0.45)))
+    compound_colors = get_compound_colors(session)
 
-    for row_index, driver in enumerate(driver_order):
-        driver_stints = stint_data[stint_data["Driver"] == driver].sort_values("Stint")
-        stint_start = 0
+    fig, ax = subplots(figsize=(14, max(6, len(driver_order) * 0.45)))
 
-        for _, stint in driver_stints.iterrows():
-            compound = str(stint["Compound"])
-            ax.barh(
-                y=row_index,
-                width=stint["StintLength"],
-                left=stint_start,
-                color=compound_colors.get(compound, "#888888"),
-                edgecolor="black",
-                height=0.8,
-            )
-            stint_start += stint["StintLength"]
+    rows = stint_data["Driver"].map({driver: row for row, driver in enumerate(driver_order)})
+    stint_data = stint_data[rows.notna()]
+    draw_bars(
+        ax,
+        rows.dropna(),
+        stint_data["StintStart"],
+        stint_data["StintLength"],
+        [compound_colors.get(str(compound), "#888888") for compound in stint_data["Compound"]],
+        edgecolors="black",
+    )
 
     ax.set_yticks(range(len(driver_order)))
     ax.set_yticklabels(driver_order)
@@ -490,24 +510,21 @@ def plot_tyre_strategy(session):
     ]
     if legend_compounds:
         handles = [
-            plt.Rectangle((0, 0), 1, 1, color=compound_colors[compound])
+            Rectangle((0, 0), 1, 1, color=compound_colors[compound])
             for compound in legend_compounds
         ]
         ax.legend(handles, legend_compounds, title="Compound", loc="upper right")
 
     fig.suptitle(f"{session.event.year} {session.event['EventName']} Tyre Strategy")
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
-def plot_team_pace(session):
-    laps = session.laps.pick_quicklaps().copy()
-    laps = laps.dropna(subset=["Team", "LapTime"])
+def plot_team_pace(session, lap_filter=None):
+    laps = get_pace_laps(session, lap_filter).dropna(subset=["Team"])
 
     if laps.empty:
-        raise ValueError("No quick laps available for team pace analysis.")
-
-    laps["LapTimeSeconds"] = laps["LapTime"].dt.total_seconds()
+        raise ValueError("No laps available for team pace analysis with this lap filter.")
 
     team_order = (
         laps.groupby("Team")["LapTimeSeconds"]
@@ -517,7 +534,7 @@ def plot_team_pace(session):
         .tolist()
     )
 
-    fig, ax = plt.subplots(figsize=(14, max(6, len(team_order) * 0.45)))
+    fig, ax = subplots(figsize=(14, max(6, len(team_order) * 0.45)))
     palette = {team: ff1_plotting.get_team_color(team, session=session) for team in team_order}
 
     sns.boxplot(
@@ -547,33 +564,15 @@ def plot_team_pace(session):
     ax.set_title("Team Pace Comparison")
     ax.grid(axis="x", alpha=0.2)
     fig.suptitle(f"{session.event.year} {session.event['EventName']} Team Pace")
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
 def plot_qualifying_overview(session):
-    if not hasattr(session, "results") or session.results is None or session.results.empty:
-        raise ValueError("No qualifying results are available for this session.")
-
-    results = session.results.copy()
-    results = results.dropna(subset=["Abbreviation"])
-
-    columns = ["Abbreviation", "Position", "Q1", "Q2", "Q3"]
-    for column in columns:
-        if column not in results.columns:
-            raise ValueError("This qualifying session does not include complete Q1/Q2/Q3 data.")
-
-    quali = results[columns].copy()
-    quali["Position"] = pd.to_numeric(quali["Position"], errors="coerce")
-    quali = quali.dropna(subset=["Position"]).sort_values("Position")
-
-    q_columns = ["Q1", "Q2", "Q3"]
-    for column in q_columns:
-        quali[column] = pd.to_timedelta(quali[column], errors="coerce").dt.total_seconds()
-
+    quali = get_qualifying_times(session)
     plot_data = quali.melt(
         id_vars=["Abbreviation", "Position"],
-        value_vars=q_columns,
+        value_vars=QUALIFYING_PARTS,
         var_name="SessionPart",
         value_name="LapTimeSeconds",
     ).dropna(subset=["LapTimeSeconds"])
@@ -582,7 +581,7 @@ def plot_qualifying_overview(session):
         raise ValueError("No qualifying lap times are available to plot.")
 
     driver_order = quali["Abbreviation"].tolist()
-    fig, ax = plt.subplots(figsize=(14, max(6, len(driver_order) * 0.45)))
+    fig, ax = subplots(figsize=(14, max(6, len(driver_order) * 0.45)))
 
     sns.pointplot(
         data=plot_data,
@@ -603,24 +602,21 @@ def plot_qualifying_overview(session):
     ax.grid(axis="x", alpha=0.2)
     ax.legend(title="Session")
     fig.suptitle(f"{session.event.year} {session.event['EventName']} Qualifying Overview")
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
 def plot_position_changes(session):
-    fig, ax = plt.subplots(figsize=(15, 8))
-    for drv in session.drivers:
-        drv_laps = session.laps.pick_drivers(drv)
-        if (
-            drv_laps.empty
-            or "Position" not in drv_laps.columns
-            or drv_laps["Position"].isna().all()
-        ):
+    trace = get_race_trace(session)
+
+    fig, ax = subplots(figsize=(15, 8))
+    for column, abb in enumerate(trace.drivers):
+        positions = trace.positions[:, column]
+        if np.isnan(positions).all():
             continue
 
-        abb = drv_laps["Driver"].iloc[0]
         style = get_driver_style(session, abb, ["color", "linestyle"])
-        ax.plot(drv_laps["LapNumber"], drv_laps["Position"], label=abb, linewidth=2, **style)
+        ax.plot(trace.lap_numbers, positions, label=abb, linewidth=2, **style)
 
     ax.set_ylim([20.5, 0.5])
     ax.set_yticks([1, 5, 10, 15, 20])
@@ -628,7 +624,7 @@ def plot_position_changes(session):
     ax.set_ylabel("Position")
     ax.legend(bbox_to_anchor=(1.0, 1.02))
     fig.suptitle(f"{session.event.year} {session.event['EventName']} Position Changes")
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -638,42 +634,3 @@ def figure_to_png_bytes(fig):
     buffer.seek(0)
     return buffer.getvalue()
 
-
-def export_data_for_analysis(session, selection):
-    analysis_type = selection.analysis_type
-
-    if analysis_type == "Tyre Strategy":
-        laps = session.laps[["Driver", "Stint", "Compound", "LapNumber"]].copy()
-        laps = laps.dropna(subset=["Driver", "Stint", "Compound", "LapNumber"])
-        return (
-            laps.groupby(["Driver", "Stint", "Compound"])
-            .size()
-            .reset_index(name="StintLength")
-        )
-
-    if analysis_type == "Team Pace Comparison":
-        laps = session.laps.pick_quicklaps().copy()
-        laps = laps.dropna(subset=["Team", "LapTime"])
-        laps["LapTimeSeconds"] = laps["LapTime"].dt.total_seconds()
-        return laps[["Driver", "Team", "LapNumber", "LapTimeSeconds", "Compound"]]
-
-    if analysis_type == "Qualifying Overview":
-        results = session.results.copy()
-        return results[[col for col in ["Abbreviation", "Position", "Q1", "Q2", "Q3"] if col in results.columns]]
-
-    if analysis_type == "Weather and Track Evolution":
-        return getattr(session, "weather_data", pd.DataFrame()).copy()
-
-    if analysis_type in {"Speed Map", "Gear Shifts On Track", "Corner-Annotated Speed Trace"}:
-        lap = session.laps.pick_driver(selection.driver_for_map).pick_fastest()
-        if lap is None:
-            return None
-        telemetry = lap.get_telemetry().copy()
-        return telemetry
-
-    if analysis_type == "Lap Times":
-        laps_1 = session.laps.pick_driver(selection.driver1_code).copy()
-        laps_2 = session.laps.pick_driver(selection.driver2_code).copy()
-        return pd.concat([laps_1, laps_2], ignore_index=True)
-
-    return None
@@ -0,0 +1,237 @@
+"""Vega-Lite specs with decimated data for charts that pan and zoom in the browser."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from app.services.driver_comparison import get_aligned_laps, get_driver_laps
+from app.services.race_trace import get_race_trace
+from app.services.sessions import get_driver_color
+
+
+MAX_POINTS_PER_SERIES = 1000
+
+TELEMETRY_CHANNELS = {
+    "Delta": "Delta (s)",
+    "Speed": "Speed (km/h)",
+    "Throttle": "Throttle (%)",
+    "Brake": "Brake",
+    "RPM": "RPM",
+    "nGear": "Gear",
+}
+
+WEATHER_METRICS = {
+    "TrackTemp": "Track Temp (C)",
+    "AirTemp": "Air Temp (C)",
+    "Humidity": "Humidity (%)",
+    "WindSpeed": "Wind Speed",
+}
+
+# Drag to pan, scroll to zoom; double click resets
+_ZOOM = [{"name": "zoom", "select": "interval", "bind": "scales"}]
+
+
+def decimate_series(
+    frame: pd.DataFrame, x: str, y: str, by: list[str], max_points: int = MAX_POINTS_PER_SERIES
+) -> pd.DataFrame:
+    """Keep the min and max ``y`` of each of ``max_points / 2`` buckets per series.
+
+    Peaks and troughs survive, so the decimated line looks like the full one
+    at screen resolution.
+    """
+    frame = frame.dropna(subset=[y]).sort_values([*by, x], ignore_index=True)
+    series = frame.groupby(by, sort=False)
+    size = series[x].transform("size")
+    if size.max() <= max_points:
+        return frame
+
+    buckets = max(max_points // 2, 1)
+    bucket = series.cumcount() * buckets // size
+    grouped = frame[y].groupby([*(frame[column] for column in by), bucket])
+    keep = np.union1d(grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy())
+    return frame.loc[keep].reset_index(drop=True)
+
+
+def _driver_scale(session, drivers) -> dict:
+    colors = []
+    for driver in drivers:
+        try:
+            colors.append(get_driver_color(session, driver))
+        except Exception:
+            colors.append("#888888")
+    return {"domain": list(drivers), "range": colors}
+
+
+def _title(session, name: str) -> str:
+    return f"{session.event.year} {session.event['EventName']} {name}"
+
+
+def chart_laptime(session, drivers):
+    laps = get_driver_laps(session.laps, drivers).dropna(subset=["LapTime"])
+    data = pd.DataFrame(
+        {
+            "Driver": laps["Driver"].astype(str),
+            "LapNumber": laps["LapNumber"],
+            "LapTime": laps["LapTime"].dt.total_seconds(),
+        }
+    )
+    spec = {
+        "title": _title(session, "Lap Time Comparison"),
+        "mark": {"type": "line", "point": True},
+        "params": _ZOOM,
+        "encoding": {
+            "x": {"field": "LapNumber", "type": "quantitative", "title": "Lap Number"},
+            "y": {
+                "field": "LapTime",
+                "type": "quantitative",
+                "title": "Lap Time (s)",
+                "scale": {"zero": False},
+            },
+            "color": {"field": "Driver", "type": "nominal", "scale": _driver_scale(session, drivers)},
+            "tooltip": [
+                {"field": "Driver"},
+                {"field": "LapNumber"},
+                {"field": "LapTime", "format": ".3f"},
+            ],
+        },
+    }
+    return data, spec
+
+
+def _aligned_frame(session, drivers, channels) -> tuple[pd.DataFrame, list[str]]:
+    aligned = get_aligned_laps(session, tuple(drivers))
+    frame = aligned.to_frame().rename(columns={"DeltaToFirst": "Delta"})
+    data = frame.melt(
+        id_vars=["Driver", "Distance"],
+        value_vars=[channel for channel in channels if channel in frame.columns],
+        var_name="Channel",
+        value_name="Value",
+    )
+    return decimate_series(data, "Distance", "Value", ["Driver", "Channel"]), aligned.drivers
+
+
+def chart_fastest_lap(session, drivers):
+    data, drivers = _aligned_frame(session, drivers, ["Speed"])
+    spec = {
+        "title": _title(session, "Fastest Lap Comparison"),
+        "mark": {"type": "line", "strokeWidth": 1.5},
+        "params": _ZOOM,
+        "encoding": {
+            "x": {"field": "Distance", "type": "quantitative", "title": "Distance (m)"},
+            "y": {"field": "Value", "type": "quantitative", "title": "Speed (km/h)"},
+            "color": {"field": "Driver", "type": "nominal", "scale": _driver_scale(session, drivers)},
+            "tooltip": [
+                {"field": "Driver"},
+                {"field": "Distance", "format": ".0f"},
+                {"field": "Value", "format": ".1f"},
+            ],
+        },
+    }
+    return data, spec
+
+
+def chart_full_telemetry(session, drivers):
+    data, drivers = _aligned_frame(session, drivers, list(TELEMETRY_CHANNELS))
+    data["Channel"] = data["Channel"].map(TELEMETRY_CHANNELS)
+    spec = {
+        "title": _title(session, "Full Telemetry Comparison"),
+        "facet": {
+            "row": {
+                "field": "Channel",
+                "type": "nominal",
+                "sort": list(TELEMETRY_CHANNELS.values()),
+                "title": None,
+            }
+        },
+        "spec": {
+            "height": 140,
+            "mark": {"type": "line", "strokeWidth": 1.5},
+            "params": _ZOOM,
+            "encoding": {
+                "x": {"field": "Distance", "type": "quantitative", "title": "Distance (m)"},
+                "y": {"field": "Value", "type": "quantitative", "title": None},
+                "color": {
+                    "field": "Driver",
+                    "type": "nominal",
+                    "scale": _driver_scale(session, drivers),
+                },
+            },
+        },
+        "resolve": {"scale": {"y": "independent"}},
+    }
+    return data, spec
+
+
+def chart_position_changes(session):
+    trace = get_race_trace(session).to_frame()
+    data = trace[["Driver", "LapNumber", "Position"]].dropna()
+    drivers = data["Driver"].unique().tolist()
+    spec = {
+        "title": _title(session, "Position Changes"),
+        "mark": {"type": "line", "strokeWidth": 2},
+        "params": _ZOOM,
+        "encoding": {
+            "x": {"field": "LapNumber", "type": "quantitative", "title": "Lap"},
+            "y": {
+                "field": "Position",
+                "type": "quantitative",
+                "scale": {"reverse": True, "domain": [1, 20]},
+            },
+            "color": {"field": "Driver", "type": "nominal", "scale": _driver_scale(session, drivers)},
+            "tooltip": [{"field": "Driver"}, {"field": "LapNumber"}, {"field": "Position"}],
+        },
+    }
+    return data, spec
+
+
+def chart_weather_track_evolution(session):
+    weather = getattr(session, "weather_data", None)
+    if weather is None or weather.empty or "Time" not in weather.columns:
+        raise ValueError("No weather data is available for this session.")
+
+    metrics = [column for column in WEATHER_METRICS if column in weather.columns]
+    if not metrics:
+        raise ValueError("No supported weather metrics are available for this session.")
+
+    data = (
+        weather.assign(SessionSeconds=weather["Time"].dt.total_seconds())
+        .melt(id_vars=["SessionSeconds"], value_vars=metrics, var_name="Metric", value_name="Value")
+    )
+    data = decimate_series(data, "SessionSeconds", "Value", ["Metric"])
+    data["Metric"] = data["Metric"].map(WEATHER_METRICS)
+    spec = {
+        "title": _title(session, "Weather and Track Evolution"),
+        "facet": {"row": {"field": "Metric", "type": "nominal", "title": None}},
+        "spec": {
+            "height": 120,
+            "mark": {"type": "line", "strokeWidth": 2},
+            "params": _ZOOM,
+            "encoding": {
+                "x": {"field": "SessionSeconds", "type": "quantitative", "title": "Session Time (s)"},
+                "y": {
+                    "field": "Value",
+                    "type": "quantitative",
+                    "title": None,
+                    "scale": {"zero": False},
+                },
+            },
+        },
+        "resolve": {"scale": {"y": "independent"}},
+    }
+    return data, spec
+
+
+INTERACTIVE_CHARTS = {
+    "Lap Times": chart_laptime,
+    "Fastest Lap": chart_fastest_lap,
+    "Full Telemetry": chart_full_telemetry,
+    "Position Changes": chart_position_changes,
+    "Weather and Track Evolution": chart_weather_track_evolution,
+}
+
+
+def build_interactive_chart(session, selection) -> tuple[pd.DataFrame, dict]:
+    handler = INTERACTIVE_CHARTS[selection.analysis_type]
+    if selection.analysis_type in {"Position Changes", "Weather and Track Evolution"}:
+        return handler(session)
+    return handler(session, selection.driver_codes)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.plots.rendering import draw_bars, subplots
+from app.services.live import LiveTimingState
+
+
+COMPOUND_COLORS = {
+    "SOFT": "#da291c",
+    "MEDIUM": "#ffd12e",
+    "HARD": "#f0f0ec",
+    "INTERMEDIATE": "#43b02a",
+    "WET": "#0067ad",
+}
+
+
+def plot_live_overview(state: LiveTimingState, title: str = "Live Replay"):
+    laps = state.laps
+    if laps.empty:
+        raise ValueError("No laps have been completed yet.")
+
+    order = [number for number in state.driver_order if number in state.columns]
+    colors = {
+        number: state.team_colors.get(number, f"C{index % 10}")
+        for index, number in enumerate(order)
+    }
+    completed = int(laps["LapNumber"].max())
+    lap_axis = np.arange(completed + 1)
+
+    fig, axes = subplots(2, 2, figsize=(18, 11))
+    laptime_ax, position_ax, gap_ax, tyre_ax = axes.ravel()
+
+    timed = laps.dropna(subset=["LapTime"])
+    timed = timed[~(timed["PitIn"] | timed["PitOut"])]
+    for number, driver_laps in timed.groupby("DriverNumber", sort=False):
+        laptime_ax.plot(
+            driver_laps["LapNumber"],
+            driver_laps["LapTime"],
+            color=colors.get(number),
+            linewidth=1,
+            alpha=0.8,
+        )
+    laptime_ax.set_xlabel("Lap")
+    laptime_ax.set_ylabel("Lap Time (s)")
+    laptime_ax.set_title("Lap Times (pit laps excluded)")
+    laptime_ax.grid(alpha=0.2)
+
+    positions = state.positions[: completed + 1]
+    gaps = state.gaps[: completed + 1]
+    for number in order:
+        column = state.columns[number]
+        code = state.driver_code(number)
+        position_ax.plot(lap_axis, positions[:, column], color=colors[number], linewidth=1.5)
+        gap_ax.plot(lap_axis, gaps[:, column], color=colors[number], linewidth=1.2)
+
+        last = np.flatnonzero(~np.isnan(positions[:, column]))
+        if len(last):
+            position_ax.annotate(
+                code,
+                (lap_axis[last[-1]], positions[last[-1], column]),
+                xytext=(4, 0),
+                textcoords="offset points",
+                va="center",
+                fontsize=8,
+            )
+
+    position_ax.invert_yaxis()
+    position_ax.set_yticks(range(1, len(order) + 1))
+    position_ax.set_xlabel("Lap")
+    position_ax.set_ylabel("Position")
+    position_ax.set_title("Positions")
+    position_ax.grid(alpha=0.2)
+
+    gap_ax.invert_yaxis()
+    gap_ax.set_xlabel("Lap")
+    gap_ax.set_ylabel("Gap to Leader (s)")
+    gap_ax.set_title("Gap to Leader")
+    gap_ax.grid(alpha=0.2)
+
+    stints = (
+        laps.dropna(subset=["Stint"])
+        .groupby(["DriverNumber", "Stint"], sort=False)
+        .agg(Compound=("Compound", "last"), Start=("LapNumber", "min"), End=("LapNumber", "max"))
+        .reset_index()
+    )
+    rows = stints["DriverNumber"].map({number: row for row, number in enumerate(order)})
+    stints = stints[rows.notna()]
+    draw_bars(
+        tyre_ax,
+        rows.dropna(),
+        stints["Start"] - 1,
+        stints["End"] - stints["Start"] + 1,
+        [COMPOUND_COLORS.get(str(compound), "#888888") for compound in stints["Compound"]],
+        edgecolors="black",
+    )
+    tyre_ax.set_yticks(range(len(order)))
+    tyre_ax.set_yticklabels([state.driver_code(number) for number in order])
+    tyre_ax.invert_yaxis()
+    tyre_ax.set_xlabel("Lap")
+    tyre_ax.set_title("Tyre Strategy")
+    tyre_ax.grid(axis="x", alpha=0.2)
+
+    current_lap = state.current_lap or completed
+    total = ""
+    if state.total_laps:
+        current_lap = min(current_lap, int(state.total_laps))
+        total = f"/{state.total_laps}"
+    fig.suptitle(f"{title} - Lap {current_lap}{total}")
+    fig.tight_layout()
+    return fig
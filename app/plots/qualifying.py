@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.plots.rendering import subplots
+from app.services.ideal_lap import get_ideal_laps
+from app.services.sessions import get_driver_color
+
+
+def plot_ideal_lap(session):
+    ideal = get_ideal_laps(session)
+    leaderboard = ideal.leaderboard.dropna(subset=["FastestLap"])
+    if leaderboard.empty:
+        raise ValueError("No timed laps are available for an ideal lap comparison.")
+
+    drivers = leaderboard["Driver"].tolist()
+    reference = leaderboard["FastestLap"].min()
+    rows = np.arange(len(drivers))
+
+    fig, (lap_ax, minisector_ax) = subplots(
+        1,
+        2,
+        figsize=(18, max(6, len(drivers) * 0.45)),
+        gridspec_kw={"width_ratios": [2, 3]},
+    )
+
+    lap_ax.barh(
+        rows,
+        leaderboard["FastestLap"] - reference,
+        color=[get_driver_color(session, driver) for driver in drivers],
+        alpha=0.45,
+        label="Fastest lap",
+    )
+    lap_ax.scatter(
+        leaderboard["IdealSectorLap"] - reference,
+        rows,
+        marker="|",
+        s=120,
+        color="white",
+        label="Best sectors",
+    )
+    lap_ax.scatter(
+        leaderboard["IdealMinisectorLap"] - reference,
+        rows,
+        marker="D",
+        s=25,
+        color="gold",
+        label="Best minisectors",
+        zorder=3,
+    )
+    lap_ax.set_yticks(rows)
+    lap_ax.set_yticklabels(drivers)
+    lap_ax.invert_yaxis()
+    lap_ax.axvline(0, color="grey", linewidth=1)
+    lap_ax.set_xlabel("Gap to Fastest Lap of the Session (s)")
+    lap_ax.set_title("Ideal vs Actual")
+    lap_ax.grid(axis="x", alpha=0.2)
+    lap_ax.legend(loc="lower right")
+
+    deltas = ideal.minisectors.pivot(
+        index="Driver", columns="Minisector", values="DeltaToBest"
+    ).reindex(drivers)
+    image = minisector_ax.imshow(
+        deltas.to_numpy(),
+        aspect="auto",
+        cmap="viridis_r",
+        vmin=0,
+        vmax=np.nanpercentile(deltas.to_numpy(), 95),
+        interpolation="nearest",
+    )
+    minisector_ax.set_yticks(rows)
+    minisector_ax.set_yticklabels(drivers)
+    minisector_ax.set_xticks(np.arange(len(deltas.columns)))
+    minisector_ax.set_xticklabels(deltas.columns, fontsize=7)
+    minisector_ax.set_xlabel("Minisector")
+    minisector_ax.set_title("Best Minisector vs Field Best")
+    fig.colorbar(image, ax=minisector_ax, label="Delta (s)")
+
+    fig.suptitle(f"{session.event.year} {session.event['EventName']} Ideal Lap Leaderboard")
+    fig.tight_layout()
+    return fig
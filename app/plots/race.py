@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.plots.comparison import plot_position_changes
+from app.plots.rendering import subplots
+from app.services.pit_stops import get_pit_stop_analysis
+from app.services.race_events import MIN_BATTLE_LAPS, get_race_events
+from app.services.race_trace import get_race_trace
+from app.services.sessions import get_compound_colors, get_driver_style, get_team_color
+from app.services.stint_pace import get_stint_pace
+
+
+def _finishing_order(trace) -> list[int]:
+    # Column indices sorted by laps completed, then by final running position
+    completed = np.sum(~np.isnan(trace.elapsed), axis=0)
+    last_rows = np.maximum(completed - 1, 0)
+    final_positions = trace.positions[last_rows, np.arange(len(trace.drivers))]
+    return np.lexsort((np.nan_to_num(final_positions, nan=99), -completed)).tolist()
+
+
+def plot_race_trace(session):
+    trace = get_race_trace(session)
+
+    fig, ax = subplots(figsize=(15, 8))
+    for column in _finishing_order(trace):
+        driver = trace.drivers[column]
+        style = get_driver_style(session, driver, ["color", "linestyle"])
+        ax.plot(
+            trace.lap_numbers,
+            trace.gap_to_leader[:, column],
+            label=driver,
+            linewidth=1.8,
+            **style,
+        )
+
+    ax.invert_yaxis()
+    ax.set_xlabel("Lap")
+    ax.set_ylabel("Gap to Leader (s)")
+    ax.grid(alpha=0.2)
+    ax.legend(bbox_to_anchor=(1.0, 1.02))
+    fig.suptitle(f"{session.event.year} {session.event['EventName']} Race Trace")
+    fig.tight_layout()
+    return fig
+
+
+def plot_stint_pace(session, start_fuel_kg, seconds_per_kg, lap_filter=None):
+    pace = get_stint_pace(session, start_fuel_kg, seconds_per_kg, lap_filter)
+    compound_colors = get_compound_colors(session)
+
+    fig, (trend_ax, deg_ax) = subplots(
+        1, 2, figsize=(16, 7), gridspec_kw={"width_ratios": [3, 1]}
+    )
+    for compound, compound_laps in pace.laps.groupby("Compound"):
+        color = compound_colors.get(compound, "#888888")
+        trend_ax.scatter(
+            compound_laps["TyreLife"],
+            compound_laps["FuelCorrectedSeconds"],
+            color=color,
+            s=8,
+            alpha=0.35,
+            label=compound,
+        )
+
+    tyre_life = np.linspace(1, pace.laps["TyreLife"].max(), 50)
+    for _, compound in pace.compounds.iterrows():
+        trend_ax.plot(
+            tyre_life,
+            compound["CorrectedPace"] + compound["DegradationPerLap"] * (tyre_life - 1),
+            color=compound_colors.get(compound["Compound"], "#888888"),
+            linewidth=2.5,
+        )
+
+    trend_ax.set_xlabel("Tyre Life (laps)")
+    trend_ax.set_ylabel("Fuel-Corrected Lap Time (s)")
+    trend_ax.grid(alpha=0.2)
+    trend_ax.legend(title="Compound")
+
+    deg_ax.bar(
+        pace.compounds["Compound"],
+        pace.compounds["DegradationPerLap"],
+        color=[compound_colors.get(c, "#888888") for c in pace.compounds["Compound"]],
+        edgecolor="black",
+    )
+    deg_ax.set_ylabel("Degradation (s/lap)")
+    deg_ax.grid(axis="y", alpha=0.2)
+
+    fig.suptitle(
+        f"{session.event.year} {session.event['EventName']} Stint Pace Model\n"
+        f"Fuel: {start_fuel_kg:.0f} kg start, {seconds_per_kg:.3f} s/kg"
+    )
+    fig.tight_layout()
+    return fig
+
+
+def plot_race_events(session):
+    events = get_race_events(session)
+    fig = plot_position_changes(session)
+    ax = fig.axes[0]
+
+    trace = get_race_trace(session)
+    columns = {driver: column for column, driver in enumerate(trace.drivers)}
+    for battle in events.battles.itertuples():
+        rows = (trace.lap_numbers >= battle.StartLap) & (trace.lap_numbers <= battle.EndLap)
+        style = get_driver_style(session, battle.Driver, ["color"])
+        ax.plot(
+            trace.lap_numbers[rows],
+            trace.positions[rows, columns[battle.Driver]],
+            linewidth=9,
+            alpha=0.25,
+            solid_capstyle="round",
+            zorder=1,
+            **style,
+        )
+
+    # Passes sit between the lap-end points, at the fraction of the lap they happened
+    for event_type, marker, facecolor in [
+        ("Overtake", "^", None),
+        ("Pit Stop Pass", "o", "none"),
+    ]:
+        passes = events.passes[events.passes["Type"] == event_type]
+        if passes.empty:
+            continue
+        colors = [get_driver_style(session, driver, ["color"])["color"] for driver in passes["Driver"]]
+        ax.scatter(
+            passes["LapFraction"],
+            passes["Position"],
+            marker=marker,
+            s=36,
+            facecolors=colors if facecolor is None else facecolor,
+            edgecolors=colors,
+            linewidths=1,
+            zorder=4,
+            label=f"{event_type} ({len(passes)})",
+        )
+
+    overtakes = int((events.passes["Type"] == "Overtake").sum())
+    ax.set_title(
+        f"{overtakes} on-track passes, {len(events.battles)} DRS-range battles "
+        f"of {MIN_BATTLE_LAPS}+ laps"
+    )
+    ax.legend(bbox_to_anchor=(1.0, 1.02))
+    fig.suptitle(f"{session.event.year} {session.event['EventName']} Overtakes and Battles")
+    return fig
+
+
+def plot_pit_stops(session):
+    analysis = get_pit_stop_analysis(session)
+    stops = analysis.stops
+    team_colors = {
+        team: get_team_color(session, driver)
+        for team, driver in stops.groupby("Team")["Driver"].first().items()
+    }
+
+    fig, ((lap_ax, team_ax), (left_ax, right_ax)) = subplots(
+        2, 2, figsize=(16, 11), gridspec_kw={"width_ratios": [2, 1]}
+    )
+    # The battle timeline spans the whole bottom row
+    left_ax.remove()
+    right_ax.remove()
+    battle_ax = fig.add_subplot(lap_ax.get_gridspec()[1, :])
+
+    colors = stops["Team"].map(team_colors).fillna("#888888")
+    for neutralised, marker_face in [(False, None), (True, "none")]:
+        selected = (stops["Neutralised"] == neutralised).to_numpy()
+        if not selected.any():
+            continue
+        lap_ax.scatter(
+            stops["InLap"][selected],
+            stops["TimeLossSeconds"][selected],
+            s=40,
+            facecolors=colors[selected] if marker_face is None else marker_face,
+            edgecolors=colors[selected],
+            label="SC/VSC" if neutralised else "Green Flag",
+            zorder=3,
+        )
+    lap_ax.set_xlabel("In-Lap")
+    lap_ax.set_ylabel("Time Loss (s)")
+    lap_ax.set_title(f"{len(stops)} stops")
+    lap_ax.grid(alpha=0.2)
+    lap_ax.legend()
+
+    by_team = analysis.by_team
+    team_ax.barh(
+        by_team["Team"],
+        by_team["MedianLossSeconds"],
+        color=[team_colors.get(team, "#888888") for team in by_team["Team"]],
+        edgecolor="black",
+    )
+    team_ax.invert_yaxis()
+    team_ax.set_xlabel("Median Green-Flag Loss (s)")
+    team_ax.grid(axis="x", alpha=0.2)
+
+    battles = analysis.battles
+    if battles.empty:
+        battle_ax.text(
+            0.5,
+            0.5,
+            "No undercut or overcut attempts",
+            ha="center",
+            va="center",
+            transform=battle_ax.transAxes,
+        )
+        battle_ax.set_axis_off()
+    else:
+        labels = [
+            f"L{battle.InLap} {battle.Type}: {battle.Driver} on {battle.DriverRival}"
+            for battle in battles.itertuples()
+        ]
+        battle_ax.barh(
+            np.arange(len(battles)),
+            battles["GainSeconds"],
+            color=np.where(battles["Success"], "#2ca02c", "#888888"),
+            edgecolor="black",
+        )
+        battle_ax.set_yticks(np.arange(len(battles)))
+        battle_ax.set_yticklabels(labels)
+        battle_ax.invert_yaxis()
+        battle_ax.axvline(0, color="black", linewidth=0.8)
+        battle_ax.set_xlabel("Gap Gained by the Chasing Car (s)")
+        battle_ax.set_title(
+            f"{int(battles['Success'].sum())} of {len(battles)} undercut/overcut attempts "
+            "gained the place"
+        )
+        battle_ax.grid(axis="x", alpha=0.2)
+
+    fig.suptitle(f"{session.event.year} {session.event['EventName']} Pit Stop Analysis")
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,184 @@
+"""Batched drawing helpers that keep a figure's artist count independent of data density."""
+from __future__ import annotations
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+
+ARTIST_BUDGET = 1500
+
+
+def subplots(*args, figsize=None, **kwargs):
+    """``plt.subplots`` on a standalone figure that pyplot does not track.
+
+    Nothing global is touched, so threads can build figures concurrently
+    and the figure is freed with its last reference instead of ``plt.close``.
+    """
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots(*args, **kwargs)
+
+
+def merge_true_runs(x, mask) -> np.ndarray:
+    """``(start, end)`` of every run of consecutive True samples.
+
+    A run lasts until the next sample, so a single wet reading still
+    covers the interval until the following weather update.
+    """
+    x = np.asarray(x, dtype=float)
+    mask = np.asarray(mask, dtype=bool)
+    if not mask.any():
+        return np.empty((0, 2))
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    end_x = np.append(x[1:], x[-1])[ends - 1]
+    return np.column_stack([x[starts], end_x])
+
+
+def draw_spans(ax, intervals, **kwargs):
+    """All ``(start, end)`` intervals as one full-height collection."""
+    intervals = np.asarray(intervals, dtype=float).reshape(-1, 2)
+    if len(intervals) == 0:
+        return None
+    return ax.broken_barh(
+        list(zip(intervals[:, 0], intervals[:, 1] - intervals[:, 0])),
+        (0, 1),
+        transform=ax.get_xaxis_transform(),
+        **kwargs,
+    )
+
+
+def draw_bars(ax, rows, lefts, widths, colors, height: float = 0.8, **kwargs):
+    """Horizontal bars at integer ``rows`` as a single PolyCollection."""
+    rows = np.asarray(rows, dtype=float)
+    lefts = np.asarray(lefts, dtype=float)
+    rights = lefts + np.asarray(widths, dtype=float)
+    bottoms = rows - height / 2
+    tops = rows + height / 2
+    verts = np.stack(
+        [
+            np.column_stack([lefts, bottoms]),
+            np.column_stack([lefts, tops]),
+            np.column_stack([rights, tops]),
+            np.column_stack([rights, bottoms]),
+        ],
+        axis=1,
+    )
+    bars = PolyCollection(verts, facecolors=colors, **kwargs)
+    ax.add_collection(bars)
+    if len(verts):
+        ax.update_datalim(verts.reshape(-1, 2))
+        ax.autoscale_view()
+    return bars
+
+
+def draw_markers(ax, x, labels=None, **kwargs):
+    """Vertical markers as one LineCollection, labelled on a secondary top axis."""
+    x = np.asarray(x, dtype=float)
+    markers = ax.vlines(x, 0, 1, transform=ax.get_xaxis_transform(), **kwargs)
+    if labels is not None:
+        top = ax.secondary_xaxis("top")
+        top.set_xticks(x, labels=list(labels), fontsize=8)
+        top.tick_params(length=0)
+    return markers
+
+
+def count_artists(fig) -> int:
+    return len(fig.findobj(Artist))
+
+
+def enforce_artist_budget(fig, budget: int = ARTIST_BUDGET) -> int:
+    """Rasterise the data layer of figures over ``budget`` artists.
+
+    Returns the artist count; vector output of an over-budget figure would
+    cost in proportion to its artists, a raster layer does not.
+    """
+    artists = count_artists(fig)
+    if artists > budget:
+        for ax in fig.axes:
+            for artist in [*ax.lines, *ax.collections, *ax.patches]:
+                artist.set_rasterized(True)
+    return artists
+
+
+def batched_kde(values, groups, n_groups: int, points: int = 128, cut: float = 2.0):
+    """Gaussian KDE of every group in one pass, each on its own value grid.
+
+    Bandwidths follow Scott's rule per group and every density integrates to
+    one, matching seaborn's ``density_norm="area"`` violins.
+    """
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups, dtype=int)
+    counts = np.bincount(groups, minlength=n_groups).astype(float)
+    sums = np.bincount(groups, weights=values, minlength=n_groups)
+    squares = np.bincount(groups, weights=values**2, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts
+        std = np.sqrt(np.maximum(squares / counts - mean**2, 0.0) * counts / (counts - 1))
+        bandwidth = std * counts ** (-1 / 5)
+    bandwidth = np.where(np.isfinite(bandwidth) & (bandwidth > 0), bandwidth, 0.1)
+
+    low = np.full(n_groups, np.inf)
+    high = np.full(n_groups, -np.inf)
+    np.minimum.at(low, groups, values)
+    np.maximum.at(high, groups, values)
+    grid = np.linspace(low - cut * bandwidth, high + cut * bandwidth, points, axis=1)
+
+    # One kernel row per sample, evaluated on its own group's grid
+    scaled = (grid[groups] - values[:, None]) / bandwidth[groups, None]
+    kernel = np.exp(-0.5 * scaled**2) / (bandwidth[groups, None] * np.sqrt(2 * np.pi))
+    density = np.zeros((n_groups, points))
+    np.add.at(density, groups, kernel)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        density /= counts[:, None]
+    return grid, np.nan_to_num(density)
+
+
+def draw_violins(ax, grid, density, positions, colors, width: float = 0.8, **kwargs):
+    """Mirrored densities as one PolyCollection; widths share one scale."""
+    present = density.max(axis=1) > 0
+    grid, density = grid[present], density[present]
+    positions = np.asarray(positions, dtype=float)[present]
+    colors = np.asarray(colors, dtype=object)[present]
+    half_width = density / density.max() * width / 2 if len(density) else density
+
+    left = positions[:, None] - half_width
+    right = positions[:, None] + half_width
+    verts = np.concatenate(
+        [np.stack([left, grid], axis=2), np.stack([right, grid], axis=2)[:, ::-1]], axis=1
+    )
+    violins = PolyCollection(verts, facecolors=list(colors), **kwargs)
+    ax.add_collection(violins)
+    if len(verts):
+        ax.update_datalim(verts.reshape(-1, 2))
+        ax.autoscale_view()
+    return violins
+
+
+def beeswarm_offsets(values, groups, bin_size: float, step: float, max_offset: float):
+    """Horizontal offsets placing points side by side within value bins.
+
+    Points of a group falling in the same bin of height ``bin_size`` are
+    spread alternately left and right; crowded bins are squeezed to stay
+    within ``max_offset``. Linear in the number of points, unlike swarm
+    placement which tests every point against its neighbours.
+    """
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups, dtype=np.int64)
+    bins = np.floor((values - np.nanmin(values)) / bin_size).astype(np.int64)
+    cell = groups * (bins.max() + 1) + bins
+
+    _, inverse, counts = np.unique(cell, return_inverse=True, return_counts=True)
+    order = np.argsort(inverse, kind="stable")
+    first = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.empty(len(values), dtype=np.int64)
+    rank[order] = np.arange(len(values)) - np.repeat(first, counts)
+
+    cell_step = np.minimum(step, max_offset / np.maximum(counts // 2, 1))[inverse]
+    side = np.where(rank % 2 == 1, -1.0, 1.0)
+    offset = (rank + 1) // 2 * side * cell_step
+    # Even-sized cells are centred instead of leaning to the right
+    offset += np.where(counts[inverse] % 2 == 0, cell_step / 2, 0.0)
+    return offset
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.plots.rendering import subplots
+from app.services.season import get_season_summaries
+from app.services.sessions import get_team_color
+
+
+def plot_season_overview(session):
+    # Summaries are persisted by ``python -m app.services.season <year>``, never here
+    year = int(session.event.year)
+    summaries = get_season_summaries(year)
+    if summaries.empty:
+        raise ValueError(
+            f"No sessions of {year} are summarised yet; "
+            f"run `python -m app.services.season {year}` to build them."
+        )
+
+    qualifying = summaries[summaries["SessionType"] == "Q"].dropna(subset=["TeammateGap"])
+    races = summaries[summaries["SessionType"] == "R"].dropna(subset=["PaceRank"])
+
+    fig, (h2h_ax, pace_ax) = subplots(
+        1, 2, figsize=(18, 9), gridspec_kw={"width_ratios": [2, 3]}
+    )
+
+    head_to_head = (
+        qualifying.assign(Won=qualifying["TeammateGap"] < 0)
+        .groupby("Driver")
+        .agg(
+            Team=("Team", "last"),
+            MedianGap=("TeammateGap", "median"),
+            Won=("Won", "sum"),
+            Sessions=("Won", "size"),
+        )
+        .sort_values(["Team", "MedianGap"])
+    )
+    rows = np.arange(len(head_to_head))
+    h2h_ax.barh(
+        rows,
+        head_to_head["MedianGap"],
+        color=[get_team_color(session, driver) for driver in head_to_head.index],
+    )
+    for row, (driver, record) in zip(rows, head_to_head.iterrows()):
+        h2h_ax.text(
+            0,
+            row,
+            f" {int(record['Won'])}-{int(record['Sessions'] - record['Won'])} ",
+            ha="right" if record["MedianGap"] > 0 else "left",
+            va="center",
+            fontsize=8,
+        )
+    h2h_ax.set_yticks(rows)
+    h2h_ax.set_yticklabels(head_to_head.index)
+    h2h_ax.invert_yaxis()
+    h2h_ax.axvline(0, color="grey", linewidth=1)
+    h2h_ax.set_xlabel("Median Qualifying Gap to Teammate (s)")
+    h2h_ax.set_title("Qualifying Head-to-Head")
+    h2h_ax.grid(axis="x", alpha=0.2)
+
+    if not races.empty:
+        ranks = races.pivot_table(index="Driver", columns="Round", values="PaceRank")
+        ranks = ranks.loc[ranks.mean(axis=1).sort_values().index]
+        image = pace_ax.imshow(ranks.to_numpy(), aspect="auto", cmap="RdYlGn_r")
+        pace_ax.set_yticks(np.arange(len(ranks)))
+        pace_ax.set_yticklabels(ranks.index)
+        pace_ax.set_xticks(np.arange(len(ranks.columns)))
+        pace_ax.set_xticklabels(ranks.columns)
+        pace_ax.set_xlabel("Round")
+        fig.colorbar(image, ax=pace_ax, label="Median Green-Flag Pace Rank")
+    pace_ax.set_title("Race Pace Rank by Round")
+
+    fig.suptitle(f"{year} Season Overview, {summaries['Round'].nunique()} rounds")
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import numpy as np
+import seaborn as sns
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
+
+from app.plots.rendering import subplots
+from app.services.corners import CORNER_METRICS, get_corner_metrics
+from app.services.sessions import get_driver_color
+from app.services.speed_heatmap import get_speed_heatmap
+from app.services.track_geometry import get_track_geometry
+
+
+def draw_track_outline(ax, geometry, linewidth=16, corner_labels=False):
+    ax.plot(geometry.x, geometry.y, color="black", linestyle="-", linewidth=linewidth, zorder=0)
+    if corner_labels:
+        for _, corner in geometry.corners.iterrows():
+            ax.text(
+                corner["X"],
+                corner["Y"],
+                corner["Corner"],
+                fontsize=8,
+                ha="center",
+                va="center",
+                color="white",
+                zorder=3,
+            )
+
+
+def plot_corner_comparison(session, corner, metric="CornerTime"):
+    metrics = get_corner_metrics(session)
+    corner_laps = metrics[metrics["Corner"] == corner].dropna(subset=[metric])
+    accurate_laps = corner_laps[corner_laps["IsAccurate"].fillna(False).astype(bool)]
+    if not accurate_laps.empty:
+        corner_laps = accurate_laps
+    if corner_laps.empty:
+        raise ValueError(f"No {metric} values are available for {corner}.")
+
+    # Best first: least time, highest apex speed, latest braking, earliest throttle
+    ascending = metric in {"CornerTime", "BrakingPoint", "ThrottlePickup"}
+    driver_order = (
+        corner_laps.groupby("Driver")[metric]
+        .median()
+        .sort_values(ascending=ascending)
+        .index.tolist()
+    )
+    palette = {driver: get_driver_color(session, driver) for driver in driver_order}
+
+    fig, ax = subplots(figsize=(14, max(6, len(driver_order) * 0.45)))
+    sns.boxplot(
+        data=corner_laps,
+        x=metric,
+        y="Driver",
+        order=driver_order,
+        palette=palette,
+        linewidth=1,
+        fliersize=0,
+        ax=ax,
+    )
+    sns.stripplot(
+        data=corner_laps,
+        x=metric,
+        y="Driver",
+        order=driver_order,
+        color="white",
+        alpha=0.4,
+        size=2.5,
+        ax=ax,
+    )
+
+    ax.set_xlabel(CORNER_METRICS[metric])
+    ax.set_ylabel("Driver")
+    ax.set_title(f"{corner} - all laps")
+    ax.grid(axis="x", alpha=0.2)
+    fig.suptitle(
+        f"{session.event.year} {session.event['EventName']} Corner Comparison"
+    )
+    fig.tight_layout()
+    return fig
+
+
+def plot_speed_heatmap(session, drivers=()):
+    heatmap = get_speed_heatmap(session, tuple(drivers))
+    geometry = get_track_geometry(session)
+    summary = heatmap.summary.dropna(subset=["MeanSpeed"])
+
+    fig, (map_ax, delta_ax) = subplots(
+        2, 1, figsize=(14, 14), gridspec_kw={"height_ratios": [3, 2]}
+    )
+
+    x, y = geometry.xy_at(summary["BinStart"].to_numpy() + heatmap.bin_length / 2)
+    points = np.array([x, y]).T.reshape(-1, 1, 2)
+    segments = np.concatenate([points[:-1], points[1:]], axis=1)
+    norm = Normalize(summary["MeanSpeed"].min(), summary["MeanSpeed"].max())
+    line_collection = LineCollection(segments, cmap="plasma", norm=norm, linewidth=6)
+    line_collection.set_array(summary["MeanSpeed"].to_numpy()[:-1])
+
+    draw_track_outline(map_ax, geometry, linewidth=12, corner_labels=True)
+    map_ax.add_collection(line_collection)
+    map_ax.axis("equal")
+    map_ax.axis("off")
+    colorbar = fig.colorbar(line_collection, ax=map_ax, orientation="horizontal", shrink=0.5)
+    colorbar.set_label("Mean Speed, all laps (km/h)")
+
+    delta = heatmap.driver_delta
+    driver_order = delta.mean(axis=1).sort_values(ascending=False).index.tolist()
+    image = delta_ax.imshow(
+        delta.loc[driver_order].to_numpy(),
+        aspect="auto",
+        cmap="magma",
+        vmin=np.nanpercentile(delta.to_numpy(), 5),
+        vmax=0,
+        interpolation="nearest",
+        extent=[0, heatmap.bin_start[-1] + heatmap.bin_length, len(driver_order), 0],
+    )
+    delta_ax.set_yticks(np.arange(len(driver_order)) + 0.5)
+    delta_ax.set_yticklabels(driver_order)
+    delta_ax.set_xticks(geometry.corners["Distance"])
+    delta_ax.set_xticklabels(geometry.corners["Corner"], fontsize=7)
+    delta_ax.set_xlabel("Corner")
+    fig.colorbar(image, ax=delta_ax, label="Speed vs Session Best (km/h)")
+
+    fig.suptitle(
+        f"{session.event.year} {session.event['EventName']} Speed Heatmap - "
+        f"{int(heatmap.summary['Samples'].sum()):,} samples"
+    )
+    return fig
@@ -0,0 +1,130 @@
+"""Headless HTTP render service for embedding analyses without a Streamlit session.
+
+Run ``python -m app.server [port] [fixture_dir]``; with a fixture directory
+sessions come from pickles instead of FastF1. ``POST /render`` takes an
+``AnalysisSelection``-shaped JSON object plus ``year``, ``event_name`` and
+an optional ``format`` (png, csv or parquet); ``GET /health`` reports the
+queue.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.main import PLOT_HANDLERS, render_plot
+from app.services.render_jobs import (
+    Overloaded,
+    RenderService,
+    fixture_session_loader,
+    parse_render_request,
+)
+from app.services.sessions import get_session
+
+
+RENDER_HOST = os.getenv("F1_RENDER_HOST", "127.0.0.1")
+RENDER_PORT = int(os.getenv("F1_RENDER_PORT", "8765"))
+RENDER_TIMEOUT_SECONDS = float(os.getenv("F1_RENDER_TIMEOUT", "120"))
+RETRY_AFTER_SECONDS = 2
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server_version = "F1Render/1.0"
+
+    @property
+    def service(self) -> RenderService:
+        return self.server.service
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_error(HTTPStatus.NOT_FOUND, "Unknown path.")
+            return
+        self._send(HTTPStatus.OK, json.dumps(self.service.snapshot()).encode(), "application/json")
+
+    def do_POST(self):
+        if self.path != "/render":
+            self._send_error(HTTPStatus.NOT_FOUND, "Unknown path.")
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_BYTES:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The request body is too large.")
+            return
+        try:
+            job = parse_render_request(
+                json.loads(self.rfile.read(length) or b"null"), PLOT_HANDLERS
+            )
+        except (json.JSONDecodeError, ValueError) as exc:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(exc))
+            return
+
+        try:
+            result, shared = self.service.render(
+                self._client_id(), job, timeout=RENDER_TIMEOUT_SECONDS
+            )
+        except Overloaded as exc:
+            self._send_error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                str(exc),
+                {"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        except FutureTimeoutError:
+            self._send_error(HTTPStatus.GATEWAY_TIMEOUT, "The render did not finish in time.")
+        except ValueError as exc:
+            self._send_error(HTTPStatus.UNPROCESSABLE_ENTITY, str(exc))
+        except Exception as exc:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Error generating output: {exc}")
+        else:
+            self._send(
+                HTTPStatus.OK,
+                result.body,
+                result.content_type,
+                {
+                    "X-Render-Seconds": f"{result.seconds:.3f}",
+                    "X-Deduplicated": "1" if shared else "0",
+                },
+            )
+
+    def _client_id(self) -> str:
+        return self.headers.get("X-Client-Id") or self.client_address[0]
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str, headers=None):
+        self._send(status, json.dumps({"error": message}).encode(), "application/json", headers)
+
+
+def make_server(
+    service: RenderService, host: str = RENDER_HOST, port: int = RENDER_PORT
+) -> ThreadingHTTPServer:
+    """An HTTP server for ``service``; connections get threads, renders use its pool."""
+    server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else RENDER_PORT
+    load_session = fixture_session_loader(sys.argv[2]) if len(sys.argv) > 2 else get_session
+    service = RenderService(load_session, render_plot)
+    server = make_server(service, port=port)
+    print(f"Serving renders on http://{RENDER_HOST}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
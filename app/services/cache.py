@@ -0,0 +1,88 @@
+"""Per-session caches for derived analysis data."""
+from __future__ import annotations
+
+import functools
+import threading
+import weakref
+
+
+class SessionCache:
+    """Results of one derivation, keyed by session object and call arguments.
+
+    Entries live as long as the session does, so evicting a session from
+    ``get_session`` releases everything derived from it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._entries: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+
+    def get_or_compute(self, session, key, compute):
+        with self._lock:
+            entries = self._entries.get(session)
+            if entries is not None and key in entries:
+                self.hits += 1
+                return entries[key]
+            key_lock = self._key_locks.setdefault((id(session), key), threading.Lock())
+
+        # Concurrent callers for the same entry wait for one computation
+        with key_lock:
+            with self._lock:
+                entries = self._entries.setdefault(session, {})
+                if key in entries:
+                    self.hits += 1
+                    return entries[key]
+
+            value = compute()
+            with self._lock:
+                self.misses += 1
+                self._entries.setdefault(session, {})[key] = value
+                self._key_locks.pop((id(session), key), None)
+        return value
+
+    @property
+    def hit_rate(self) -> float | None:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else None
+
+    def entry_count(self, session=None) -> int:
+        with self._lock:
+            if session is not None:
+                return len(self._entries.get(session, {}))
+            return sum(len(entries) for entries in self._entries.values())
+
+    def evict(self, session=None):
+        with self._lock:
+            if session is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(session, None)
+
+
+_CACHES: dict[str, SessionCache] = {}
+
+
+def session_cache(name: str):
+    """Cache a ``func(session, *args)`` derivation per session and arguments."""
+    cache = _CACHES.setdefault(name, SessionCache(name))
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(session, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(
+                session, key, lambda: func(session, *args, **kwargs)
+            )
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def get_session_caches() -> dict[str, SessionCache]:
+    return dict(_CACHES)
@@ -0,0 +1,159 @@
+"""Per-lap, per-corner metrics computed in one pass over the lap telemetry."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.telemetry import LAP_KEY_STRIDE, get_lap_telemetry
+
+
+CORNER_METRICS = {
+    "CornerTime": "Time Through Corner (s)",
+    "ApexSpeed": "Apex Speed (km/h)",
+    "BrakingPoint": "Braking Point (m before apex marker)",
+    "ThrottlePickup": "Throttle Pickup (m after apex)",
+}
+
+APPROACH_LENGTH = 200.0
+EXIT_LENGTH = 150.0
+THROTTLE_PICKUP_LEVEL = 90.0
+
+
+def get_corner_windows(corners: pd.DataFrame) -> pd.DataFrame:
+    corners = corners.dropna(subset=["Distance"]).sort_values("Distance")
+    distance = corners["Distance"].to_numpy(dtype=float)
+
+    # Windows stop half-way to the neighbouring corners so they never overlap
+    midpoints = (distance[1:] + distance[:-1]) / 2
+    previous_mid = np.r_[0.0, midpoints]
+    next_mid = np.r_[midpoints, np.inf]
+
+    letters = corners.get("Letter", pd.Series("", index=corners.index)).fillna("")
+    return pd.DataFrame(
+        {
+            "Corner": [
+                f"T{int(number)}{letter}"
+                for number, letter in zip(corners["Number"], letters)
+            ],
+            "CornerDistance": distance,
+            "WindowStart": np.maximum(distance - APPROACH_LENGTH, previous_mid),
+            "WindowEnd": np.minimum(distance + EXIT_LENGTH, next_mid),
+        }
+    )
+
+
+def _first_distance_per_window(window, distance, mask, window_count):
+    first = np.full(window_count, np.nan)
+    selected = np.flatnonzero(mask)
+    # Samples are in distance order inside a window, so the first hit wins
+    unique_windows, first_position = np.unique(window[selected], return_index=True)
+    first[unique_windows] = distance[selected[first_position]]
+    return first
+
+
+def build_corner_metrics(
+    telemetry: pd.DataFrame, laps: pd.DataFrame, windows: pd.DataFrame
+) -> pd.DataFrame:
+    lap_ids = (
+        telemetry.groupby("LapIndex", sort=True)
+        .agg(
+            Driver=("Driver", "first"),
+            LapNumber=("LapNumber", "first"),
+            LapDistance=("Distance", "max"),
+        )
+        .reset_index()
+    )
+    lap_count = len(lap_ids)
+    corner_count = len(windows)
+    window_count = lap_count * corner_count
+
+    key = telemetry["LapKey"].to_numpy()
+    distance = telemetry["Distance"].to_numpy()
+    speed = telemetry["Speed"].to_numpy(dtype=float)
+    session_seconds = telemetry["SessionSeconds"].to_numpy()
+    lap_offset = lap_ids["LapIndex"].to_numpy()[:, None] * LAP_KEY_STRIDE
+
+    start_keys = (lap_offset + windows["WindowStart"].to_numpy()[None, :]).ravel()
+    end_keys = (lap_offset + windows["WindowEnd"].to_numpy()[None, :]).ravel()
+
+    # Label every sample with the (lap, corner) window it falls into
+    window = np.searchsorted(start_keys, key, side="right") - 1
+    inside = window >= 0
+    inside[inside] &= key[inside] < end_keys[window[inside]]
+    window = window[inside]
+    window_distance = distance[inside]
+    window_speed = speed[inside]
+
+    # Apex: slowest sample per window, found by sorting on (window, speed)
+    order = np.lexsort((window_speed, window))
+    apex_windows, apex_first = np.unique(window[order], return_index=True)
+    apex_speed = np.full(window_count, np.nan)
+    apex_distance = np.full(window_count, np.nan)
+    apex_speed[apex_windows] = window_speed[order][apex_first]
+    apex_distance[apex_windows] = window_distance[order][apex_first]
+
+    sample_apex = apex_distance[window]
+    braking_start = np.full(window_count, np.nan)
+    throttle_pickup = np.full(window_count, np.nan)
+    if "Brake" in telemetry.columns:
+        brake = telemetry["Brake"].to_numpy()[inside].astype(bool)
+        braking_start = _first_distance_per_window(
+            window, window_distance, brake & (window_distance <= sample_apex), window_count
+        )
+    if "Throttle" in telemetry.columns:
+        throttle = telemetry["Throttle"].to_numpy(dtype=float)[inside]
+        throttle_pickup = _first_distance_per_window(
+            window,
+            window_distance,
+            (throttle >= THROTTLE_PICKUP_LEVEL) & (window_distance >= sample_apex),
+            window_count,
+        )
+
+    # Time through the window, interpolated at its exact entry and exit distance
+    complete = (
+        end_keys - lap_offset.repeat(corner_count)
+        <= lap_ids["LapDistance"].to_numpy().repeat(corner_count)
+    )
+    corner_time = np.interp(end_keys, key, session_seconds) - np.interp(
+        start_keys, key, session_seconds
+    )
+    corner_time[~complete] = np.nan
+
+    corner_distance = np.tile(windows["CornerDistance"].to_numpy(), lap_count)
+    metrics = pd.DataFrame(
+        {
+            "Driver": lap_ids["Driver"].to_numpy().repeat(corner_count),
+            "LapNumber": lap_ids["LapNumber"].to_numpy().repeat(corner_count),
+            "Corner": np.tile(windows["Corner"].to_numpy(), lap_count),
+            "CornerDistance": corner_distance,
+            "ApexSpeed": apex_speed,
+            "ApexDistance": apex_distance,
+            "BrakingPoint": corner_distance - braking_start,
+            "ThrottlePickup": throttle_pickup - apex_distance,
+            "CornerTime": corner_time,
+        }
+    )
+
+    lap_info = laps[["Driver", "LapNumber", "LapTime", "Compound", "IsAccurate"]].copy()
+    lap_info["LapNumber"] = lap_info["LapNumber"].astype(int)
+    return metrics.merge(lap_info, on=["Driver", "LapNumber"], how="left")
+
+
+def get_session_corners(session) -> pd.DataFrame:
+    try:
+        corners = session.get_circuit_info().corners
+    except Exception:
+        corners = pd.DataFrame()
+
+    if corners is None or corners.empty or "Distance" not in corners.columns:
+        raise ValueError("No corner information is available for this circuit.")
+    return get_corner_windows(corners)
+
+
+@session_cache("corner_metrics")
+def get_corner_metrics(session) -> pd.DataFrame:
+    laps = session.laps.dropna(subset=["LapNumber"])
+    return build_corner_metrics(
+        get_lap_telemetry(session), laps, get_session_corners(session)
+    )
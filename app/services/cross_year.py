@@ -0,0 +1,117 @@
+"""Fastest laps of one Grand Prix across seasons on a common track distance."""
+from __future__ import annotations
+
+import numpy as np
+import streamlit as st
+
+from app.services.driver_comparison import ALIGN_STEP, AlignedLaps
+from app.services.sessions import load_sessions
+from app.services.track_geometry import get_track_geometry
+
+
+def align_lap_to_geometry(lap, geometry, distance: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Speed and lap time at each ``distance`` of ``geometry``'s centreline.
+
+    Position samples are snapped onto the reference centreline instead of
+    integrating speed, so a changed pit lane or a reprofiled corner in another
+    season still lines up with the same physical place on track.
+    """
+    position = lap.get_pos_data()
+    car_data = lap.get_car_data()
+    position_seconds = position["SessionTime"].dt.total_seconds().to_numpy()
+    car_seconds = car_data["SessionTime"].dt.total_seconds().to_numpy()
+
+    snapped = geometry.snap(position["X"].to_numpy(), position["Y"].to_numpy())
+    # Samples either side of the line can snap to the wrong end of the lap
+    progress = np.linspace(0.0, 1.0, len(snapped))
+    length = geometry.length
+    snapped = np.where((progress < 0.2) & (snapped > length / 2), snapped - length, snapped)
+    snapped = np.where((progress > 0.8) & (snapped < length / 2), snapped + length, snapped)
+    snapped = np.maximum.accumulate(snapped) + np.arange(len(snapped)) * 1e-6
+
+    lap_start = lap["LapStartTime"].total_seconds()
+    speed = np.interp(position_seconds, car_seconds, car_data["Speed"].to_numpy(dtype=float))
+    return (
+        np.interp(distance, snapped, speed),
+        np.interp(distance, snapped, position_seconds - lap_start),
+    )
+
+
+def get_cross_year_laps(
+    years: tuple[int, ...], event_name: str, session_type: str, location: str | None = None
+) -> tuple[AlignedLaps, dict[int, str]]:
+    """Each season's fastest lap at ``location`` aligned on the latest season's geometry.
+
+    Returns the aligned laps, newest season first, and the reason every
+    skipped season could not be compared.
+    """
+    aligned, skipped, load_failed = _cross_year_laps(years, event_name, session_type, location)
+    if load_failed:
+        # A failed download may work next time, so only complete results stay cached
+        _cross_year_laps.clear(years, event_name, session_type, location)
+    return aligned, skipped
+
+
+def _held_at(session, location: str | None) -> bool:
+    if location is None:
+        return True
+    return str(session.event.get("Location", "")).casefold() == location.casefold()
+
+
+@st.cache_data(show_spinner=False)
+def _cross_year_laps(
+    years: tuple[int, ...], event_name: str, session_type: str, location: str | None
+) -> tuple[AlignedLaps, dict[int, str], bool]:
+    requests = [(year, event_name, session_type) for year in sorted(set(years), reverse=True)]
+    sessions, errors = load_sessions(requests)
+    skipped = {request[0]: str(exc) for request, exc in errors.items()}
+
+    laps = []
+    for request in requests:
+        session = sessions.get(request)
+        if session is None:
+            continue
+        # FastF1 matches event names loosely, so a season without this Grand
+        # Prix can resolve to another circuit
+        if not _held_at(session, location):
+            skipped[request[0]] = (
+                f"{session.event['EventName']} at {session.event.get('Location')}, "
+                f"not {location}"
+            )
+            continue
+        lap = session.laps.pick_fastest()
+        if lap is None:
+            skipped[request[0]] = "no timed lap"
+            continue
+        laps.append((request[0], session, lap))
+
+    if not laps:
+        if errors:
+            raise ValueError("None of the selected seasons could be loaded for this event.")
+        raise ValueError("None of the selected seasons has a timed lap at this circuit.")
+
+    geometry = get_track_geometry(laps[0][1])
+    distance = np.arange(0.0, geometry.length, ALIGN_STEP)
+    labels, lap_numbers, speeds, elapsed = [], [], [], []
+    for year, _, lap in laps:
+        try:
+            speed, lap_clock = align_lap_to_geometry(lap, geometry, distance)
+        except Exception as exc:
+            skipped[year] = str(exc)
+            continue
+        labels.append(f"{year} {lap['Driver']}")
+        lap_numbers.append(int(lap["LapNumber"]))
+        speeds.append(speed)
+        elapsed.append(lap_clock)
+
+    if not labels:
+        raise ValueError("No season has position data to align on the track geometry.")
+
+    aligned = AlignedLaps(
+        drivers=labels,
+        lap_numbers=lap_numbers,
+        distance=distance,
+        elapsed=np.vstack(elapsed),
+        channels={"Speed": np.vstack(speeds)},
+    )
+    return aligned, dict(sorted(skipped.items())), bool(errors)
@@ -0,0 +1,105 @@
+"""Planning and concurrent rendering of several analyses of one session."""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+
+from app.plots.rendering import enforce_artist_budget
+from app.services.datasets import prepare_dataset
+from app.services.lap_classes import get_classified_laps
+from app.services.race_trace import get_race_trace
+from app.services.telemetry import get_lap_telemetry
+from app.services.track_geometry import get_track_geometry
+
+
+DASHBOARD_WORKERS = 4
+
+SHARED_INPUTS = {
+    "lap_telemetry": get_lap_telemetry,
+    "track_geometry": get_track_geometry,
+    "classified_laps": get_classified_laps,
+    "race_trace": get_race_trace,
+}
+
+ANALYSIS_INPUTS = {
+    "Fastest Lap": ("lap_telemetry",),
+    "Fastest Sectors": ("lap_telemetry", "track_geometry"),
+    "Full Telemetry": ("lap_telemetry",),
+    "Gear Shifts On Track": ("track_geometry",),
+    "Corner-Annotated Speed Trace": ("track_geometry",),
+    "Corner Comparison": ("lap_telemetry", "track_geometry"),
+    "Speed Map": ("track_geometry",),
+    "Speed Heatmap": ("track_geometry",),
+    "Ideal Lap Leaderboard": ("lap_telemetry", "track_geometry"),
+    "Lap Time Distribution": ("classified_laps",),
+    "Overtakes and Battles": ("lap_telemetry", "race_trace"),
+    "Pit Stop Analysis": ("classified_laps", "race_trace"),
+    "Position Changes": ("race_trace",),
+    "Race Trace": ("race_trace",),
+    "Stint Pace Model": ("classified_laps",),
+    "Team Pace Comparison": ("classified_laps",),
+}
+
+
+@dataclass(frozen=True)
+class PanelResult:
+    selection: object
+    image: bytes | None = None
+    error: Exception | None = None
+    seconds: float = 0.0
+
+
+def plan_inputs(analyses) -> list[str]:
+    """Shared inputs needed by ``analyses``, each listed once."""
+    return list(
+        dict.fromkeys(name for analysis in analyses for name in ANALYSIS_INPUTS.get(analysis, ()))
+    )
+
+
+def panel_selections(selection) -> list:
+    return [
+        replace(selection, analysis_type=analysis) for analysis in selection.dashboard_analyses
+    ]
+
+
+def _render_panel(session, selection, inputs, render, to_image, validate) -> PanelResult:
+    started = time.perf_counter()
+    try:
+        error = validate(selection)
+        if error:
+            raise ValueError(error)
+        for name in ANALYSIS_INPUTS.get(selection.analysis_type, ()):
+            inputs[name].result()
+        prepare_dataset(session, selection)
+        # Plots build standalone figures, so panels render concurrently
+        fig = render(session, selection)
+        enforce_artist_budget(fig)
+        image = to_image(fig)
+    except Exception as exc:
+        return PanelResult(selection, error=exc, seconds=time.perf_counter() - started)
+    return PanelResult(selection, image=image, seconds=time.perf_counter() - started)
+
+
+def render_panels(
+    session, selections, render, to_image, validate, max_workers: int = DASHBOARD_WORKERS
+):
+    """Yield a :class:`PanelResult` for each selection as soon as it is ready.
+
+    Shared inputs are submitted first so every panel needing them waits on
+    the same computation; each panel then builds its own dataset in parallel.
+    """
+    selections = list(selections)
+    if not selections:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        inputs = {
+            name: executor.submit(SHARED_INPUTS[name], session)
+            for name in plan_inputs(selection.analysis_type for selection in selections)
+        }
+        futures = [
+            executor.submit(_render_panel, session, selection, inputs, render, to_image, validate)
+            for selection in selections
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,172 @@
+"""Prepared per-analysis datasets shared by plots, exports and other consumers."""
+from __future__ import annotations
+
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.corners import get_corner_metrics
+from app.services.cross_year import get_cross_year_laps
+from app.services.driver_comparison import get_aligned_laps, get_driver_laps
+from app.services.ideal_lap import get_ideal_laps
+from app.services.lap_classes import filter_pace_laps, get_classified_laps
+from app.services.pit_stops import get_pit_stop_analysis
+from app.services.race_events import get_race_events
+from app.services.race_trace import get_race_trace
+from app.services.season import get_season_summaries
+from app.services.speed_heatmap import get_speed_heatmap
+from app.services.stint_pace import get_stint_pace
+
+
+QUALIFYING_PARTS = ["Q1", "Q2", "Q3"]
+
+
+@session_cache("stint_table")
+def get_stint_table(session) -> pd.DataFrame:
+    """One row per stint with its length and first lap offset, in stint order."""
+    laps = session.laps[["Driver", "Stint", "Compound", "LapNumber"]]
+    laps = laps.dropna(subset=["Driver", "Stint", "Compound", "LapNumber"])
+    stints = (
+        laps.astype({"Stint": int})
+        .groupby(["Driver", "Stint", "Compound"])
+        .size()
+        .reset_index(name="StintLength")
+        .sort_values(["Driver", "Stint"], ignore_index=True)
+    )
+    stints["StintStart"] = (
+        stints.groupby("Driver")["StintLength"].cumsum() - stints["StintLength"]
+    )
+    return stints
+
+
+@session_cache("pace_laps")
+def get_pace_laps(session, lap_filter: str | None = None) -> pd.DataFrame:
+    """Timed laps passing ``lap_filter``, with their lap class and lap time in seconds."""
+    laps = filter_pace_laps(session, get_classified_laps(session), lap_filter)
+    laps = pd.DataFrame(laps.dropna(subset=["LapTime"]))
+    laps["LapTimeSeconds"] = laps["LapTime"].dt.total_seconds()
+    return laps[
+        [
+            "Driver",
+            "Team",
+            "LapNumber",
+            "LapTime",
+            "LapTimeSeconds",
+            "Compound",
+            "LapClass",
+            "GapAhead",
+        ]
+    ].reset_index(drop=True)
+
+
+@session_cache("fastest_lap_telemetry")
+def get_fastest_lap_telemetry(session, driver: str) -> pd.DataFrame:
+    lap = session.laps.pick_drivers(driver).pick_fastest()
+    if lap is None:
+        raise ValueError("No fastest lap is available for this driver in the selected session.")
+    return lap.get_telemetry()
+
+
+@session_cache("qualifying_times")
+def get_qualifying_times(session) -> pd.DataFrame:
+    """Classified drivers with their Q1-Q3 times in seconds, in finishing order."""
+    results = getattr(session, "results", None)
+    if results is None or results.empty:
+        raise ValueError("No qualifying results are available for this session.")
+
+    columns = ["Abbreviation", "Position", *QUALIFYING_PARTS]
+    if any(column not in results.columns for column in columns):
+        raise ValueError("This qualifying session does not include complete Q1/Q2/Q3 data.")
+
+    times = results.dropna(subset=["Abbreviation"])[columns].copy()
+    times["Position"] = pd.to_numeric(times["Position"], errors="coerce")
+    times = times.dropna(subset=["Position"]).sort_values("Position")
+    for column in QUALIFYING_PARTS:
+        times[column] = pd.to_timedelta(times[column], errors="coerce").dt.total_seconds()
+    return times.reset_index(drop=True)
+
+
+def _cross_year_frame(session, selection) -> pd.DataFrame:
+    years = tuple(sorted({int(session.event.year), *selection.compare_years}))
+    aligned, _ = get_cross_year_laps(
+        years, session.event["EventName"], selection.session_type, session.event.get("Location")
+    )
+    return aligned.to_frame().rename(columns={"Driver": "Lap", "DeltaToFirst": "DeltaToNewest"})
+
+
+DATASETS = {
+    "Lap Times": lambda session, selection: get_driver_laps(
+        session.laps, selection.driver_codes
+    ).reset_index(drop=True),
+    "Sector Comparison": lambda session, selection: get_driver_laps(
+        session.laps, selection.driver_codes
+    ).reset_index(drop=True),
+    "Fastest Lap": lambda session, selection: get_aligned_laps(
+        session, tuple(selection.driver_codes)
+    ).to_frame(),
+    "Full Telemetry": lambda session, selection: get_aligned_laps(
+        session, tuple(selection.driver_codes)
+    ).to_frame(),
+    "Corner-Annotated Speed Trace": lambda session, selection: get_fastest_lap_telemetry(
+        session, selection.driver_for_map
+    ),
+    "Corner Comparison": lambda session, selection: get_corner_metrics(session),
+    "Cross-Year Comparison": _cross_year_frame,
+    "Gear Shifts On Track": lambda session, selection: get_fastest_lap_telemetry(
+        session, selection.driver_for_map
+    ),
+    "Speed Map": lambda session, selection: get_fastest_lap_telemetry(
+        session, selection.driver_for_map
+    ),
+    "Speed Heatmap": lambda session, selection: get_speed_heatmap(
+        session, tuple(selection.heatmap_drivers)
+    ).to_frame(),
+    "Season Overview": lambda session, selection: get_season_summaries(int(session.event.year)),
+    "Weather and Track Evolution": lambda session, selection: getattr(
+        session, "weather_data", pd.DataFrame()
+    ),
+    "Ideal Lap Leaderboard": lambda session, selection: get_ideal_laps(session).leaderboard,
+    "Qualifying Overview": lambda session, selection: get_qualifying_times(session),
+    "Lap Time Distribution": lambda session, selection: get_pace_laps(
+        session, selection.lap_filter
+    ),
+    "Overtakes and Battles": lambda session, selection: get_race_events(session).to_frame(),
+    "Pit Stop Analysis": lambda session, selection: get_pit_stop_analysis(session).stops,
+    "Position Changes": lambda session, selection: get_race_trace(session).to_frame(),
+    "Race Trace": lambda session, selection: get_race_trace(session).to_frame(),
+    "Stint Pace Model": lambda session, selection: get_stint_pace(
+        session,
+        selection.start_fuel_kg,
+        selection.fuel_seconds_per_kg,
+        selection.lap_filter,
+    ).stints,
+    "Team Pace Comparison": lambda session, selection: get_pace_laps(
+        session, selection.lap_filter
+    ).dropna(subset=["Team"]),
+    "Tyre Strategy": lambda session, selection: get_stint_table(session),
+}
+
+
+def prepare_dataset(session, selection) -> pd.DataFrame | None:
+    """The frame behind ``selection``'s plot, computed once per session and arguments.
+
+    Callers must treat the result as read-only; it is shared with the plot.
+    """
+    builder = DATASETS.get(selection.analysis_type)
+    if builder is None:
+        return None
+    return builder(session, selection)
+
+
+def dataframe_to_csv_bytes(df: pd.DataFrame) -> bytes:
+    export_df = df.copy()
+    for column in export_df.columns:
+        if pd.api.types.is_timedelta64_dtype(export_df[column]):
+            export_df[column] = export_df[column].astype(str)
+    return export_df.to_csv(index=False).encode("utf-8")
+
+
+def dataframe_to_parquet_bytes(df: pd.DataFrame) -> bytes | None:
+    try:
+        return df.to_parquet(index=False)
+    except ImportError:
+        return None
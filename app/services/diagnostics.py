@@ -0,0 +1,156 @@
+"""Memory and cache figures for the operator page."""
+from __future__ import annotations
+
+import os
+import sys
+import tracemalloc
+import weakref
+
+import pandas as pd
+
+from app.services.cache import get_session_caches
+from app.services.sessions import get_load_timings
+
+
+TRACE_FRAMES = 1
+TOP_ALLOCATIONS = 15
+OBJECT_SAMPLE = 200
+
+_footprints: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+_previous_snapshot: tracemalloc.Snapshot | None = None
+
+
+def _frame_bytes(frame) -> int:
+    """Approximate bytes of ``frame``; object columns are sized from a sample.
+
+    ``memory_usage(deep=True)`` visits every Python object and takes seconds
+    on a full session's car data.
+    """
+    if frame is None or not isinstance(frame, pd.DataFrame):
+        return 0
+    total = int(frame.index.nbytes)
+    for _, column in frame.items():
+        total += int(column.array.nbytes) if hasattr(column.array, "nbytes") else 0
+        if column.dtype == object and len(column):
+            sample = column.iloc[:: max(1, len(column) // OBJECT_SAMPLE)]
+            total += int(sum(map(sys.getsizeof, sample)) / len(sample) * len(column))
+    return total
+
+
+def session_footprint(session) -> dict[str, int]:
+    """Bytes held by a loaded session's main tables, measured once per session."""
+    footprint = _footprints.get(session)
+    if footprint is None:
+        footprint = _footprints[session] = _measure_session(session)
+    return footprint
+
+
+def _measure_session(session) -> dict[str, int]:
+    return {
+        "Laps": _frame_bytes(getattr(session, "_laps", None)),
+        "CarData": sum(
+            _frame_bytes(frame) for frame in (getattr(session, "_car_data", None) or {}).values()
+        ),
+        "PosData": sum(
+            _frame_bytes(frame) for frame in (getattr(session, "_pos_data", None) or {}).values()
+        ),
+        "Weather": _frame_bytes(getattr(session, "_weather_data", None)),
+    }
+
+
+def get_resident_sessions(store) -> pd.DataFrame:
+    rows = []
+    for key, entry in store.entries().items():
+        footprint = session_footprint(entry.session)
+        derived = sum(cache.entry_count(entry.session) for cache in get_session_caches().values())
+        rows.append(
+            {
+                "Year": key[0],
+                "Event": key[1],
+                "Session": key[2],
+                "Pinned": entry.pinned,
+                "Hits": entry.hits,
+                "LoadSeconds": round(entry.load_seconds, 1),
+                "ComponentSeconds": ", ".join(
+                    f"{name} {seconds:.1f}" for name, seconds in get_load_timings(entry.session).items()
+                ),
+                "LastUsed": pd.Timestamp(entry.last_used, unit="s").floor("s"),
+                **{f"{name}MB": size / 1e6 for name, size in footprint.items()},
+                "TotalMB": sum(footprint.values()) / 1e6,
+                "DerivedEntries": derived,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def get_cache_stats() -> pd.DataFrame:
+    rows = [
+        {
+            "Cache": name,
+            "Entries": cache.entry_count(),
+            "Hits": cache.hits,
+            "Misses": cache.misses,
+            "HitRate": cache.hit_rate,
+        }
+        for name, cache in sorted(get_session_caches().items())
+    ]
+    return pd.DataFrame(rows, columns=["Cache", "Entries", "Hits", "Misses", "HitRate"])
+
+
+def process_rss_bytes() -> int | None:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open(f"/proc/{os.getpid()}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def start_tracing(frames: int = TRACE_FRAMES):
+    """Start tracemalloc; one frame per allocation keeps the overhead small."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def stop_tracing():
+    global _previous_snapshot
+    _previous_snapshot = None
+    tracemalloc.stop()
+
+
+def get_top_allocations(limit: int = TOP_ALLOCATIONS) -> pd.DataFrame:
+    """Largest allocation sites now, and their growth since the previous call."""
+    global _previous_snapshot
+    if not tracemalloc.is_tracing():
+        return pd.DataFrame()
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+    )
+    if _previous_snapshot is None:
+        stats = snapshot.statistics("lineno")
+        rows = [
+            {"Site": str(stat.traceback), "MB": stat.size / 1e6, "Blocks": stat.count}
+            for stat in stats[:limit]
+        ]
+    else:
+        stats = snapshot.compare_to(_previous_snapshot, "lineno")
+        rows = [
+            {
+                "Site": str(stat.traceback),
+                "MB": stat.size / 1e6,
+                "ChangeMB": stat.size_diff / 1e6,
+                "Blocks": stat.count,
+            }
+            for stat in stats[:limit]
+        ]
+    _previous_snapshot = snapshot
+    return pd.DataFrame(rows)
+
+
+if os.getenv("F1_TRACEMALLOC"):
+    start_tracing()
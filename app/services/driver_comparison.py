@@ -0,0 +1,125 @@
+"""Batched lap selection and distance-aligned telemetry for any number of drivers."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.telemetry import CAR_CHANNELS, LAP_KEY_STRIDE, get_lap_telemetry
+
+
+ALIGN_STEP = 2.0
+DISCRETE_CHANNELS = {"nGear", "Brake", "DRS"}
+
+
+@dataclass(frozen=True)
+class AlignedLaps:
+    """One lap per driver resampled onto a shared distance grid.
+
+    Channel arrays are ``(driver, distance)``; ``elapsed`` is seconds since
+    the start of each driver's lap at every grid distance.
+    """
+
+    drivers: list[str]
+    lap_numbers: list[int]
+    distance: np.ndarray
+    elapsed: np.ndarray
+    channels: dict[str, np.ndarray]
+
+    def delta_to(self, reference: int = 0) -> np.ndarray:
+        return self.elapsed - self.elapsed[reference]
+
+    def to_frame(self) -> pd.DataFrame:
+        rows = len(self.distance)
+        frame = pd.DataFrame(
+            {
+                "Driver": np.repeat(np.asarray(self.drivers, dtype=object), rows),
+                "LapNumber": np.repeat(self.lap_numbers, rows),
+                "Distance": np.tile(self.distance, len(self.drivers)),
+                "Time": self.elapsed.ravel(),
+                "DeltaToFirst": self.delta_to().ravel(),
+            }
+        )
+        for channel, values in self.channels.items():
+            frame[channel] = values.ravel()
+        return frame
+
+
+def get_driver_laps(laps: pd.DataFrame, drivers) -> pd.DataFrame:
+    return laps[laps["Driver"].isin(list(drivers))]
+
+
+def pick_fastest_laps(laps: pd.DataFrame, drivers) -> pd.DataFrame:
+    """Each driver's fastest lap in one sort, preferring personal-best laps like
+    ``Laps.pick_fastest``; returned in the order of ``drivers``."""
+    timed = get_driver_laps(laps, drivers).dropna(subset=["LapTime"])
+    if "IsPersonalBest" in timed.columns:
+        personal_best = timed[timed["IsPersonalBest"].fillna(False).astype(bool)]
+        missing = timed[~timed["Driver"].isin(personal_best["Driver"])]
+        timed = pd.concat([personal_best, missing])
+
+    fastest = timed.sort_values("LapTime").drop_duplicates("Driver")
+    return fastest.set_index("Driver").reindex(list(drivers)).reset_index()
+
+
+def align_laps(
+    telemetry: pd.DataFrame, selected: pd.DataFrame, step: float = ALIGN_STEP
+) -> AlignedLaps:
+    selected = selected.dropna(subset=["LapNumber"])
+    lap_ids = (
+        telemetry.groupby("LapIndex", sort=True)
+        .agg(
+            Driver=("Driver", "first"),
+            LapNumber=("LapNumber", "first"),
+            LapDistance=("Distance", "max"),
+            LapStart=("SessionSeconds", "min"),
+        )
+        .reset_index()
+    )
+    wanted = pd.DataFrame(
+        {
+            "Driver": selected["Driver"].astype(str).to_numpy(),
+            "LapNumber": selected["LapNumber"].astype(int).to_numpy(),
+        }
+    )
+    lap_ids = wanted.merge(lap_ids, on=["Driver", "LapNumber"], how="inner")
+    if lap_ids.empty:
+        raise ValueError("No telemetry is available for the selected laps.")
+
+    # Stop the grid at the shortest lap so every driver has data everywhere
+    distance = np.arange(0.0, lap_ids["LapDistance"].min(), step)
+    keys = (
+        lap_ids["LapIndex"].to_numpy()[:, None] * LAP_KEY_STRIDE + distance[None, :]
+    ).ravel()
+    lap_key = telemetry["LapKey"].to_numpy()
+    shape = (len(lap_ids), len(distance))
+
+    elapsed = np.interp(keys, lap_key, telemetry["SessionSeconds"].to_numpy()).reshape(shape)
+    elapsed -= lap_ids["LapStart"].to_numpy()[:, None]
+    channels = {}
+    for channel in CAR_CHANNELS:
+        if channel not in telemetry.columns:
+            continue
+        values = np.interp(keys, lap_key, telemetry[channel].to_numpy(dtype=float))
+        if channel in DISCRETE_CHANNELS:
+            values = np.round(values)
+        channels[channel] = values.reshape(shape)
+    return AlignedLaps(
+        drivers=lap_ids["Driver"].tolist(),
+        lap_numbers=lap_ids["LapNumber"].tolist(),
+        distance=distance,
+        elapsed=elapsed,
+        channels=channels,
+    )
+
+
+@session_cache("aligned_laps")
+def get_aligned_laps(session, drivers: tuple[str, ...], lap_numbers=None) -> AlignedLaps:
+    """Fastest laps of ``drivers``, or the given lap number per driver."""
+    if lap_numbers is None:
+        selected = pick_fastest_laps(session.laps, drivers)
+    else:
+        selected = pd.DataFrame({"Driver": list(drivers), "LapNumber": list(lap_numbers)})
+    return align_laps(get_lap_telemetry(session), selected)
@@ -0,0 +1,312 @@
+"""Laps-only race and qualifying sessions for seasons before FastF1 timing, served from the history store."""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps
+
+from app.services.history import get_history_store
+
+
+# FastF1 has live-timing laps and telemetry from this season on
+FIRST_TIMING_YEAR = int(os.getenv("F1_FIRST_TIMING_YEAR", "2018"))
+
+HISTORICAL_SESSION_TYPES = ["Q", "R"]
+
+HISTORICAL_ANALYSES = {
+    "R": [
+        "Lap Times",
+        "Lap Time Distribution",
+        "Pit Stop Analysis",
+        "Position Changes",
+        "Race Trace",
+        "Tyre Strategy",
+    ],
+    "Q": ["Qualifying Overview"],
+}
+
+# Hidden for races before Ergast's pit-stop records
+PIT_STOP_ANALYSES = {"Pit Stop Analysis", "Tyre Strategy"}
+
+# Ergast records stops but not tyres
+UNKNOWN_COMPOUND = "UNKNOWN"
+COMPOUND_COLORS = {UNKNOWN_COMPOUND: "#888888"}
+
+TEAM_PALETTE = [
+    "#1f77b4", "#d62728", "#2ca02c", "#ff7f0e", "#9467bd", "#8c564b",
+    "#e377c2", "#17becf", "#bcbd22", "#7f7f7f", "#393b79", "#637939",
+    "#843c39", "#7b4173",
+]
+LINESTYLES = ["solid", "dashed", "dotted", "dashdot"]
+
+_EVENTS_QUERY = "SELECT name FROM races WHERE year = ? ORDER BY round"
+
+_RACE_QUERY = """
+SELECT r.race_id, r.year, r.round, r.name, r.date,
+       c.location, c.country
+FROM races r
+LEFT JOIN circuits c ON c.circuit_id = r.circuit_id
+WHERE r.year = ? AND r.name = ?
+"""
+
+_RESULTS_QUERY = """
+SELECT res.driver_id, res.number, d.code, d.forename, d.surname,
+       c.name AS team, res.grid, res.position, res.position_text,
+       res.points, res.laps, s.status
+FROM results res
+JOIN drivers d ON d.driver_id = res.driver_id
+JOIN constructors c ON c.constructor_id = res.constructor_id
+LEFT JOIN status s ON s.status_id = res.status_id
+WHERE res.race_id = ?
+ORDER BY res.position_order
+"""
+
+_QUALIFYING_QUERY = """
+SELECT q.driver_id, q.number, d.code, d.forename, d.surname,
+       c.name AS team, q.position, q.q1, q.q2, q.q3
+FROM qualifying q
+JOIN drivers d ON d.driver_id = q.driver_id
+JOIN constructors c ON c.constructor_id = q.constructor_id
+WHERE q.race_id = ?
+ORDER BY q.position
+"""
+
+# Both read a contiguous range of their (race_id, driver_id, ...) primary key
+_LAP_TIMES_QUERY = """
+SELECT driver_id, lap, position, milliseconds
+FROM lap_times
+WHERE race_id = ?
+ORDER BY driver_id, lap
+"""
+
+_PIT_STOPS_QUERY = """
+SELECT driver_id, lap, milliseconds
+FROM pit_stops
+WHERE race_id = ?
+"""
+
+
+def is_historical(year: int, session_type: str | None = None) -> bool:
+    """Whether a session is served from the history store instead of FastF1."""
+    if year >= FIRST_TIMING_YEAR or get_history_store() is None:
+        return False
+    return session_type is None or session_type in HISTORICAL_SESSION_TYPES
+
+
+def get_historical_events(year: int) -> list[str]:
+    return get_history_store().query(_EVENTS_QUERY, (year,))["name"].tolist()
+
+
+class HistoricalSession:
+    """The parts of a FastF1 ``Session`` the laps-only analyses read.
+
+    Tables are kept in ``_laps``, ``_results`` and ``_weather_data`` like
+    FastF1 does, so the operator page measures them the same way.
+    """
+
+    f1_api_support = False
+    api_path = None
+    track_status = None
+
+    def __init__(self, event: pd.Series, name: str, results: pd.DataFrame, laps: pd.DataFrame):
+        self.event = event
+        self.name = name
+        self._results = results
+        self._laps = Laps(laps, session=self)
+        self._weather_data = pd.DataFrame()
+        self.driver_styles = _driver_styles(results)
+
+    @property
+    def results(self) -> pd.DataFrame:
+        return self._results
+
+    @property
+    def laps(self) -> Laps:
+        return self._laps
+
+    @property
+    def weather_data(self) -> pd.DataFrame:
+        return self._weather_data
+
+    @property
+    def drivers(self) -> list[str]:
+        return self._results["DriverNumber"].tolist()
+
+    @property
+    def has_stints(self) -> bool:
+        return bool(self._laps["Stint"].notna().any())
+
+    def get_driver(self, identifier) -> pd.Series:
+        identifier = str(identifier)
+        match = self._results[
+            (self._results["DriverNumber"] == identifier)
+            | (self._results["Abbreviation"] == identifier)
+        ]
+        if match.empty:
+            raise ValueError(f"Invalid driver identifier '{identifier}'")
+        return match.iloc[0]
+
+    def analysis_options(self) -> list[str]:
+        options = HISTORICAL_ANALYSES.get(self.name, [])
+        if not self.has_stints:
+            options = [option for option in options if option not in PIT_STOP_ANALYSES]
+        return options
+
+
+def _driver_styles(results: pd.DataFrame) -> dict[str, dict]:
+    """Team colours with one linestyle per team mate, like FastF1's driver styles."""
+    team_index = {team: index for index, team in enumerate(results["TeamName"].unique())}
+    teammate = results.groupby("TeamName", sort=False).cumcount()
+    return {
+        driver: {
+            "color": TEAM_PALETTE[team_index[team] % len(TEAM_PALETTE)],
+            "linestyle": LINESTYLES[mate % len(LINESTYLES)],
+        }
+        for driver, team, mate in zip(results["Abbreviation"], results["TeamName"], teammate)
+    }
+
+
+def _abbreviations(drivers: pd.DataFrame) -> pd.Series:
+    # Ergast codes start in the late 2000s; older drivers get FastF1's style of code
+    fallback = drivers["surname"].str.replace(r"[^A-Za-z]", "", regex=True).str[:3].str.upper()
+    return drivers["code"].where(drivers["code"].notna(), fallback)
+
+
+def _driver_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "DriverNumber": frame["number"].astype("Int64").astype(str),
+            "Abbreviation": _abbreviations(frame),
+            "FirstName": frame["forename"],
+            "LastName": frame["surname"],
+            "FullName": frame["forename"] + " " + frame["surname"],
+            "TeamName": frame["team"],
+        }
+    )
+
+
+def _qualifying_time(values: pd.Series) -> pd.Series:
+    # Ergast writes "1:26.454"; pandas wants hours too
+    return pd.to_timedelta("0:" + values.fillna("").astype(str), errors="coerce")
+
+
+def _race_results(frame: pd.DataFrame) -> pd.DataFrame:
+    results = _driver_columns(frame)
+    results["Position"] = pd.to_numeric(frame["position"], errors="coerce")
+    results["ClassifiedPosition"] = frame["position_text"]
+    results["GridPosition"] = pd.to_numeric(frame["grid"], errors="coerce")
+    results["Status"] = frame["status"]
+    results["Points"] = frame["points"]
+    results["Laps"] = frame["laps"]
+    return results.reset_index(drop=True)
+
+
+def _qualifying_results(frame: pd.DataFrame) -> pd.DataFrame:
+    results = _driver_columns(frame)
+    results["Position"] = pd.to_numeric(frame["position"], errors="coerce")
+    for part in ("q1", "q2", "q3"):
+        results[part.upper()] = _qualifying_time(frame[part])
+    return results.reset_index(drop=True)
+
+
+def build_laps(
+    lap_times: pd.DataFrame, pit_stops: pd.DataFrame, drivers: pd.DataFrame
+) -> pd.DataFrame:
+    """Ergast lap times in FastF1's laps layout, one vectorized pass per column.
+
+    Session times are each driver's cumulative lap times, so they share the
+    race start as their origin. A stop's pit-lane time separates the in-lap's
+    ``PitInTime`` from the out-lap's ``PitOutTime``. Stints split after every
+    pit-stop lap and stay NaN when the race has no pit-stop records.
+    """
+    laps = lap_times.astype(
+        {"driver_id": int, "lap": int, "position": float, "milliseconds": float}
+    ).sort_values(["driver_id", "lap"], ignore_index=True)
+    pit_stops = pit_stops.astype({"driver_id": int, "lap": int, "milliseconds": float})
+    lap_time = pd.to_timedelta(laps["milliseconds"], unit="ms")
+    session_time = lap_time.groupby(laps["driver_id"]).cumsum()
+    lap_start = session_time - lap_time
+
+    # Pit-lane milliseconds per in-lap, read back on the following out-lap
+    pit_lane = pit_stops.groupby(["driver_id", "lap"])["milliseconds"].sum(min_count=1)
+    lap_keys = pd.MultiIndex.from_frame(laps[["driver_id", "lap"]])
+    previous_keys = pd.MultiIndex.from_arrays([laps["driver_id"], laps["lap"] - 1])
+    pit_in = lap_keys.isin(pit_lane.index)
+    pit_out = previous_keys.isin(pit_lane.index)
+    pit_lane_time = pd.to_timedelta(
+        pit_lane.reindex(previous_keys).fillna(0).to_numpy(), unit="ms"
+    )
+
+    if pit_stops.empty:
+        stint = pd.Series(np.nan, index=laps.index)
+        compound = pd.Series(None, index=laps.index, dtype=object)
+        tyre_life = pd.Series(np.nan, index=laps.index)
+    else:
+        stint = pd.Series(pit_out, index=laps.index).groupby(laps["driver_id"]).cumsum() + 1.0
+        compound = pd.Series(UNKNOWN_COMPOUND, index=laps.index)
+        tyre_life = laps.groupby([laps["driver_id"], stint]).cumcount() + 1.0
+
+    personal_best = laps["milliseconds"] == laps.groupby("driver_id")["milliseconds"].cummin()
+    driver_info = drivers.set_index("driver_id")
+    return pd.DataFrame(
+        {
+            "Time": session_time,
+            "Driver": laps["driver_id"].map(driver_info["Abbreviation"]),
+            "DriverNumber": laps["driver_id"].map(driver_info["DriverNumber"]),
+            "LapTime": lap_time,
+            "LapNumber": laps["lap"].astype(float),
+            "Stint": stint,
+            "PitOutTime": (lap_start + pit_lane_time).where(pit_out),
+            "PitInTime": session_time.where(pit_in),
+            "LapStartTime": lap_start,
+            "Compound": compound,
+            "TyreLife": tyre_life,
+            "Team": laps["driver_id"].map(driver_info["TeamName"]),
+            "Position": laps["position"].astype(float),
+            "TrackStatus": "",
+            "IsPersonalBest": personal_best,
+            "Deleted": False,
+        }
+    )
+
+
+def load_historical_session(year: int, event_name: str, session_type: str):
+    """Build a :class:`HistoricalSession`, or ``None`` if the store lacks the race."""
+    store = get_history_store()
+    race = store.query(_RACE_QUERY, (year, event_name))
+    if race.empty:
+        return None
+    race = race.iloc[0]
+    race_id = int(race["race_id"])
+
+    event = pd.Series(
+        {
+            "year": int(race["year"]),
+            "RoundNumber": int(race["round"]),
+            "EventName": race["name"],
+            "Location": race["location"],
+            "Country": race["country"],
+            "EventDate": pd.Timestamp(race["date"]),
+        }
+    )
+
+    if session_type == "Q":
+        entries = store.query(_QUALIFYING_QUERY, (race_id,))
+        if entries.empty:
+            return None
+        results = _qualifying_results(entries)
+        lap_times = pd.DataFrame(columns=["driver_id", "lap", "position", "milliseconds"])
+        pit_stops = pd.DataFrame(columns=["driver_id", "lap", "milliseconds"])
+    else:
+        entries = store.query(_RESULTS_QUERY, (race_id,))
+        if entries.empty:
+            return None
+        results = _race_results(entries)
+        lap_times = store.query(_LAP_TIMES_QUERY, (race_id,))
+        pit_stops = store.query(_PIT_STOPS_QUERY, (race_id,))
+
+    drivers = results.assign(driver_id=entries["driver_id"].to_numpy())
+    laps = build_laps(lap_times, pit_stops, drivers)
+    return HistoricalSession(event, session_type, results, laps)
@@ -0,0 +1,442 @@
+"""Embedded Ergast history store and its read-only query service."""
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+
+HISTORY_DB_PATH = Path(os.getenv("F1_HISTORY_DB", "data/history.sqlite"))
+ERGAST_CSV_DIR = Path(os.getenv("F1_ERGAST_DIR", "data"))
+
+HISTORY_TABLES = [
+    "circuits",
+    "constructors",
+    "drivers",
+    "status",
+    "races",
+    "results",
+    "qualifying",
+    "driver_standings",
+    "constructor_standings",
+    "lap_times",
+    "pit_stops",
+]
+
+_SCHEMA = """
+CREATE TABLE circuits (
+    circuit_id INTEGER PRIMARY KEY,
+    circuit_ref TEXT NOT NULL,
+    name TEXT NOT NULL,
+    location TEXT,
+    country TEXT,
+    lat REAL,
+    lng REAL,
+    alt INTEGER,
+    url TEXT
+);
+CREATE TABLE constructors (
+    constructor_id INTEGER PRIMARY KEY,
+    constructor_ref TEXT NOT NULL,
+    name TEXT NOT NULL,
+    nationality TEXT,
+    url TEXT
+);
+CREATE TABLE drivers (
+    driver_id INTEGER PRIMARY KEY,
+    driver_ref TEXT NOT NULL,
+    number INTEGER,
+    code TEXT,
+    forename TEXT NOT NULL,
+    surname TEXT NOT NULL,
+    dob TEXT,
+    nationality TEXT,
+    url TEXT
+);
+CREATE TABLE status (
+    status_id INTEGER PRIMARY KEY,
+    status TEXT NOT NULL
+);
+CREATE TABLE races (
+    race_id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    circuit_id INTEGER,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT,
+    url TEXT
+);
+CREATE TABLE results (
+    result_id INTEGER PRIMARY KEY,
+    race_id INTEGER NOT NULL,
+    driver_id INTEGER NOT NULL,
+    constructor_id INTEGER NOT NULL,
+    number INTEGER,
+    grid INTEGER,
+    position INTEGER,
+    position_text TEXT,
+    position_order INTEGER,
+    points REAL,
+    laps INTEGER,
+    time TEXT,
+    milliseconds INTEGER,
+    fastest_lap INTEGER,
+    rank INTEGER,
+    fastest_lap_time TEXT,
+    fastest_lap_speed TEXT,
+    status_id INTEGER
+);
+CREATE TABLE qualifying (
+    qualify_id INTEGER PRIMARY KEY,
+    race_id INTEGER NOT NULL,
+    driver_id INTEGER NOT NULL,
+    constructor_id INTEGER NOT NULL,
+    number INTEGER,
+    position INTEGER,
+    q1 TEXT,
+    q2 TEXT,
+    q3 TEXT
+);
+CREATE TABLE driver_standings (
+    driver_standings_id INTEGER PRIMARY KEY,
+    race_id INTEGER NOT NULL,
+    driver_id INTEGER NOT NULL,
+    points REAL,
+    position INTEGER,
+    position_text TEXT,
+    wins INTEGER
+);
+CREATE TABLE constructor_standings (
+    constructor_standings_id INTEGER PRIMARY KEY,
+    race_id INTEGER NOT NULL,
+    constructor_id INTEGER NOT NULL,
+    points REAL,
+    position INTEGER,
+    position_text TEXT,
+    wins INTEGER
+);
+CREATE TABLE lap_times (
+    race_id INTEGER NOT NULL,
+    driver_id INTEGER NOT NULL,
+    lap INTEGER NOT NULL,
+    position INTEGER,
+    time TEXT,
+    milliseconds INTEGER,
+    PRIMARY KEY (race_id, driver_id, lap)
+) WITHOUT ROWID;
+CREATE TABLE pit_stops (
+    race_id INTEGER NOT NULL,
+    driver_id INTEGER NOT NULL,
+    stop INTEGER NOT NULL,
+    lap INTEGER NOT NULL,
+    time TEXT,
+    duration TEXT,
+    milliseconds INTEGER,
+    PRIMARY KEY (race_id, driver_id, stop)
+) WITHOUT ROWID;
+"""
+
+# Built after the bulk insert; each one backs a query below.
+_INDEXES = [
+    "CREATE UNIQUE INDEX idx_races_year_round ON races (year, round)",
+    "CREATE INDEX idx_races_circuit_year ON races (circuit_id, year)",
+    "CREATE INDEX idx_results_race ON results (race_id, position_order)",
+    "CREATE INDEX idx_qualifying_race ON qualifying (race_id, position)",
+    "CREATE INDEX idx_driver_standings_race ON driver_standings (race_id, position)",
+    "CREATE INDEX idx_constructor_standings_race ON constructor_standings (race_id, position)",
+]
+
+_RACE_QUERY = """
+SELECT r.race_id, r.year, r.round, r.name, r.date, r.circuit_id,
+       c.name AS circuit_name, c.location, c.country
+FROM races r
+LEFT JOIN circuits c ON c.circuit_id = r.circuit_id
+WHERE r.year = ? AND r.round = ?
+"""
+
+_DRIVER_STANDINGS_QUERY = """
+SELECT ds.position AS Position, d.code AS Code,
+       d.forename || ' ' || d.surname AS Driver,
+       ds.points AS Points, ds.wins AS Wins
+FROM driver_standings ds
+JOIN drivers d ON d.driver_id = ds.driver_id
+WHERE ds.race_id = (
+    SELECT race_id FROM races
+    WHERE year = ? AND round <= ? AND race_id IN (SELECT race_id FROM driver_standings)
+    ORDER BY round DESC LIMIT 1
+)
+ORDER BY ds.position
+"""
+
+_CONSTRUCTOR_STANDINGS_QUERY = """
+SELECT cs.position AS Position, c.name AS Constructor,
+       cs.points AS Points, cs.wins AS Wins
+FROM constructor_standings cs
+JOIN constructors c ON c.constructor_id = cs.constructor_id
+WHERE cs.race_id = (
+    SELECT race_id FROM races
+    WHERE year = ? AND round <= ? AND race_id IN (SELECT race_id FROM constructor_standings)
+    ORDER BY round DESC LIMIT 1
+)
+ORDER BY cs.position
+"""
+
+_CIRCUIT_RESULTS_QUERY = """
+SELECT r.year AS Year, res.position_order AS Position,
+       d.forename || ' ' || d.surname AS Driver, c.name AS Constructor,
+       res.grid AS Grid, res.time AS Time, s.status AS Status
+FROM races r
+JOIN results res ON res.race_id = r.race_id
+JOIN drivers d ON d.driver_id = res.driver_id
+JOIN constructors c ON c.constructor_id = res.constructor_id
+LEFT JOIN status s ON s.status_id = res.status_id
+WHERE r.circuit_id = ? AND r.year < ? AND res.position_order <= ?
+ORDER BY r.year DESC, res.position_order
+LIMIT ?
+"""
+
+_PIT_STOP_HISTORY_QUERY = """
+SELECT r.year AS Year,
+       COUNT(*) AS Stops,
+       COUNT(DISTINCT ps.driver_id) AS Drivers,
+       ROUND(CAST(COUNT(*) AS REAL) / COUNT(DISTINCT ps.driver_id), 2) AS StopsPerDriver,
+       ROUND(AVG(ps.milliseconds) / 1000.0, 3) AS MeanPitLaneTime,
+       ROUND(MIN(ps.milliseconds) / 1000.0, 3) AS FastestPitLaneTime
+FROM races r
+JOIN pit_stops ps ON ps.race_id = r.race_id
+WHERE r.circuit_id = ? AND r.year < ?
+GROUP BY r.year
+ORDER BY r.year DESC
+LIMIT ?
+"""
+
+
+def _to_column_name(csv_column: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", csv_column).lower()
+
+
+def build_history_store(
+    csv_dir: Path = ERGAST_CSV_DIR,
+    db_path: Path = HISTORY_DB_PATH,
+    chunksize: int = 200_000,
+) -> Path:
+    """Build the SQLite store from the Ergast CSVs and swap it in atomically."""
+    csv_dir = Path(csv_dir)
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    build_path = db_path.with_suffix(".building")
+    build_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(build_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(_SCHEMA)
+
+        for table in HISTORY_TABLES:
+            file = csv_dir / f"{table}.csv"
+            if not file.exists():
+                continue
+
+            columns = [
+                row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+            ]
+            for chunk in pd.read_csv(
+                file, na_values=["\\N"], keep_default_na=False, chunksize=chunksize
+            ):
+                chunk.columns = [_to_column_name(column) for column in chunk.columns]
+                chunk = chunk[[column for column in columns if column in chunk.columns]]
+                chunk.to_sql(table, conn, if_exists="append", index=False)
+
+        for statement in _INDEXES:
+            conn.execute(statement)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(build_path, db_path)
+    return db_path
+
+
+class HistoryStore:
+    """Fixed-size pool of read-only SQLite connections.
+
+    Each connection keeps its own prepared-statement cache, and every query
+    below is a module-level constant, so repeated calls reuse the compiled
+    statement instead of re-parsing SQL.
+    """
+
+    def __init__(self, db_path: Path, pool_size: int = 4, version: int | None = None):
+        self.db_path = Path(db_path)
+        self.version = version
+        self._idle = [self._connect() for _ in range(pool_size)]
+        self._closed = False
+        self._available = threading.Condition()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self.db_path.resolve()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=64,
+        )
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        with self._available:
+            while not self._idle and not self._closed:
+                self._available.wait()
+            conn = None if self._closed else self._idle.pop()
+        if conn is None:
+            # A caller still holding a closed store gets a one-off connection
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            with self._available:
+                if self._closed:
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+                    self._available.notify()
+
+    def close(self):
+        """Close idle connections now and busy ones when they are returned."""
+        with self._available:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            self._available.notify_all()
+
+    def query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        with self.connection() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+
+_STORES: dict[Path, HistoryStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _store_version() -> int | None:
+    """The store file's modification time, or ``None`` while it is missing.
+
+    Cached queries take it as an argument, so results are never cached for a
+    missing store and a rebuilt store is queried afresh.
+    """
+    try:
+        return HISTORY_DB_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _open_history_store(db_path: Path, version: int) -> HistoryStore:
+    """One pool per store path, replaced and closed when the file is rebuilt."""
+    with _STORES_LOCK:
+        previous = _STORES.get(db_path)
+        # Queries cached under an older version keep using the current pool
+        if previous is not None and previous.version >= version:
+            return previous
+        store = _STORES[db_path] = HistoryStore(db_path, version=version)
+    if previous is not None:
+        previous.close()
+    return store
+
+
+def get_history_store() -> HistoryStore | None:
+    version = _store_version()
+    if version is None:
+        return None
+    return _open_history_store(HISTORY_DB_PATH, version)
+
+
+def get_race_context(year: int, round_number: int) -> dict | None:
+    version = _store_version()
+    if version is None:
+        return None
+    return _race_context(year, round_number, version)
+
+
+@st.cache_data(show_spinner=False)
+def _race_context(year: int, round_number: int, version: int) -> dict | None:
+    race = _open_history_store(HISTORY_DB_PATH, version).query(
+        _RACE_QUERY, (year, round_number)
+    )
+    if race.empty:
+        return None
+    return race.iloc[0].to_dict()
+
+
+def get_championship_standings(
+    year: int, round_number: int
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    version = _store_version()
+    if version is None:
+        return pd.DataFrame(), pd.DataFrame()
+    return _championship_standings(year, round_number, version)
+
+
+@st.cache_data(show_spinner=False)
+def _championship_standings(
+    year: int, round_number: int, version: int
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    store = _open_history_store(HISTORY_DB_PATH, version)
+    params = (year, round_number)
+    return (
+        store.query(_DRIVER_STANDINGS_QUERY, params),
+        store.query(_CONSTRUCTOR_STANDINGS_QUERY, params),
+    )
+
+
+def get_circuit_results(
+    circuit_id: int, before_year: int, top_n: int = 3, seasons: int = 10
+) -> pd.DataFrame:
+    version = _store_version()
+    if version is None:
+        return pd.DataFrame()
+    return _circuit_results(circuit_id, before_year, top_n, seasons, version)
+
+
+@st.cache_data(show_spinner=False)
+def _circuit_results(
+    circuit_id: int, before_year: int, top_n: int, seasons: int, version: int
+) -> pd.DataFrame:
+    return _open_history_store(HISTORY_DB_PATH, version).query(
+        _CIRCUIT_RESULTS_QUERY, (circuit_id, before_year, top_n, top_n * seasons)
+    )
+
+
+def get_pit_stop_history(
+    circuit_id: int, before_year: int, seasons: int = 10
+) -> pd.DataFrame:
+    version = _store_version()
+    if version is None:
+        return pd.DataFrame()
+    return _pit_stop_history(circuit_id, before_year, seasons, version)
+
+
+@st.cache_data(show_spinner=False)
+def _pit_stop_history(
+    circuit_id: int, before_year: int, seasons: int, version: int
+) -> pd.DataFrame:
+    return _open_history_store(HISTORY_DB_PATH, version).query(
+        _PIT_STOP_HISTORY_QUERY, (circuit_id, before_year, seasons)
+    )
+
+
+if __name__ == "__main__":
+    print(f"Building {HISTORY_DB_PATH} from {ERGAST_CSV_DIR}...")
+    print(f"Done: {build_history_store()}")
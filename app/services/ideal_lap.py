@@ -0,0 +1,123 @@
+"""Theoretical-best laps from best sectors and telemetry minisectors."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.telemetry import LAP_KEY_STRIDE, get_lap_telemetry
+
+
+MINISECTOR_COUNT = 25
+SECTOR_COLUMNS = ["Sector1Time", "Sector2Time", "Sector3Time"]
+
+
+@dataclass(frozen=True)
+class IdealLaps:
+    leaderboard: pd.DataFrame
+    minisectors: pd.DataFrame
+
+
+def get_valid_timed_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    laps = laps.dropna(subset=["Driver", "LapNumber", "LapTime"])
+    if "Deleted" in laps.columns:
+        laps = laps[~laps["Deleted"].fillna(False).astype(bool)]
+    return laps
+
+
+def build_minisector_times(
+    telemetry: pd.DataFrame, laps: pd.DataFrame, count: int = MINISECTOR_COUNT
+) -> pd.DataFrame:
+    lap_ids = (
+        telemetry.groupby("LapIndex", sort=True)
+        .agg(
+            Driver=("Driver", "first"),
+            LapNumber=("LapNumber", "first"),
+            LapDistance=("Distance", "max"),
+        )
+        .reset_index()
+    )
+    valid = laps[["Driver", "LapNumber", "LapStartTime", "LapTime"]].dropna().copy()
+    valid["LapNumber"] = valid["LapNumber"].astype(int)
+    lap_ids = lap_ids.merge(valid, on=["Driver", "LapNumber"], how="inner")
+    if lap_ids.empty:
+        raise ValueError("No timed laps with telemetry are available.")
+
+    # Boundaries sit at fixed fractions of each lap's own integrated distance,
+    # which absorbs small per-lap differences in the distance channel.
+    fractions = np.linspace(0.0, 1.0, count + 1)
+    boundary_keys = (
+        lap_ids["LapIndex"].to_numpy()[:, None] * LAP_KEY_STRIDE
+        + lap_ids["LapDistance"].to_numpy()[:, None] * fractions[None, :]
+    )
+    boundary_seconds = np.interp(
+        boundary_keys.ravel(),
+        telemetry["LapKey"].to_numpy(),
+        telemetry["SessionSeconds"].to_numpy(),
+    ).reshape(boundary_keys.shape)
+
+    # Car data starts and ends between samples, so the outer boundaries are
+    # pinned to the timed lap and the minisectors add up to its LapTime.
+    lap_start = lap_ids["LapStartTime"].dt.total_seconds().to_numpy()
+    lap_end = lap_start + lap_ids["LapTime"].dt.total_seconds().to_numpy()
+    boundary_seconds[:, 0] = lap_start
+    boundary_seconds[:, -1] = lap_end
+    boundary_seconds = np.maximum.accumulate(
+        np.clip(boundary_seconds, lap_start[:, None], lap_end[:, None]), axis=1
+    )
+
+    times = pd.DataFrame(
+        np.diff(boundary_seconds, axis=1),
+        columns=pd.RangeIndex(1, count + 1, name="Minisector"),
+    )
+    times.insert(0, "LapNumber", lap_ids["LapNumber"].to_numpy())
+    times.insert(0, "Driver", lap_ids["Driver"].to_numpy())
+    return times
+
+
+def build_ideal_laps(laps: pd.DataFrame, minisector_times: pd.DataFrame) -> IdealLaps:
+    laps = laps.copy()
+    for column in ["LapTime", *SECTOR_COLUMNS]:
+        laps[column] = laps[column].dt.total_seconds()
+
+    by_driver = laps.groupby("Driver")
+    leaderboard = pd.DataFrame(
+        {
+            "FastestLap": by_driver["LapTime"].min(),
+            # min_count keeps drivers without all three sectors as NaN
+            "IdealSectorLap": by_driver[SECTOR_COLUMNS].min().sum(axis=1, min_count=3),
+        }
+    )
+
+    best_minisectors = minisector_times.drop(columns="LapNumber").groupby("Driver").min()
+    leaderboard["IdealMinisectorLap"] = best_minisectors.sum(axis=1, min_count=1)
+    leaderboard["SectorGain"] = leaderboard["FastestLap"] - leaderboard["IdealSectorLap"]
+    leaderboard["MinisectorGain"] = (
+        leaderboard["FastestLap"] - leaderboard["IdealMinisectorLap"]
+    )
+    leaderboard = (
+        leaderboard.sort_values(["IdealMinisectorLap", "FastestLap"])
+        .rename_axis("Driver")
+        .reset_index()
+    )
+    leaderboard.insert(0, "IdealPosition", np.arange(1, len(leaderboard) + 1))
+    leaderboard["FastestLapPosition"] = (
+        leaderboard["FastestLap"].rank(method="min").astype("Int64")
+    )
+
+    minisectors = best_minisectors.stack().rename("BestTime").reset_index()
+    minisectors["DeltaToBest"] = minisectors["BestTime"] - minisectors.groupby(
+        "Minisector"
+    )["BestTime"].transform("min")
+    minisectors["IsOverallBest"] = minisectors["DeltaToBest"] == 0
+
+    return IdealLaps(leaderboard=leaderboard, minisectors=minisectors)
+
+
+@session_cache("ideal_laps")
+def get_ideal_laps(session) -> IdealLaps:
+    laps = get_valid_timed_laps(session.laps)
+    minisector_times = build_minisector_times(get_lap_telemetry(session), laps)
+    return build_ideal_laps(laps, minisector_times)
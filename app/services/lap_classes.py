@@ -0,0 +1,152 @@
+"""Per-lap running conditions: clean air, traffic, neutralisations and pit laps."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+
+
+TRAFFIC_GAP_SECONDS = 2.0
+TIMING_POINTS = ["Sector1SessionTime", "Sector2SessionTime"]
+
+# FastF1 track status codes grouped into the conditions we care about
+NEUTRALISED_STATUSES = {"4", "6", "7"}
+YELLOW_STATUSES = {"2"}
+RED_STATUSES = {"5"}
+
+LAP_CLASSES = [
+    "Clean Air",
+    "Traffic",
+    "Opening Lap",
+    "Pit In",
+    "Pit Out",
+    "SC/VSC",
+    "Yellow Flag",
+    "Red Flag",
+]
+
+# None keeps each analysis' own default lap selection
+LAP_FILTERS = {
+    "All Pace Laps": None,
+    "Clean Air Only": ("Clean Air",),
+    "Traffic Only": ("Traffic",),
+}
+
+
+def _seconds(values: pd.Series) -> np.ndarray:
+    return pd.to_timedelta(values).dt.total_seconds().to_numpy(dtype=float)
+
+
+def _gap_to_previous_crossing(query: np.ndarray, crossings: np.ndarray) -> np.ndarray:
+    """Time since the last other car crossed the same timing line."""
+    crossings = np.sort(crossings[~np.isnan(crossings)])
+    gap = np.full(len(query), np.nan)
+    if len(crossings) == 0:
+        return gap
+
+    previous = np.searchsorted(crossings, query, side="left") - 1
+    valid = (previous >= 0) & ~np.isnan(query)
+    gap[valid] = query[valid] - crossings[previous[valid]]
+    return gap
+
+
+def get_gap_ahead(laps: pd.DataFrame) -> np.ndarray:
+    """Smallest gap to the car ahead at any timing line during each lap.
+
+    Lapped cars count as traffic too, which the classification order does not.
+    """
+    lap_end = _seconds(laps["Time"])
+    pit_in = laps["PitInTime"].notna().to_numpy()
+    line_crossings = np.where(pit_in, np.nan, lap_end)
+
+    gaps = [
+        _gap_to_previous_crossing(lap_end, line_crossings),
+        _gap_to_previous_crossing(_seconds(laps["LapStartTime"]), line_crossings),
+    ]
+    for column in TIMING_POINTS:
+        if column in laps.columns:
+            crossings = _seconds(laps[column])
+            gaps.append(_gap_to_previous_crossing(crossings, crossings))
+
+    gaps = np.vstack(gaps)
+    all_missing = np.isnan(gaps).all(axis=0)
+    gaps[:, all_missing] = np.inf
+    gap_ahead = np.nanmin(gaps, axis=0)
+    gap_ahead[all_missing] = np.nan
+    return gap_ahead
+
+
+def _status_overlap(track_status: pd.DataFrame, statuses: set[str], lap_start, lap_end):
+    """Whether each lap overlaps any track status interval in ``statuses``."""
+    times = _seconds(track_status["Time"])
+    codes = track_status["Status"].astype(str).to_numpy()
+    interval_ends = np.r_[times[1:], np.inf]
+
+    selected = np.isin(codes, list(statuses))
+    starts = times[selected]
+    ends = interval_ends[selected]
+
+    # Intervals are disjoint and sorted: those starting before the lap ends,
+    # minus those already over when it starts, overlap the lap.
+    started = np.searchsorted(starts, lap_end, side="left")
+    finished = np.searchsorted(ends, lap_start, side="right")
+    return started - finished > 0
+
+
+def _lap_status_flags(laps: pd.DataFrame, statuses: set[str]) -> np.ndarray:
+    lap_status = laps["TrackStatus"].fillna("").astype(str)
+    pattern = "[" + "".join(sorted(statuses)) + "]"
+    return lap_status.str.contains(pattern).to_numpy()
+
+
+def classify_laps(laps: pd.DataFrame, track_status: pd.DataFrame | None) -> pd.DataFrame:
+    lap_start = _seconds(laps["LapStartTime"])
+    lap_end = _seconds(laps["Time"])
+    if track_status is not None and not track_status.empty:
+        track_status = track_status.sort_values("Time")
+        neutralised, yellow, red = (
+            _status_overlap(track_status, statuses, lap_start, lap_end)
+            for statuses in (NEUTRALISED_STATUSES, YELLOW_STATUSES, RED_STATUSES)
+        )
+    else:
+        neutralised, yellow, red = (
+            _lap_status_flags(laps, statuses)
+            for statuses in (NEUTRALISED_STATUSES, YELLOW_STATUSES, RED_STATUSES)
+        )
+
+    gap_ahead = get_gap_ahead(laps)
+    lap_class = np.select(
+        [
+            laps["PitInTime"].notna().to_numpy(),
+            laps["PitOutTime"].notna().to_numpy(),
+            red,
+            neutralised,
+            yellow,
+            (laps["LapNumber"] == 1).to_numpy(),
+            gap_ahead < TRAFFIC_GAP_SECONDS,
+        ],
+        ["Pit In", "Pit Out", "Red Flag", "SC/VSC", "Yellow Flag", "Opening Lap", "Traffic"],
+        default="Clean Air",
+    )
+    return pd.DataFrame({"GapAhead": gap_ahead, "LapClass": lap_class}, index=laps.index)
+
+
+@session_cache("classified_laps")
+def get_classified_laps(session):
+    """Session laps with ``GapAhead`` and ``LapClass`` columns added."""
+    laps = session.laps.copy()
+    classes = classify_laps(laps, getattr(session, "track_status", None))
+    laps["GapAhead"] = classes["GapAhead"]
+    laps["LapClass"] = classes["LapClass"]
+    return laps
+
+
+def filter_pace_laps(session, laps, lap_filter: str | None):
+    """Apply a ``LAP_FILTERS`` choice; the default keeps ``pick_quicklaps``."""
+    classes = LAP_FILTERS.get(lap_filter)
+    if classes is None:
+        return laps.pick_quicklaps()
+
+    lap_class = get_classified_laps(session)["LapClass"].reindex(laps.index)
+    return laps[lap_class.isin(classes)]
@@ -0,0 +1,317 @@
+"""Incremental state for replaying a recorded FastF1 live-timing file."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastf1.utils import to_datetime, to_timedelta
+
+
+LIVE_CATEGORIES = {"DriverList", "LapCount", "TimingAppData", "TimingData", "TrackStatus"}
+UPDATE_BUDGET_SECONDS = 0.05
+INITIAL_LAP_CAPACITY = 80
+
+LAP_COLUMNS = [
+    "Driver",
+    "DriverNumber",
+    "LapNumber",
+    "LapTime",
+    "Position",
+    "GapToLeader",
+    "Interval",
+    "Compound",
+    "Stint",
+    "TyreLife",
+    "PitIn",
+    "PitOut",
+    "TrackStatus",
+    "SessionSeconds",
+]
+
+
+def parse_line(line: str):
+    """``(category, message, timestamp)`` of one recorded line, or None.
+
+    Recordings hold Python reprs rather than JSON; this is the same repair
+    ``fastf1.livetiming.data.LiveTimingData`` applies before decoding.
+    """
+    line = line.strip().replace("'", '"').replace("True", "true").replace("False", "false")
+    if not line:
+        return None
+    try:
+        category, message, timestamp = json.loads(line)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    timestamp = to_datetime(timestamp)
+    if timestamp is None:
+        return None
+    return category, message, timestamp
+
+
+def merge_update(target: dict, update) -> dict:
+    """Apply one of F1's partial updates onto the accumulated state in place."""
+    if isinstance(update, list):
+        update = {str(index): value for index, value in enumerate(update)}
+    for key, value in update.items():
+        if isinstance(value, (dict, list)):
+            existing = target.get(key)
+            target[key] = merge_update(existing if isinstance(existing, dict) else {}, value)
+        else:
+            target[key] = value
+    return target
+
+
+def _seconds(value) -> float:
+    if isinstance(value, dict):
+        value = value.get("Value")
+    if not value:
+        return np.nan
+    delta = to_timedelta(str(value))
+    return delta.total_seconds() if delta is not None else np.nan
+
+
+def _gap(value) -> float:
+    """Gap strings like '+1.234'; lapped cars ('1 L', 'LAP 12') have no time gap."""
+    if isinstance(value, dict):
+        value = value.get("Value")
+    try:
+        return float(str(value).lstrip("+"))
+    except (TypeError, ValueError):
+        return 0.0 if str(value).startswith("LAP") else np.nan
+
+
+@dataclass
+class LiveTimingState:
+    """Running timing state plus lap-indexed matrices that only grow.
+
+    Every completed lap appends one row and writes one cell per matrix, so an
+    update costs the same on lap 60 as on lap 1.
+    """
+
+    drivers: dict[str, str] = field(default_factory=dict)
+    team_colors: dict[str, str] = field(default_factory=dict)
+    timing: dict[str, dict] = field(default_factory=dict)
+    tyres: dict[str, dict] = field(default_factory=dict)
+    track_status: str = "1"
+    current_lap: int = 0
+    total_laps: int | None = None
+    session_seconds: float = 0.0
+    columns: dict[str, int] = field(default_factory=dict)
+    positions: np.ndarray = field(
+        default_factory=lambda: np.full((INITIAL_LAP_CAPACITY, 0), np.nan)
+    )
+    gaps: np.ndarray = field(default_factory=lambda: np.full((INITIAL_LAP_CAPACITY, 0), np.nan))
+    _lap_rows: list[dict] = field(default_factory=list)
+    _laps: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=LAP_COLUMNS))
+    _pending_pit: dict[str, dict] = field(default_factory=dict)
+
+    def _column(self, number: str) -> int:
+        column = self.columns.get(number)
+        if column is None:
+            column = self.columns[number] = len(self.columns)
+            padding = np.full((len(self.positions), 1), np.nan)
+            self.positions = np.hstack([self.positions, padding])
+            self.gaps = np.hstack([self.gaps, padding])
+        return column
+
+    def _ensure_lap_capacity(self, lap_number: int):
+        if lap_number < len(self.positions):
+            return
+        rows = max(lap_number + 1, len(self.positions) * 2) - len(self.positions)
+        padding = np.full((rows, self.positions.shape[1]), np.nan)
+        self.positions = np.vstack([self.positions, padding])
+        self.gaps = np.vstack([self.gaps, padding])
+
+    def driver_code(self, number: str) -> str:
+        return self.drivers.get(number, number)
+
+    def _current_stint(self, number: str) -> tuple[int | None, dict]:
+        stints = self.tyres.get(number, {}).get("Stints", {})
+        if not stints:
+            return None, {}
+        index = max(stints, key=int)
+        return int(index) + 1, stints[index]
+
+    def _complete_lap(self, number: str, state: dict):
+        lap_number = int(state["NumberOfLaps"])
+        stint, tyre = self._current_stint(number)
+        position = pd.to_numeric(state.get("Position"), errors="coerce")
+        gap_to_leader = 0.0 if position == 1 else _gap(state.get("GapToLeader"))
+        pit = self._pending_pit.pop(number, {})
+
+        self._lap_rows.append(
+            {
+                "Driver": self.driver_code(number),
+                "DriverNumber": number,
+                "LapNumber": lap_number,
+                "LapTime": _seconds(state.get("LastLapTime")),
+                "Position": position,
+                "GapToLeader": gap_to_leader,
+                "Interval": 0.0 if position == 1 else _gap(state.get("IntervalToPositionAhead")),
+                "Compound": tyre.get("Compound"),
+                "Stint": stint,
+                "TyreLife": tyre.get("TotalLaps"),
+                "PitIn": pit.get("PitIn", False),
+                "PitOut": pit.get("PitOut", False),
+                "TrackStatus": self.track_status,
+                "SessionSeconds": self.session_seconds,
+            }
+        )
+
+        column = self._column(number)
+        self._ensure_lap_capacity(lap_number)
+        self.positions[lap_number, column] = position
+        self.gaps[lap_number, column] = gap_to_leader
+
+    def apply(self, category: str, message: dict, session_seconds: float) -> bool:
+        """Ingest one message; True when it completed at least one lap."""
+        self.session_seconds = session_seconds
+        if category == "DriverList":
+            for number, info in message.items():
+                if not isinstance(info, dict):
+                    continue
+                if info.get("Tla"):
+                    self.drivers[number] = info["Tla"]
+                if info.get("TeamColour"):
+                    self.team_colors[number] = f"#{info['TeamColour']}"
+            return False
+        if category == "LapCount":
+            self.current_lap = int(message.get("CurrentLap", self.current_lap))
+            self.total_laps = message.get("TotalLaps", self.total_laps)
+            return False
+        if category == "TrackStatus":
+            self.track_status = str(message.get("Status", self.track_status))
+            return False
+        if category == "TimingAppData":
+            for number, update in message.get("Lines", {}).items():
+                merge_update(self.tyres.setdefault(number, {}), update)
+            return False
+        if category != "TimingData":
+            return False
+
+        completed = False
+        for number, update in message.get("Lines", {}).items():
+            state = self.timing.setdefault(number, {})
+            previous_laps = state.get("NumberOfLaps")
+            merge_update(state, update)
+
+            pit = self._pending_pit.setdefault(number, {})
+            if update.get("InPit"):
+                pit["PitIn"] = True
+            if update.get("PitOut"):
+                pit["PitOut"] = True
+
+            if "NumberOfLaps" in update and update["NumberOfLaps"] != previous_laps:
+                self._complete_lap(number, state)
+                completed = True
+        return completed
+
+    @property
+    def laps(self) -> pd.DataFrame:
+        """All completed laps; only rows added since the last call are converted."""
+        if len(self._lap_rows) > len(self._laps):
+            new_rows = pd.DataFrame(self._lap_rows[len(self._laps):], columns=LAP_COLUMNS)
+            self._laps = (
+                new_rows if self._laps.empty else pd.concat([self._laps, new_rows], ignore_index=True)
+            )
+        return self._laps
+
+    @property
+    def driver_order(self) -> list[str]:
+        """Driver numbers in current running order."""
+        return sorted(
+            self.timing,
+            key=lambda number: pd.to_numeric(self.timing[number].get("Position"), errors="coerce")
+            if self.timing[number].get("Position")
+            else 99,
+        )
+
+
+class LiveReplay:
+    """Feeds a recorded live-timing file into a :class:`LiveTimingState`.
+
+    Messages are released against a replay clock (``speed`` x wall time).
+    Each :meth:`advance` call stops after ``budget`` seconds of work, so a
+    burst of messages spreads over several refreshes instead of stalling one.
+    """
+
+    def __init__(self, path: Path, speed: float = 1.0, budget: float = UPDATE_BUDGET_SECONDS):
+        self.path = Path(path)
+        self.speed = speed
+        self.budget = budget
+        self.state = LiveTimingState()
+        self.finished = False
+        self.messages = 0
+        self.last_update_seconds = 0.0
+        self._file = self.path.open("r", encoding="utf-8-sig")
+        self._pending = None
+        self._origin = None
+        self._started_at = None
+        self._paused_at = None
+        self._lock = threading.Lock()
+
+    def _next_message(self):
+        if self._pending is not None:
+            return self._pending
+        for line in self._file:
+            parsed = parse_line(line)
+            if parsed is not None and parsed[0] in LIVE_CATEGORIES:
+                self._pending = parsed
+                return parsed
+        self.finished = True
+        self._file.close()
+        return None
+
+    @property
+    def replay_seconds(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        end = self._paused_at if self._paused_at is not None else time.monotonic()
+        return (end - self._started_at) * self.speed
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+
+    def resume(self):
+        if self._paused_at is not None and self._started_at is not None:
+            self._started_at += time.monotonic() - self._paused_at
+        self._paused_at = None
+
+    def advance(self, until_seconds: float | None = None) -> int:
+        """Apply due messages; returns how many laps were completed."""
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            until = self.replay_seconds if until_seconds is None else until_seconds
+            deadline = time.perf_counter() + self.budget
+            started = time.perf_counter()
+            completed_laps = 0
+
+            while not self.finished and time.perf_counter() < deadline:
+                message = self._next_message()
+                if message is None:
+                    break
+                category, payload, timestamp = message
+                if self._origin is None:
+                    self._origin = timestamp
+                session_seconds = (timestamp - self._origin).total_seconds()
+                if session_seconds > until:
+                    break
+
+                self._pending = None
+                self.messages += 1
+                if isinstance(payload, dict):
+                    completed_laps += self.state.apply(category, payload, session_seconds)
+
+            self.last_update_seconds = time.perf_counter() - started
+            return completed_laps
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
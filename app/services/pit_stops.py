@@ -0,0 +1,211 @@
+"""Pit-stop time loss against clean-lap pace, and undercut/overcut outcomes."""
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.lap_classes import NEUTRALISED_STATUSES, get_classified_laps
+from app.services.race_trace import get_race_trace
+
+
+# Green-flag laps on either side of a stop that set the driver's reference pace
+REFERENCE_LAPS = 5
+REFERENCE_CLASSES = ("Clean Air", "Traffic")
+
+# Stops of two adjacent cars this many laps apart, starting this close, are a pit battle
+PIT_BATTLE_LAPS = 5
+PIT_BATTLE_GAP_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class PitStopAnalysis:
+    stops: pd.DataFrame
+    by_team: pd.DataFrame
+    by_lap: pd.DataFrame
+    battles: pd.DataFrame
+
+
+def _seconds(values: pd.Series) -> np.ndarray:
+    return pd.to_timedelta(values).dt.total_seconds().to_numpy(dtype=float)
+
+
+def reference_pace(
+    laps: pd.DataFrame,
+    drivers: list[str],
+    in_laps: np.ndarray,
+    columns: np.ndarray,
+    window: int = REFERENCE_LAPS,
+) -> np.ndarray:
+    """Median clean lap in the ``window`` laps before and after each stop.
+
+    One lap x driver matrix of clean lap times; every stop reads its window
+    from a strided view of it, so there is no per-driver or per-stop loop.
+    """
+    clean = laps[laps["LapClass"].isin(REFERENCE_CLASSES)]
+    matrix = (
+        pd.Series(
+            clean["LapTime"].dt.total_seconds().to_numpy(),
+            index=pd.MultiIndex.from_arrays(
+                [clean["LapNumber"].astype(int), clean["Driver"].astype(str)]
+            ),
+        )
+        .unstack()
+        .reindex(index=np.arange(1, int(laps["LapNumber"].max()) + 1), columns=drivers)
+        .to_numpy(dtype=float)
+    )
+
+    # Rows L - window .. L + 1 + window; the in- and out-laps are never clean
+    padded = np.pad(matrix, ((window, window + 2), (0, 0)), constant_values=np.nan)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * window + 2, axis=0)
+    with warnings.catch_warnings():
+        # Stops with no clean laps around them get NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(windows[in_laps - 1, columns], axis=1)
+
+
+def build_pit_stops(laps: pd.DataFrame, window: int = REFERENCE_LAPS) -> pd.DataFrame:
+    """One row per completed stop with its pit-lane time and total time loss.
+
+    The loss is the in-lap plus the out-lap, from the start of one to the end
+    of the other, less two laps at the driver's reference pace.
+    """
+    laps = laps.dropna(subset=["Driver", "LapNumber"]).reset_index(drop=True)
+    keys = pd.MultiIndex.from_arrays([laps["Driver"].astype(str), laps["LapNumber"].astype(int)])
+    in_rows = np.flatnonzero(laps["PitInTime"].notna().to_numpy())
+    out_rows = keys.get_indexer(
+        pd.MultiIndex.from_arrays(
+            [keys.get_level_values(0)[in_rows], keys.get_level_values(1)[in_rows] + 1]
+        )
+    )
+    # A car that retires in the pits has no out-lap
+    completed = out_rows >= 0
+    in_rows, out_rows = in_rows[completed], out_rows[completed]
+    in_laps, out_laps = laps.iloc[in_rows], laps.iloc[out_rows]
+
+    drivers = sorted(laps["Driver"].astype(str).unique())
+    driver_columns = np.searchsorted(drivers, in_laps["Driver"].astype(str).to_numpy())
+    lap_numbers = in_laps["LapNumber"].to_numpy(dtype=int)
+    reference = reference_pace(laps, drivers, lap_numbers, driver_columns, window)
+
+    stop_seconds = _seconds(out_laps["Time"]) - _seconds(in_laps["LapStartTime"])
+    track_status = (
+        in_laps["TrackStatus"].fillna("").astype(str).to_numpy()
+        + out_laps["TrackStatus"].fillna("").astype(str).to_numpy()
+    )
+    neutralised = pd.Series(track_status).str.contains(
+        "[" + "".join(sorted(NEUTRALISED_STATUSES)) + "]"
+    )
+
+    stops = pd.DataFrame(
+        {
+            "Driver": in_laps["Driver"].astype(str).to_numpy(),
+            "Team": in_laps["Team"].to_numpy(),
+            "InLap": lap_numbers,
+            "CompoundIn": in_laps["Compound"].to_numpy(),
+            "CompoundOut": out_laps["Compound"].to_numpy(),
+            "PitLaneSeconds": _seconds(out_laps["PitOutTime"]) - _seconds(in_laps["PitInTime"]),
+            "StopLapsSeconds": stop_seconds,
+            "ReferencePace": reference,
+            "TimeLossSeconds": stop_seconds - 2 * reference,
+            "Neutralised": neutralised.to_numpy(),
+        }
+    ).sort_values(["Driver", "InLap"], ignore_index=True)
+    stops.insert(1, "Stop", stops.groupby("Driver").cumcount() + 1)
+    return stops
+
+
+def summarise_by_team(stops: pd.DataFrame) -> pd.DataFrame:
+    green = stops[~stops["Neutralised"]]
+    return (
+        green.groupby("Team")
+        .agg(
+            Stops=("TimeLossSeconds", "size"),
+            MedianLossSeconds=("TimeLossSeconds", "median"),
+            BestLossSeconds=("TimeLossSeconds", "min"),
+            MedianPitLaneSeconds=("PitLaneSeconds", "median"),
+        )
+        .sort_values("MedianLossSeconds")
+        .reset_index()
+    )
+
+
+def summarise_by_lap(stops: pd.DataFrame) -> pd.DataFrame:
+    return (
+        stops.groupby("InLap")
+        .agg(
+            Stops=("Driver", "size"),
+            MedianLossSeconds=("TimeLossSeconds", "median"),
+            Neutralised=("Neutralised", "any"),
+        )
+        .reset_index()
+    )
+
+
+def find_pit_battles(
+    stops: pd.DataFrame,
+    trace,
+    max_laps: int = PIT_BATTLE_LAPS,
+    max_gap: float = PIT_BATTLE_GAP_SECONDS,
+) -> pd.DataFrame:
+    """Undercut and overcut attempts between cars running nose to tail.
+
+    Every pair of stops a few laps apart is checked in one self-join. The
+    chaser is the car behind on the lap before the first of the two stops;
+    its gain is the gap it closed by the lap after the second stop.
+    """
+    pairs = stops[["Driver", "InLap"]].merge(
+        stops[["Driver", "InLap"]], how="cross", suffixes=("", "Rival")
+    )
+    columns = {driver: column for column, driver in enumerate(trace.drivers)}
+    lap_gap = pairs["InLapRival"] - pairs["InLap"]
+    pairs = pairs[
+        (pairs["Driver"] != pairs["DriverRival"])
+        & lap_gap.abs().between(1, max_laps)
+        & pairs["Driver"].isin(columns)
+        & pairs["DriverRival"].isin(columns)
+    ]
+
+    driver = pairs["Driver"].map(columns).to_numpy()
+    rival = pairs["DriverRival"].map(columns).to_numpy()
+    before_lap = np.minimum(pairs["InLap"], pairs["InLapRival"]).to_numpy() - 1
+    after_lap = np.maximum(pairs["InLap"], pairs["InLapRival"]).to_numpy() + 1
+    last = len(trace.lap_numbers) - 1
+    before = np.minimum(np.searchsorted(trace.lap_numbers, before_lap), last)
+    after = np.minimum(np.searchsorted(trace.lap_numbers, after_lap), last)
+    in_range = (trace.lap_numbers[before] == before_lap) & (trace.lap_numbers[after] == after_lap)
+
+    # Positive gaps: the driver is behind the rival
+    gap_before = trace.elapsed[before, driver] - trace.elapsed[before, rival]
+    gap_after = trace.elapsed[after, driver] - trace.elapsed[after, rival]
+    chasing = (
+        in_range
+        & (trace.positions[before, driver] == trace.positions[before, rival] + 1)
+        & (gap_before <= max_gap)
+        & ~np.isnan(gap_after)
+    )
+
+    battles = pairs.assign(
+        Type=np.where(pairs["InLap"] < pairs["InLapRival"], "Undercut", "Overcut"),
+        GapBeforeSeconds=gap_before,
+        GapAfterSeconds=gap_after,
+        GainSeconds=gap_before - gap_after,
+        Success=gap_after < 0,
+    )[chasing]
+    return battles.sort_values(["InLap", "Driver"], ignore_index=True)
+
+
+@session_cache("pit_stops")
+def get_pit_stop_analysis(session, window: int = REFERENCE_LAPS) -> PitStopAnalysis:
+    stops = build_pit_stops(get_classified_laps(session), window)
+    if stops.empty:
+        raise ValueError("No completed pit stops are available for this session.")
+    return PitStopAnalysis(
+        stops=stops,
+        by_team=summarise_by_team(stops),
+        by_lap=summarise_by_lap(stops),
+        battles=find_pit_battles(stops, get_race_trace(session)),
+    )
@@ -0,0 +1,268 @@
+"""On-track passes, DRS-range battles and pit-stop position changes."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.race_trace import RaceTrace, get_race_trace
+from app.services.telemetry import get_lap_telemetry
+
+
+GRID_STEP_SECONDS = 1.0
+PASS_HOLD_SECONDS = 3.0
+DRS_GAP_SECONDS = 1.0
+MIN_BATTLE_LAPS = 3
+
+
+@dataclass(frozen=True)
+class RaceEvents:
+    passes: pd.DataFrame
+    battles: pd.DataFrame
+    pit_stops: pd.DataFrame
+
+    def to_frame(self) -> pd.DataFrame:
+        passes = self.passes.assign(Event=self.passes["Type"])
+        battles = self.battles.assign(
+            Event="DRS Battle",
+            LapNumber=self.battles["StartLap"],
+            OtherDriver=self.battles["DriverAhead"],
+        )
+        pit_stops = self.pit_stops.assign(Event="Pit Stop")
+        columns = ["Event", "LapNumber", "Driver", "OtherDriver"]
+        frame = pd.concat(
+            [passes, battles, pit_stops], ignore_index=True, sort=False
+        )
+        ordered = columns + [column for column in frame.columns if column not in columns]
+        return frame[ordered].sort_values(["LapNumber", "Event"], ignore_index=True)
+
+
+def build_race_distance(telemetry: pd.DataFrame) -> tuple[pd.DataFrame, float]:
+    """Continuous race distance per sample, in metres of one reference lap."""
+    lap_distance = telemetry.groupby("LapIndex")["Distance"].transform("max")
+    lap_length = float(lap_distance.median())
+    progress = telemetry["Distance"] / lap_distance.where(lap_distance > 0)
+
+    race_distance = pd.DataFrame(
+        {
+            "Driver": telemetry["Driver"],
+            "SessionSeconds": telemetry["SessionSeconds"],
+            "RaceDistance": (telemetry["LapNumber"] - 1 + progress.fillna(0)) * lap_length,
+        }
+    )
+    return race_distance, lap_length
+
+
+def resample_race_distance(
+    race_distance: pd.DataFrame, drivers: list[str], step: float = GRID_STEP_SECONDS
+) -> tuple[np.ndarray, np.ndarray]:
+    """Time x driver matrix of race distance on one common time base."""
+    start = race_distance["SessionSeconds"].min()
+    end = race_distance["SessionSeconds"].max()
+    grid = np.arange(start, end, step)
+
+    columns = {driver: column for column, driver in enumerate(drivers)}
+    distance = np.full((len(grid), len(drivers)), np.nan)
+    for driver, samples in race_distance.groupby("Driver", sort=False):
+        if driver not in columns:
+            continue
+        distance[:, columns[driver]] = np.interp(
+            grid,
+            samples["SessionSeconds"].to_numpy(),
+            samples["RaceDistance"].to_numpy(),
+            left=np.nan,
+            right=np.nan,
+        )
+    return grid, distance
+
+
+def _pit_windows(laps: pd.DataFrame, drivers: list[str]) -> list[np.ndarray]:
+    """Per driver, sorted (pit in, pit out) session seconds of every stop."""
+    timing = laps[["Driver", "LapNumber", "PitInTime", "PitOutTime"]].copy()
+    timing = timing.sort_values(["Driver", "LapNumber"])
+    timing["PitOutNext"] = timing.groupby("Driver")["PitOutTime"].shift(-1)
+    stops = timing.dropna(subset=["PitInTime"])
+
+    windows = []
+    for driver in drivers:
+        driver_stops = stops[stops["Driver"] == driver]
+        pit_in = driver_stops["PitInTime"].dt.total_seconds().to_numpy()
+        pit_out = driver_stops["PitOutNext"].dt.total_seconds().to_numpy()
+        windows.append(np.column_stack([pit_in, np.nan_to_num(pit_out, nan=np.inf)]))
+    return windows
+
+
+def _in_pit_lane(windows: list[np.ndarray], columns: np.ndarray, seconds: np.ndarray):
+    in_pit = np.zeros(len(columns), dtype=bool)
+    for column in np.unique(columns):
+        stops = windows[column]
+        if len(stops) == 0:
+            continue
+        selected = columns == column
+        stop = np.searchsorted(stops[:, 0], seconds[selected], side="right") - 1
+        inside = stop >= 0
+        inside[inside] &= seconds[selected][inside] <= stops[stop[inside], 1]
+        in_pit[selected] = inside
+    return in_pit
+
+
+def detect_passes(
+    grid: np.ndarray,
+    distance: np.ndarray,
+    drivers: list[str],
+    lap_length: float,
+    pit_windows: list[np.ndarray],
+) -> pd.DataFrame:
+    # Running order at every instant: one row-wise sort instead of comparing pairs
+    filled = np.nan_to_num(distance, nan=-np.inf)
+    order = np.argsort(-filled, axis=1, kind="stable")
+
+    # A pass is an adjacent swap between two consecutive instants
+    previous, current = order[:-1], order[1:]
+    swapped = (current[:, :-1] == previous[:, 1:]) & (current[:, 1:] == previous[:, :-1])
+    rows, ahead_slot = np.nonzero(swapped)
+    row = rows + 1
+    passer = current[rows, ahead_slot]
+    passed = current[rows, ahead_slot + 1]
+
+    valid = np.isfinite(filled[row, passer]) & np.isfinite(filled[row, passed])
+    # Ignore swaps that undo themselves within the hold time (timing noise)
+    hold = np.minimum(row + int(round(PASS_HOLD_SECONDS / GRID_STEP_SECONDS)), len(grid) - 1)
+    valid &= filled[hold, passer] > filled[hold, passed]
+    # Lapping a backmarker is not a fight for position
+    valid &= np.abs(filled[row, passer] - filled[row, passed]) < lap_length / 2
+    row, ahead_slot, passer, passed = (
+        row[valid], ahead_slot[valid], passer[valid], passed[valid]
+    )
+
+    seconds = grid[row]
+    pit_related = _in_pit_lane(pit_windows, passer, seconds) | _in_pit_lane(
+        pit_windows, passed, seconds
+    )
+    passer_distance = distance[row, passer]
+    return pd.DataFrame(
+        {
+            "Type": np.where(pit_related, "Pit Stop Pass", "Overtake"),
+            "SessionSeconds": seconds,
+            "LapNumber": (passer_distance // lap_length).astype(int) + 1,
+            "LapDistance": passer_distance % lap_length,
+            "LapFraction": passer_distance / lap_length,
+            "Driver": np.asarray(drivers, dtype=object)[passer],
+            "OtherDriver": np.asarray(drivers, dtype=object)[passed],
+            "Position": ahead_slot + 1,
+        }
+    )
+
+
+def detect_battles(trace: RaceTrace, min_laps: int = MIN_BATTLE_LAPS) -> pd.DataFrame:
+    elapsed = trace.elapsed
+    order = np.argsort(elapsed, axis=1, kind="stable")
+    ahead_ordered = np.concatenate(
+        [np.full((len(order), 1), -1), order[:, :-1]], axis=1
+    )
+    car_ahead = np.empty_like(order)
+    np.put_along_axis(car_ahead, order, ahead_ordered, axis=1)
+
+    in_range = (trace.gap_to_ahead < DRS_GAP_SECONDS) & (car_ahead >= 0)
+
+    # Runs of consecutive in-range laps behind the same car, per driver column
+    frame = pd.DataFrame(
+        {
+            "Column": np.tile(np.arange(len(trace.drivers)), len(trace.lap_numbers)),
+            "LapNumber": np.repeat(trace.lap_numbers, len(trace.drivers)),
+            "Ahead": car_ahead.ravel(),
+            "Gap": trace.gap_to_ahead.ravel(),
+            "InRange": in_range.ravel(),
+        }
+    ).sort_values(["Column", "LapNumber"], kind="stable")
+    new_run = (
+        ~frame["InRange"]
+        | (frame["Column"].diff() != 0)
+        | (frame["Ahead"].diff() != 0)
+        | (frame["LapNumber"].diff() != 1)
+    )
+    frame["Run"] = new_run.cumsum()
+    runs = (
+        frame[frame["InRange"]]
+        .groupby("Run")
+        .agg(
+            Column=("Column", "first"),
+            Ahead=("Ahead", "first"),
+            StartLap=("LapNumber", "min"),
+            EndLap=("LapNumber", "max"),
+            Laps=("LapNumber", "size"),
+            MinGap=("Gap", "min"),
+            MeanGap=("Gap", "mean"),
+        )
+    )
+    runs = runs[runs["Laps"] >= min_laps]
+
+    drivers = np.asarray(trace.drivers, dtype=object)
+    return pd.DataFrame(
+        {
+            "Driver": drivers[runs["Column"].to_numpy()],
+            "DriverAhead": drivers[runs["Ahead"].to_numpy()],
+            "StartLap": runs["StartLap"].to_numpy(),
+            "EndLap": runs["EndLap"].to_numpy(),
+            "Laps": runs["Laps"].to_numpy(),
+            "MinGap": runs["MinGap"].to_numpy(),
+            "MeanGap": runs["MeanGap"].to_numpy(),
+        }
+    ).reset_index(drop=True)
+
+
+def detect_pit_stop_changes(trace: RaceTrace, laps: pd.DataFrame) -> pd.DataFrame:
+    """Positions lost from the lap before each stop to the end of the out lap."""
+    stops = laps.dropna(subset=["PitInTime", "LapNumber"])
+    stops = stops[["Driver", "LapNumber"]].astype({"LapNumber": int})
+    if stops.empty:
+        return pd.DataFrame(
+            columns=["Driver", "LapNumber", "PositionBefore", "PositionAfter", "PositionsLost"]
+        )
+
+    row_of_lap = pd.Series(np.arange(len(trace.lap_numbers)), index=trace.lap_numbers)
+    column_of_driver = pd.Series(np.arange(len(trace.drivers)), index=trace.drivers)
+    columns = column_of_driver.reindex(stops["Driver"]).to_numpy()
+    before_rows = row_of_lap.reindex(stops["LapNumber"] - 1).to_numpy()
+    after_rows = row_of_lap.reindex(stops["LapNumber"] + 1).to_numpy()
+
+    def positions_at(rows):
+        found = ~np.isnan(rows) & ~np.isnan(columns)
+        values = np.full(len(rows), np.nan)
+        values[found] = trace.positions[
+            rows[found].astype(int), columns[found].astype(int)
+        ]
+        return values
+
+    before = positions_at(before_rows)
+    after = positions_at(after_rows)
+    return pd.DataFrame(
+        {
+            "Driver": stops["Driver"].to_numpy(),
+            "LapNumber": stops["LapNumber"].to_numpy(),
+            "PositionBefore": before,
+            "PositionAfter": after,
+            "PositionsLost": after - before,
+        }
+    )
+
+
+def build_race_events(laps: pd.DataFrame, telemetry: pd.DataFrame, trace: RaceTrace) -> RaceEvents:
+    race_distance, lap_length = build_race_distance(telemetry)
+    drivers = trace.drivers
+    grid, distance = resample_race_distance(race_distance, drivers)
+    passes = detect_passes(grid, distance, drivers, lap_length, _pit_windows(laps, drivers))
+    return RaceEvents(
+        passes=passes,
+        battles=detect_battles(trace),
+        pit_stops=detect_pit_stop_changes(trace, laps),
+    )
+
+
+@session_cache("race_events")
+def get_race_events(session) -> RaceEvents:
+    return build_race_events(
+        session.laps, get_lap_telemetry(session), get_race_trace(session)
+    )
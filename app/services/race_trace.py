@@ -0,0 +1,124 @@
+"""Lap x driver race-trace matrices built from a single pivot of the laps."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+
+
+@dataclass(frozen=True)
+class RaceTrace:
+    """Per-lap timing matrices; rows are laps, columns are drivers.
+
+    ``elapsed`` is the session time in seconds at which each driver finished
+    each lap and is NaN for laps a driver never completed (retirements).
+    """
+
+    drivers: list[str]
+    lap_numbers: np.ndarray
+    elapsed: np.ndarray
+    positions: np.ndarray
+    gap_to_leader: np.ndarray
+    gap_to_ahead: np.ndarray
+    interval_change: np.ndarray
+    laps_down: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        lap_grid, driver_grid = np.meshgrid(
+            self.lap_numbers, np.asarray(self.drivers, dtype=object), indexing="ij"
+        )
+        frame = pd.DataFrame(
+            {
+                "Driver": driver_grid.ravel(),
+                "LapNumber": lap_grid.ravel(),
+                "Position": self.positions.ravel(),
+                "ElapsedSeconds": self.elapsed.ravel(),
+                "GapToLeader": self.gap_to_leader.ravel(),
+                "GapToAhead": self.gap_to_ahead.ravel(),
+                "IntervalChange": self.interval_change.ravel(),
+                "LapsDown": self.laps_down.ravel(),
+            }
+        )
+        return frame.dropna(subset=["ElapsedSeconds"]).reset_index(drop=True)
+
+
+def _running_order(elapsed: np.ndarray) -> np.ndarray:
+    # NaNs sort last, so cars that did not complete the lap drop to the back
+    order = np.argsort(elapsed, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(
+        ranks, order, np.broadcast_to(np.arange(elapsed.shape[1]), order.shape), axis=1
+    )
+    return np.where(np.isnan(elapsed), np.nan, ranks + 1.0)
+
+
+def _gap_to_car_ahead(elapsed: np.ndarray) -> np.ndarray:
+    order = np.argsort(elapsed, axis=1, kind="stable")
+    ordered = np.take_along_axis(elapsed, order, axis=1)
+    gaps = np.diff(ordered, axis=1, prepend=np.nan)
+
+    gap_to_ahead = np.empty_like(elapsed)
+    np.put_along_axis(gap_to_ahead, order, gaps, axis=1)
+    return gap_to_ahead
+
+
+def build_race_trace(laps: pd.DataFrame) -> RaceTrace:
+    laps = laps.dropna(subset=["Driver", "LapNumber", "Time"])
+    if laps.empty:
+        raise ValueError("No lap timing data is available for a race trace.")
+
+    timing = pd.DataFrame(
+        {
+            "Driver": laps["Driver"].astype(str),
+            "LapNumber": laps["LapNumber"].astype(int),
+            "Elapsed": laps["Time"].dt.total_seconds(),
+            "Position": pd.to_numeric(laps.get("Position"), errors="coerce"),
+        }
+    )
+    matrix = timing.pivot(index="LapNumber", columns="Driver")
+    lap_numbers = matrix.index.to_numpy()
+    drivers = matrix["Elapsed"].columns.astype(str).tolist()
+    elapsed = matrix["Elapsed"].to_numpy(dtype=float)
+    official_positions = matrix["Position"].to_numpy(dtype=float)
+
+    # The leader of lap n is whoever finished lap n first
+    with np.errstate(all="ignore"):
+        leader_times = np.nanmin(elapsed, axis=1)
+    gap_to_leader = elapsed - leader_times[:, None]
+
+    # Laps down: how many more laps the leader had completed by the time a
+    # car crossed the line; leader_times is non-decreasing down the rows.
+    cumulative_leader = np.fmax.accumulate(np.nan_to_num(leader_times, nan=-np.inf))
+    completed_by_leader = np.searchsorted(
+        cumulative_leader, np.nan_to_num(elapsed, nan=np.inf).ravel(), side="right"
+    ).reshape(elapsed.shape)
+    laps_down = np.where(
+        np.isnan(elapsed),
+        np.nan,
+        np.maximum(completed_by_leader - 1 - np.arange(len(lap_numbers))[:, None], 0),
+    )
+
+    gap_to_ahead = _gap_to_car_ahead(elapsed)
+    interval_change = np.diff(gap_to_ahead, axis=0, prepend=np.nan)
+    positions = np.where(
+        np.isnan(official_positions), _running_order(elapsed), official_positions
+    )
+
+    return RaceTrace(
+        drivers=drivers,
+        lap_numbers=lap_numbers,
+        elapsed=elapsed,
+        positions=positions,
+        gap_to_leader=gap_to_leader,
+        gap_to_ahead=gap_to_ahead,
+        interval_change=interval_change,
+        laps_down=laps_down,
+    )
+
+
+@session_cache("race_trace")
+def get_race_trace(session) -> RaceTrace:
+    return build_race_trace(session.laps)
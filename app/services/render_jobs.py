@@ -0,0 +1,237 @@
+"""Bounded, deduplicating render queue behind the headless render service."""
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+from app.models.state import AnalysisSelection
+from app.plots.comparison import figure_to_png_bytes
+from app.plots.rendering import enforce_artist_budget
+from app.services.datasets import (
+    dataframe_to_csv_bytes,
+    dataframe_to_parquet_bytes,
+    prepare_dataset,
+)
+from app.utils.validation import validate_analysis_selection
+
+
+RENDER_WORKERS = int(os.getenv("F1_RENDER_WORKERS", "4"))
+RENDER_QUEUE_SIZE = int(os.getenv("F1_RENDER_QUEUE", "16"))
+CLIENT_CONCURRENCY = int(os.getenv("F1_RENDER_CLIENT_LIMIT", "2"))
+
+OUTPUT_TYPES = {
+    "png": "image/png",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+SESSION_FIELDS = ("year", "event_name", "session_type")
+
+# Fields of AnalysisSelection without a default, and what a request may omit them as
+SELECTION_DEFAULTS = {
+    "driver_codes": (),
+    "driver_for_map": None,
+    "use_fastest_laps": True,
+    "driver_laps": (),
+}
+
+
+class Overloaded(Exception):
+    """The queue or the client's share of it is full; retry later."""
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    session_key: tuple[int, str, str]
+    selection: AnalysisSelection
+    output: str = "png"
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    body: bytes
+    content_type: str
+    seconds: float
+
+
+def parse_render_request(payload: dict, analyses=None) -> RenderJob:
+    """Build a :class:`RenderJob` from ``AnalysisSelection``-shaped JSON.
+
+    ``analyses``, when given, lists the analysis types the service can render.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("The request body must be a JSON object.")
+
+    selection_fields = {field.name for field in fields(AnalysisSelection)}
+    unknown = set(payload) - selection_fields - set(SESSION_FIELDS) - {"format"}
+    if unknown:
+        raise ValueError(f"Unknown request fields: {', '.join(sorted(unknown))}.")
+    missing = [name for name in (*SESSION_FIELDS, "analysis_type") if not payload.get(name)]
+    if missing:
+        raise ValueError(f"Missing request fields: {', '.join(missing)}.")
+
+    if analyses is not None and payload["analysis_type"] not in analyses:
+        raise ValueError(f"Unknown analysis type '{payload['analysis_type']}'.")
+
+    output = payload.get("format", "png")
+    if output not in OUTPUT_TYPES:
+        raise ValueError(f"Unsupported format '{output}'; use one of {', '.join(OUTPUT_TYPES)}.")
+
+    values = {**SELECTION_DEFAULTS, **payload, "generate_plot": True}
+    values = {
+        name: tuple(value) if isinstance(value, list) else value
+        for name, value in values.items()
+        if name in selection_fields
+    }
+    try:
+        year = int(payload["year"])
+        selection = AnalysisSelection(**values)
+        hash(selection)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid request: {exc}") from exc
+    return RenderJob((year, str(payload["event_name"]), selection.session_type), selection, output)
+
+
+def fixture_name(year: int, event_name: str, session_type: str) -> str:
+    return f"{year}_{event_name.replace(' ', '_')}_{session_type}.pkl"
+
+
+def fixture_session_loader(directory: Path):
+    """Session loader reading pickled sessions from ``directory`` by :func:`fixture_name`.
+
+    Lets the service run and be exercised offline; each fixture is unpickled
+    once and shared like a resident session.
+    """
+    directory = Path(directory)
+    sessions = {}
+    lock = threading.Lock()
+
+    def load(year: int, event_name: str, session_type: str):
+        key = (year, event_name, session_type)
+        with lock:
+            if key not in sessions:
+                path = directory / fixture_name(*key)
+                if not path.exists():
+                    raise ValueError(f"No fixture session at {path}.")
+                with path.open("rb") as file:
+                    sessions[key] = pickle.load(file)
+            return sessions[key]
+
+    return load
+
+
+class RenderService:
+    """Runs render jobs on a fixed worker pool with bounded admission.
+
+    Identical jobs already queued or running share one future. At most
+    ``workers + queue_size`` distinct jobs are admitted, and each client may
+    wait on at most ``client_limit`` at once; anything beyond that raises
+    :class:`Overloaded` instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        load_session,
+        render,
+        workers: int = RENDER_WORKERS,
+        queue_size: int = RENDER_QUEUE_SIZE,
+        client_limit: int = CLIENT_CONCURRENCY,
+    ):
+        self.load_session = load_session
+        self.render_figure = render
+        self.capacity = workers + queue_size
+        self.client_limit = client_limit
+        self.stats: Counter = Counter()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+        self._lock = threading.Lock()
+        self._in_flight: dict[RenderJob, Future] = {}
+        self._clients: Counter = Counter()
+
+    def submit(self, client: str, job: RenderJob) -> tuple[Future, bool]:
+        """Admit ``job`` for ``client``; returns its future and whether it was shared.
+
+        Every admitted call must be paired with :meth:`release`.
+        """
+        with self._lock:
+            if self._clients[client] >= self.client_limit:
+                self.stats["rejected_client"] += 1
+                raise Overloaded(f"Client already has {self.client_limit} renders in progress.")
+
+            future = self._in_flight.get(job)
+            shared = future is not None
+            if shared:
+                self.stats["deduplicated"] += 1
+            else:
+                if len(self._in_flight) >= self.capacity:
+                    self.stats["rejected_queue"] += 1
+                    raise Overloaded("The render queue is full.")
+                future = self._executor.submit(self._run, job)
+                self._in_flight[job] = future
+                self.stats["submitted"] += 1
+            self._clients[client] += 1
+
+        if not shared:
+            # Outside the lock: a job that already finished runs this inline
+            future.add_done_callback(lambda _, job=job: self._finish(job))
+        return future, shared
+
+    def release(self, client: str):
+        with self._lock:
+            self._clients[client] -= 1
+            if self._clients[client] <= 0:
+                del self._clients[client]
+
+    def render(self, client: str, job: RenderJob, timeout: float | None = None):
+        """Submit ``job`` and wait for it; returns the result and whether it was shared."""
+        future, shared = self.submit(client, job)
+        try:
+            return future.result(timeout=timeout), shared
+        finally:
+            self.release(client)
+
+    def _finish(self, job: RenderJob):
+        with self._lock:
+            self._in_flight.pop(job, None)
+            self.stats["finished"] += 1
+
+    def _run(self, job: RenderJob) -> RenderResult:
+        started = time.perf_counter()
+        session = self.load_session(*job.session_key)
+        error = validate_analysis_selection(job.selection)
+        if error:
+            raise ValueError(error)
+
+        if job.output == "png":
+            fig = self.render_figure(session, job.selection)
+            enforce_artist_budget(fig)
+            body = figure_to_png_bytes(fig)
+        else:
+            frame = prepare_dataset(session, job.selection)
+            if frame is None or frame.empty:
+                raise ValueError("No data is available for this analysis.")
+            body = (
+                dataframe_to_csv_bytes(frame)
+                if job.output == "csv"
+                else dataframe_to_parquet_bytes(frame)
+            )
+            if body is None:
+                raise ValueError("Parquet output needs pyarrow or fastparquet installed.")
+        return RenderResult(body, OUTPUT_TYPES[job.output], time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "capacity": self.capacity,
+                "active_clients": len(self._clients),
+                **self.stats,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
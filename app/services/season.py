@@ -0,0 +1,243 @@
+"""Persisted per-session driver summaries for season-wide dashboards."""
+from __future__ import annotations
+
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+from pathlib import Path
+
+import fastf1 as ff1
+import numpy as np
+import pandas as pd
+
+from app.services.sessions import CACHE_DIR
+from app.services.stint_pace import select_green_stint_laps
+
+
+SEASON_DB_PATH = Path(os.getenv("F1_SEASON_DB", CACHE_DIR / "season.sqlite"))
+SEASON_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+SESSION_NAMES = {"Q": "Qualifying", "Sprint": "Sprint", "R": "Race"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed_sessions (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    session_type TEXT NOT NULL,
+    event_name TEXT NOT NULL,
+    processed_at TEXT NOT NULL,
+    PRIMARY KEY (year, round, session_type)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS driver_summaries (
+    year INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    session_type TEXT NOT NULL,
+    event_name TEXT NOT NULL,
+    driver TEXT NOT NULL,
+    team TEXT,
+    position REAL,
+    grid_position REAL,
+    positions_gained REAL,
+    best_lap REAL,
+    gap_to_best REAL,
+    median_pace REAL,
+    pace_rank REAL,
+    teammate_gap REAL,
+    stints INTEGER,
+    mean_stint_laps REAL,
+    PRIMARY KEY (year, round, session_type, driver)
+) WITHOUT ROWID;
+"""
+
+_SUMMARY_COLUMNS = [
+    "year",
+    "round",
+    "session_type",
+    "event_name",
+    "driver",
+    "team",
+    "position",
+    "grid_position",
+    "positions_gained",
+    "best_lap",
+    "gap_to_best",
+    "median_pace",
+    "pace_rank",
+    "teammate_gap",
+    "stints",
+    "mean_stint_laps",
+]
+
+_SEASON_QUERY = """
+SELECT year AS Year, round AS Round, session_type AS SessionType,
+       event_name AS EventName, driver AS Driver, team AS Team,
+       position AS Position, grid_position AS GridPosition,
+       positions_gained AS PositionsGained, best_lap AS BestLap,
+       gap_to_best AS GapToBest, median_pace AS MedianPace,
+       pace_rank AS PaceRank, teammate_gap AS TeammateGap,
+       stints AS Stints, mean_stint_laps AS MeanStintLaps
+FROM driver_summaries
+WHERE year = ?
+ORDER BY round, session_type, position
+"""
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _gap_to_teammate(values: pd.Series, teams: pd.Series) -> pd.Series:
+    """Each value minus the best value among the rest of the driver's team."""
+    ranked = (
+        pd.DataFrame({"Value": values, "Team": teams})
+        .dropna(subset=["Value"])
+        .sort_values("Value")
+    )
+    by_team = ranked.groupby("Team")["Value"]
+    best = by_team.transform("first")
+    runner_up = by_team.transform(lambda team: team.iloc[1] if len(team) > 1 else np.nan)
+    other_best = np.where(ranked["Value"] == best, runner_up, best)
+    return (ranked["Value"] - other_best).reindex(values.index)
+
+
+def build_session_summary(session, session_type: str) -> pd.DataFrame:
+    results = session.results
+    summary = pd.DataFrame(
+        {
+            "driver": results["Abbreviation"].astype(str),
+            "team": results["TeamName"],
+            "position": pd.to_numeric(results["Position"], errors="coerce"),
+            "grid_position": pd.to_numeric(results.get("GridPosition"), errors="coerce"),
+        }
+    ).set_index("driver")
+
+    laps = session.laps.dropna(subset=["Driver", "LapTime"])
+    best_lap = laps.groupby("Driver")["LapTime"].min().dt.total_seconds()
+    summary["best_lap"] = best_lap
+    summary["gap_to_best"] = (best_lap / best_lap.min() - 1) * 100
+
+    if session_type == "Q":
+        summary["teammate_gap"] = _gap_to_teammate(summary["best_lap"], summary["team"])
+    else:
+        grid = summary["grid_position"].where(summary["grid_position"] > 0)
+        summary["positions_gained"] = grid - summary["position"]
+
+        green_laps = select_green_stint_laps(session.laps)
+        summary["median_pace"] = green_laps.groupby("Driver")["LapTimeSeconds"].median()
+        summary["pace_rank"] = summary["median_pace"].rank(method="min")
+        summary["teammate_gap"] = _gap_to_teammate(summary["median_pace"], summary["team"])
+
+        stints = session.laps.dropna(subset=["Driver", "Stint"]).groupby("Driver")["Stint"]
+        summary["stints"] = stints.nunique()
+        summary["mean_stint_laps"] = stints.size() / summary["stints"]
+
+    summary = summary.reset_index()
+    summary["year"] = int(session.event.year)
+    summary["round"] = int(session.event["RoundNumber"])
+    summary["session_type"] = session_type
+    summary["event_name"] = session.event["EventName"]
+    return summary.reindex(columns=_SUMMARY_COLUMNS)
+
+
+def summarize_session(year: int, round_number: int, session_type: str) -> pd.DataFrame:
+    """Process-pool worker: load one session's timing data and summarise it."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    ff1.Cache.enable_cache(str(CACHE_DIR))
+    session = ff1.get_session(year, round_number, session_type)
+    session.load(laps=True, telemetry=False, weather=False, messages=False)
+    return build_session_summary(session, session_type)
+
+
+def get_pending_sessions(
+    year: int, session_types=("Q", "R"), db_path: Path = SEASON_DB_PATH
+) -> list[tuple[int, int, str]]:
+    """Sessions of ``year`` that have taken place but are not persisted yet."""
+    with closing(_connect(db_path)) as conn:
+        processed = set(
+            conn.execute(
+                "SELECT year, round, session_type FROM processed_sessions WHERE year = ?",
+                (year,),
+            ).fetchall()
+        )
+
+    schedule = ff1.get_event_schedule(year, include_testing=False)
+    now = pd.Timestamp.now(tz="UTC")
+    pending = []
+    for _, event in schedule.iterrows():
+        for number in range(1, 6):
+            name = event.get(f"Session{number}")
+            date = pd.to_datetime(event.get(f"Session{number}DateUtc"), utc=True)
+            for session_type in session_types:
+                key = (year, int(event["RoundNumber"]), session_type)
+                if name == SESSION_NAMES[session_type] and date < now and key not in processed:
+                    pending.append(key)
+    return pending
+
+
+def save_session_summary(conn: sqlite3.Connection, summary: pd.DataFrame, key) -> None:
+    year, round_number, session_type = key
+    event_name = summary["event_name"].iloc[0] if not summary.empty else ""
+    with conn:
+        conn.execute(
+            "DELETE FROM driver_summaries WHERE year = ? AND round = ? AND session_type = ?",
+            key,
+        )
+        conn.executemany(
+            f"INSERT INTO driver_summaries ({', '.join(_SUMMARY_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_SUMMARY_COLUMNS))})",
+            summary.astype(object).where(summary.notna(), None).itertuples(index=False),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO processed_sessions VALUES (?, ?, ?, ?, datetime('now'))",
+            (year, round_number, session_type, event_name),
+        )
+
+
+def update_season(
+    year: int,
+    session_types=("Q", "R"),
+    max_workers: int = SEASON_WORKERS,
+    db_path: Path = SEASON_DB_PATH,
+) -> dict[tuple, str]:
+    """Summarise every finished session not yet persisted; returns failures.
+
+    Workers only load and summarise; this process is the single writer.
+    """
+    pending = get_pending_sessions(year, session_types, db_path)
+    errors = {}
+    if not pending:
+        return errors
+
+    with closing(_connect(db_path)) as conn, ProcessPoolExecutor(
+        max_workers=min(max_workers, len(pending))
+    ) as executor:
+        futures = {executor.submit(summarize_session, *key): key for key in pending}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                save_session_summary(conn, future.result(), key)
+            except Exception as exc:
+                errors[key] = str(exc)
+    return errors
+
+
+def get_season_summaries(year: int, db_path: Path = SEASON_DB_PATH) -> pd.DataFrame:
+    with closing(_connect(db_path)) as conn:
+        cursor = conn.execute(_SEASON_QUERY, (year,))
+        columns = [description[0] for description in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+
+if __name__ == "__main__":
+    import sys
+
+    season = int(sys.argv[1]) if len(sys.argv) > 1 else pd.Timestamp.now().year
+    print(f"Updating {SEASON_DB_PATH} for {season}...")
+    failures = update_season(season)
+    for failed, reason in failures.items():
+        print(f"Failed {failed}: {reason}")
+    print(f"Done: {len(get_season_summaries(season))} driver summaries stored.")
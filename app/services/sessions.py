@@ -1,16 +1,34 @@
 from __future__ import annotations
 
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import fastf1 as ff1
+from fastf1 import _api as ff1_api
 from fastf1 import plotting as ff1_plotting
 import pandas as pd
 import streamlit as st
 
+from app.services.historical import (
+    COMPOUND_COLORS,
+    HistoricalSession,
+    get_historical_events,
+    is_historical,
+    load_historical_session,
+)
+
+CACHE_DIR = Path(os.getenv("FASTF1_CACHE", "cache"))
+
 
 @st.cache_resource(show_spinner=False)
 def initialize_fastf1():
-    cache_dir = Path("cache")
+    cache_dir = CACHE_DIR
     cache_dir.mkdir(parents=True, exist_ok=True)
     ff1.Cache.enable_cache(str(cache_dir))
     ff1_plotting.setup_mpl(mpl_timedelta_support=True, color_scheme="fastf1")
@@ -18,17 +36,220 @@ def initialize_fastf1():
 
 @st.cache_data(show_spinner=False)
 def get_available_events(year: int) -> list[str]:
+    if is_historical(year):
+        return get_historical_events(year)
     initialize_fastf1()
     schedule = ff1.get_event_schedule(year)
     return schedule["EventName"].tolist()
 
 
+MAX_RESIDENT_SESSIONS = int(os.getenv("F1_MAX_SESSIONS", "6"))
+
+
+@dataclass
+class ResidentSession:
+    session: object
+    loaded_at: float
+    load_seconds: float
+    last_used: float
+    hits: int = 0
+    pinned: bool = False
+
+
+@dataclass
+class SessionStore:
+    """Loaded sessions shared by every user, least recently used evicted first.
+
+    Pinned sessions are never evicted automatically, so the store can hold
+    more than ``max_sessions`` when operators pin them.
+    """
+
+    max_sessions: int = MAX_RESIDENT_SESSIONS
+    _entries: OrderedDict = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _key_locks: dict = field(default_factory=dict)
+
+    def get_or_load(self, key: tuple, load):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return self._touch(key, entry)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same session wait for one load
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    return self._touch(key, entry)
+
+            started = time.perf_counter()
+            session = load()
+            now = time.time()
+            with self._lock:
+                self._entries[key] = ResidentSession(
+                    session, now, time.perf_counter() - started, now
+                )
+                self._key_locks.pop(key, None)
+                self._evict_overflow()
+        return session
+
+    def _touch(self, key: tuple, entry: ResidentSession):
+        entry.hits += 1
+        entry.last_used = time.time()
+        self._entries.move_to_end(key)
+        return entry.session
+
+    def _evict_overflow(self):
+        unpinned = [key for key, entry in self._entries.items() if not entry.pinned]
+        for key in unpinned[: max(0, len(self._entries) - self.max_sessions)]:
+            del self._entries[key]
+
+    def evict(self, key: tuple) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def pin(self, key: tuple, pinned: bool = True):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key].pinned = pinned
+            if not pinned:
+                self._evict_overflow()
+
+    def entries(self) -> dict[tuple, ResidentSession]:
+        with self._lock:
+            return dict(self._entries)
+
+
 @st.cache_resource(show_spinner=False)
-def get_session(year: int, event_name: str, session_type: str):
-    initialize_fastf1()
-    session = ff1.get_session(year, event_name, session_type)
+def get_session_store() -> SessionStore:
+    return SessionStore()
+
+
+COMPONENT_WORKERS = int(os.getenv("F1_COMPONENT_WORKERS", "4"))
+
+# Independent live-timing feeds behind ``Session.load``, by the FastF1 API
+# function that downloads and parses each of them
+SESSION_COMPONENTS = {
+    "timing": ("_extended_timing_data", "timing_app_data"),
+    "car_data": ("car_data",),
+    "position_data": ("position_data",),
+    "status": ("session_status_data", "track_status_data", "lap_count"),
+    "weather": ("weather_data",),
+    "messages": ("race_control_messages",),
+}
+
+_load_timings: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _component_functions() -> dict[str, tuple] | None:
+    """The FastF1 API functions behind each component, or ``None`` if any is gone."""
+    components = {}
+    for component, names in SESSION_COMPONENTS.items():
+        functions = tuple(getattr(ff1_api, name, None) for name in names)
+        if not all(callable(function) for function in functions):
+            return None
+        components[component] = functions
+    return components
+
+
+def fetch_component(api_path: str, functions: tuple) -> float:
+    """Thread-pool worker: download and parse one component into the FastF1 cache."""
+    started = time.perf_counter()
+    for function in functions:
+        try:
+            function(api_path)
+        except Exception:
+            # Session.load retries the feed and reports it
+            pass
+    return time.perf_counter() - started
+
+
+def _is_cached(cache_dir: Path, api_path: str, functions: tuple) -> bool:
+    # FastF1's parsed-data cache layout, checked without its helper that
+    # creates directories; if the layout changes, components are fetched again
+    directory = Path(cache_dir) / api_path.removeprefix("/static/")
+    return all((directory / f"{function.__name__}.ff1pkl").is_file() for function in functions)
+
+
+def load_session_components(session, max_workers: int = COMPONENT_WORKERS) -> dict[str, float]:
+    """``session.load()`` with its feeds fetched and parsed concurrently first.
+
+    Each worker thread fills FastF1's parsed-data cache for one component, so
+    the final ``load`` only joins cached pieces. Downloads overlap fully;
+    parsing shares the GIL. Without the cache or the API functions this is a
+    plain ``session.load()``. Returns seconds per component, plus
+    ``assemble`` for that final load.
+    """
+    # initialize_fastf1 enables the cache here; get_cache_info would walk all of it
+    components = _component_functions()
+    timings = {}
+    pending = {}
+    if CACHE_DIR.is_dir() and components and getattr(session, "f1_api_support", False):
+        pending = {
+            name: functions
+            for name, functions in components.items()
+            if not _is_cached(CACHE_DIR, session.api_path, functions)
+        }
+    if pending:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(pending)), thread_name_prefix="fastf1-load"
+        ) as executor:
+            futures = {
+                executor.submit(fetch_component, session.api_path, functions): name
+                for name, functions in pending.items()
+            }
+            for future in as_completed(futures):
+                timings[futures[future]] = future.result()
+
+    started = time.perf_counter()
     session.load()
-    return session
+    timings["assemble"] = time.perf_counter() - started
+    _load_timings[session] = timings
+    return timings
+
+
+def get_load_timings(session) -> dict[str, float]:
+    return _load_timings.get(session, {})
+
+
+def get_session(year: int, event_name: str, session_type: str):
+    def load():
+        if is_historical(year, session_type):
+            session = load_historical_session(year, event_name, session_type)
+            if session is not None:
+                return session
+        initialize_fastf1()
+        session = ff1.get_session(year, event_name, session_type)
+        load_session_components(session)
+        return session
+
+    return get_session_store().get_or_load((year, event_name, session_type), load)
+
+
+SESSION_LOAD_WORKERS = 3
+
+
+def load_sessions(requests, max_workers: int = SESSION_LOAD_WORKERS):
+    """Load ``(year, event_name, session_type)`` sessions concurrently.
+
+    Goes through :func:`get_session`, so already cached sessions return at
+    once. Returns the loaded sessions and the errors, both keyed by request.
+    """
+    requests = list(dict.fromkeys(requests))
+    sessions, errors = {}, {}
+    if not requests:
+        return sessions, errors
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as executor:
+        futures = {executor.submit(get_session, *request): request for request in requests}
+        for future in as_completed(futures):
+            request = futures[future]
+            try:
+                sessions[request] = future.result()
+            except Exception as exc:
+                errors[request] = exc
+    return sessions, errors
 
 
 def get_drivers_in_session(session) -> dict[str, str]:
@@ -54,6 +275,9 @@ def get_drivers_in_session(session) -> dict[str, str]:
 
 
 def get_team_color(session, driver_code: str) -> str:
+    if isinstance(session, HistoricalSession):
+        return session.driver_styles[driver_code]["color"]
+
     driver_info = session.get_driver(driver_code)
     if isinstance(driver_info, pd.DataFrame):
         driver_info = driver_info.iloc[0]
@@ -62,11 +286,27 @@ def get_team_color(session, driver_code: str) -> str:
 
 
 def get_driver_color(session, driver_code: str) -> str:
+    if isinstance(session, HistoricalSession):
+        return session.driver_styles[driver_code]["color"]
     return ff1_plotting.get_driver_color(driver_code, session=session)
 
 
+def get_driver_colors(session) -> dict[str, str]:
+    if isinstance(session, HistoricalSession):
+        return {driver: style["color"] for driver, style in session.driver_styles.items()}
+    return ff1_plotting.get_driver_color_mapping(session=session)
+
+
+def get_compound_colors(session) -> dict[str, str]:
+    if isinstance(session, HistoricalSession):
+        return COMPOUND_COLORS
+    return ff1_plotting.get_compound_mapping(session=session)
+
+
 def get_driver_style(session, driver_code: str, style=None) -> dict:
     style_keys = style or ["color", "linestyle"]
+    if isinstance(session, HistoricalSession):
+        return {key: session.driver_styles[driver_code][key] for key in style_keys}
     return ff1_plotting.get_driver_style(
         identifier=driver_code,
         style=style_keys,
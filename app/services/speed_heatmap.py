@@ -0,0 +1,155 @@
+"""Whole-session speed statistics binned along the track centreline."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.track_geometry import get_track_geometry
+
+
+BIN_LENGTH = 25.0
+SPEED_BUCKET = 2.0
+MAX_SPEED = 400.0
+CHUNK_SAMPLES = 250_000
+PERCENTILES = (10, 50, 90)
+
+
+@dataclass(frozen=True)
+class SpeedHeatmap:
+    bin_start: np.ndarray
+    bin_length: float
+    summary: pd.DataFrame
+    driver_mean: pd.DataFrame
+    driver_delta: pd.DataFrame
+
+    def to_frame(self) -> pd.DataFrame:
+        delta = self.driver_delta.T.add_prefix("Delta_")
+        return pd.concat([self.summary, delta.reset_index(drop=True)], axis=1)
+
+
+class _BinAccumulator:
+    """Running per-bin sums and a speed histogram; memory does not grow with samples."""
+
+    def __init__(self, bins: int, drivers: list[str]):
+        self.bins = bins
+        self.buckets = int(MAX_SPEED / SPEED_BUCKET)
+        self.drivers = {driver: row for row, driver in enumerate(drivers)}
+        self.count = np.zeros(bins)
+        self.total = np.zeros(bins)
+        self.total_sq = np.zeros(bins)
+        self.histogram = np.zeros(bins * self.buckets)
+        self.driver_total = np.zeros((len(drivers), bins))
+        self.driver_count = np.zeros((len(drivers), bins))
+
+    def add(self, driver: str, bin_index: np.ndarray, speed: np.ndarray):
+        bins = self.bins
+        self.count += np.bincount(bin_index, minlength=bins)
+        self.total += np.bincount(bin_index, weights=speed, minlength=bins)
+        self.total_sq += np.bincount(bin_index, weights=speed * speed, minlength=bins)
+
+        bucket = np.clip((speed / SPEED_BUCKET).astype(int), 0, self.buckets - 1)
+        self.histogram += np.bincount(
+            bin_index * self.buckets + bucket, minlength=bins * self.buckets
+        )
+
+        row = self.drivers[driver]
+        self.driver_total[row] += np.bincount(bin_index, weights=speed, minlength=bins)
+        self.driver_count[row] += np.bincount(bin_index, minlength=bins)
+
+    def percentile(self, percent: float) -> np.ndarray:
+        cumulative = np.cumsum(self.histogram.reshape(self.bins, self.buckets), axis=1)
+        target = self.count[:, None] * percent / 100.0
+        bucket = np.argmax(cumulative >= np.maximum(target, 1e-9), axis=1)
+        return np.where(self.count > 0, (bucket + 0.5) * SPEED_BUCKET, np.nan)
+
+
+def _driver_samples(pos_data, car_data, driver_laps):
+    """Yield (X, Y, speed) chunks of position samples restricted to the given laps."""
+    lap_starts = driver_laps["LapStartTime"].dt.total_seconds().to_numpy()
+    lap_ends = driver_laps["Time"].dt.total_seconds().to_numpy()
+    car_seconds = car_data["SessionTime"].dt.total_seconds().to_numpy()
+    car_speed = car_data["Speed"].to_numpy(dtype=float)
+
+    for start in range(0, len(pos_data), CHUNK_SAMPLES):
+        chunk = pos_data.iloc[start:start + CHUNK_SAMPLES]
+        seconds = chunk["SessionTime"].dt.total_seconds().to_numpy()
+        lap_position = np.searchsorted(lap_starts, seconds, side="right") - 1
+        on_lap = lap_position >= 0
+        on_lap[on_lap] &= seconds[on_lap] <= lap_ends[lap_position[on_lap]]
+        if "Status" in chunk.columns:
+            on_lap &= chunk["Status"].to_numpy() == "OnTrack"
+        if not on_lap.any():
+            continue
+
+        seconds = seconds[on_lap]
+        yield (
+            chunk["X"].to_numpy(dtype=float)[on_lap],
+            chunk["Y"].to_numpy(dtype=float)[on_lap],
+            np.interp(seconds, car_seconds, car_speed),
+        )
+
+
+def build_speed_heatmap(session, laps: pd.DataFrame, geometry) -> SpeedHeatmap:
+    laps = laps.dropna(subset=["DriverNumber", "LapStartTime", "Time"])
+    drivers = sorted(laps["Driver"].astype(str).unique().tolist())
+    bins = int(np.ceil(geometry.length / BIN_LENGTH)) + 1
+    accumulator = _BinAccumulator(bins, drivers)
+
+    for driver_number, driver_laps in laps.groupby("DriverNumber", sort=True):
+        pos_data = session.pos_data.get(str(driver_number))
+        car_data = session.car_data.get(str(driver_number))
+        if pos_data is None or car_data is None or pos_data.empty or car_data.empty:
+            continue
+
+        driver = str(driver_laps["Driver"].iloc[0])
+        driver_laps = driver_laps.sort_values("LapStartTime")
+        for x, y, speed in _driver_samples(pos_data, car_data, driver_laps):
+            distance = geometry.snap(x, y)
+            bin_index = np.minimum((distance // BIN_LENGTH).astype(int), bins - 1)
+            accumulator.add(driver, bin_index, speed)
+
+    if not accumulator.count.any():
+        raise ValueError("No position telemetry is available for a speed heatmap.")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = accumulator.total / accumulator.count
+        variance = accumulator.total_sq / accumulator.count - mean**2
+        driver_mean = accumulator.driver_total / accumulator.driver_count
+
+    bin_start = np.arange(bins) * BIN_LENGTH
+    summary = pd.DataFrame(
+        {
+            "BinStart": bin_start,
+            "Samples": accumulator.count.astype(int),
+            "MeanSpeed": mean,
+            "SpeedVariance": np.clip(variance, 0, None),
+        }
+    )
+    for percent in PERCENTILES:
+        summary[f"P{percent}Speed"] = accumulator.percentile(percent)
+
+    driver_mean = pd.DataFrame(driver_mean, index=drivers, columns=bin_start)
+    driver_mean = driver_mean.dropna(how="all")
+    # Session best per bin is the fastest driver's average through it
+    driver_delta = driver_mean - driver_mean.max(axis=0)
+
+    return SpeedHeatmap(
+        bin_start=bin_start,
+        bin_length=BIN_LENGTH,
+        summary=summary,
+        driver_mean=driver_mean,
+        driver_delta=driver_delta,
+    )
+
+
+@session_cache("speed_heatmap")
+def get_speed_heatmap(session, drivers: tuple[str, ...] = ()) -> SpeedHeatmap:
+    laps = session.laps
+    if "IsAccurate" in laps.columns:
+        laps = laps[laps["IsAccurate"].fillna(False).astype(bool)]
+    if drivers:
+        laps = laps[laps["Driver"].isin(drivers)]
+    return build_speed_heatmap(session, laps, get_track_geometry(session))
@@ -0,0 +1,156 @@
+"""Fuel-corrected tyre degradation fits for every stint in a session."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+from app.services.lap_classes import LAP_FILTERS, get_classified_laps
+
+
+DEFAULT_START_FUEL_KG = 100.0
+DEFAULT_SECONDS_PER_KG = 0.03
+MIN_STINT_LAPS = 3
+
+
+@dataclass(frozen=True)
+class StintPace:
+    laps: pd.DataFrame
+    stints: pd.DataFrame
+    compounds: pd.DataFrame
+
+
+def select_green_stint_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    """Laps usable for pace modelling: timed, green flag and not pit in/out."""
+    laps = laps.dropna(subset=["Driver", "Stint", "Compound", "TyreLife", "LapTime"])
+    track_status = laps["TrackStatus"].fillna("").astype(str)
+    usable = (
+        laps["PitInTime"].isna()
+        & laps["PitOutTime"].isna()
+        & (laps["LapNumber"] > 1)
+        & (track_status.str.strip("1") == "")
+    )
+    if "Deleted" in laps.columns:
+        usable &= ~laps["Deleted"].fillna(False).astype(bool)
+
+    selected = laps.loc[usable]
+    return pd.DataFrame(
+        {
+            "Driver": selected["Driver"].astype(str),
+            "Team": selected["Team"],
+            "Stint": selected["Stint"].astype(int),
+            "Compound": selected["Compound"].astype(str),
+            "LapNumber": selected["LapNumber"].astype(int),
+            "TyreLife": selected["TyreLife"].astype(float),
+            "LapTimeSeconds": selected["LapTime"].dt.total_seconds(),
+        }
+    ).reset_index(drop=True)
+
+
+def fit_stint_pace(
+    laps: pd.DataFrame,
+    total_laps: int,
+    start_fuel_kg: float = DEFAULT_START_FUEL_KG,
+    seconds_per_kg: float = DEFAULT_SECONDS_PER_KG,
+) -> StintPace:
+    laps = laps.copy()
+    burn_per_lap = start_fuel_kg / max(total_laps, 1)
+    fuel_on_board = np.clip(start_fuel_kg - burn_per_lap * (laps["LapNumber"] - 1), 0, None)
+    laps["FuelCorrectedSeconds"] = laps["LapTimeSeconds"] - seconds_per_kg * fuel_on_board
+
+    keys = ["Driver", "Stint", "Compound"]
+    group = laps.groupby(keys, sort=True).ngroup().to_numpy()
+    groups = int(group.max()) + 1 if len(group) else 0
+    x = laps["TyreLife"].to_numpy(dtype=float)
+    y = laps["FuelCorrectedSeconds"].to_numpy(dtype=float)
+
+    # Normal equations for y = a + b * x, stacked for every stint and solved at once
+    n = np.bincount(group, minlength=groups).astype(float)
+    sx = np.bincount(group, weights=x, minlength=groups)
+    sy = np.bincount(group, weights=y, minlength=groups)
+    sxx = np.bincount(group, weights=x * x, minlength=groups)
+    sxy = np.bincount(group, weights=x * y, minlength=groups)
+
+    lhs = np.stack([np.stack([n, sx], axis=-1), np.stack([sx, sxx], axis=-1)], axis=-2)
+    rhs = np.stack([sy, sxy], axis=-1)
+    determinant = n * sxx - sx * sx
+    solvable = (n >= MIN_STINT_LAPS) & (determinant > 1e-9)
+    lhs[~solvable] = np.eye(2)
+    coefficients = np.linalg.solve(lhs, rhs[..., None])[..., 0]
+    coefficients[~solvable] = np.nan
+    intercept, slope = coefficients[:, 0], coefficients[:, 1]
+
+    residuals = y - (intercept[group] + slope[group] * x)
+    residual_std = np.sqrt(
+        np.bincount(group, weights=np.nan_to_num(residuals) ** 2, minlength=groups)
+        / np.maximum(n - 2, 1)
+    )
+
+    stints = (
+        laps.groupby(keys, sort=True)
+        .agg(
+            Team=("Team", "first"),
+            Laps=("LapNumber", "size"),
+            FirstLap=("LapNumber", "min"),
+            LastLap=("LapNumber", "max"),
+            MeanCorrectedSeconds=("FuelCorrectedSeconds", "mean"),
+        )
+        .reset_index()
+    )
+    stints["DegradationPerLap"] = slope
+    stints["CorrectedPace"] = intercept + slope
+    stints["ResidualStd"] = np.where(solvable, residual_std, np.nan)
+
+    fitted = stints.dropna(subset=["DegradationPerLap"])
+    weighted = fitted.assign(
+        WeightedDegradation=fitted["DegradationPerLap"] * fitted["Laps"],
+        WeightedPace=fitted["CorrectedPace"] * fitted["Laps"],
+    )
+    compounds = weighted.groupby("Compound").agg(
+        Stints=("Stint", "size"),
+        Laps=("Laps", "sum"),
+        WeightedDegradation=("WeightedDegradation", "sum"),
+        WeightedPace=("WeightedPace", "sum"),
+        MedianCorrectedPace=("CorrectedPace", "median"),
+    )
+    compounds["DegradationPerLap"] = compounds["WeightedDegradation"] / compounds["Laps"]
+    compounds["CorrectedPace"] = compounds["WeightedPace"] / compounds["Laps"]
+    compounds = (
+        compounds.drop(columns=["WeightedDegradation", "WeightedPace"])
+        .sort_values("CorrectedPace")
+        .reset_index()
+    )
+
+    return StintPace(laps=laps, stints=stints, compounds=compounds)
+
+
+def get_total_laps(session) -> int:
+    total_laps = getattr(session, "total_laps", None)
+    if total_laps:
+        return int(total_laps)
+    return int(session.laps["LapNumber"].max())
+
+
+@session_cache("stint_laps")
+def get_stint_laps(session, lap_filter: str | None = None) -> pd.DataFrame:
+    classes = LAP_FILTERS.get(lap_filter)
+    if classes is None:
+        return select_green_stint_laps(session.laps)
+
+    laps = get_classified_laps(session)
+    return select_green_stint_laps(laps[laps["LapClass"].isin(classes)])
+
+
+@session_cache("stint_pace")
+def get_stint_pace(
+    session,
+    start_fuel_kg: float = DEFAULT_START_FUEL_KG,
+    seconds_per_kg: float = DEFAULT_SECONDS_PER_KG,
+    lap_filter: str | None = None,
+) -> StintPace:
+    laps = get_stint_laps(session, lap_filter)
+    if laps.empty:
+        raise ValueError("No green-flag stint laps are available for pace modelling.")
+    return fit_stint_pace(laps, get_total_laps(session), start_fuel_kg, seconds_per_kg)
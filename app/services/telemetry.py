@@ -0,0 +1,78 @@
+"""Session-wide telemetry indexed by driver, lap and lap distance."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from app.services.cache import session_cache
+
+
+CAR_CHANNELS = ["Speed", "RPM", "nGear", "Throttle", "Brake", "DRS"]
+
+# Lap keys are LapIndex * LAP_KEY_STRIDE + Distance; no lap is 100 km long, so
+# the key is globally sorted and one searchsorted can address any lap/distance.
+LAP_KEY_STRIDE = 100_000.0
+
+
+def _index_driver_car_data(car_data: pd.DataFrame, driver_laps: pd.DataFrame) -> pd.DataFrame:
+    lap_starts = driver_laps["LapStartTime"].dt.total_seconds().to_numpy()
+    lap_ends = driver_laps["Time"].dt.total_seconds().to_numpy()
+    session_seconds = car_data["SessionTime"].dt.total_seconds().to_numpy()
+
+    lap_position = np.searchsorted(lap_starts, session_seconds, side="right") - 1
+    on_lap = lap_position >= 0
+    on_lap[on_lap] &= session_seconds[on_lap] <= lap_ends[lap_position[on_lap]]
+
+    session_seconds = session_seconds[on_lap]
+    lap_position = lap_position[on_lap]
+    speed = car_data["Speed"].to_numpy(dtype=float)[on_lap]
+
+    # Integrate speed like Telemetry.add_distance, restarting at every lap
+    new_lap = np.r_[True, lap_position[1:] != lap_position[:-1]]
+    step = np.diff(session_seconds, prepend=session_seconds[:1]) * speed / 3.6
+    step[new_lap] = 0.0
+    travelled = np.cumsum(step)
+    lap_origin = np.maximum.accumulate(np.where(new_lap, np.arange(len(step)), 0))
+    distance = travelled - travelled[lap_origin]
+
+    indexed = pd.DataFrame(
+        {
+            "LapNumber": driver_laps["LapNumber"].to_numpy()[lap_position].astype(int),
+            "SessionSeconds": session_seconds,
+            "Distance": distance,
+        }
+    )
+    for channel in CAR_CHANNELS:
+        if channel in car_data.columns:
+            indexed[channel] = car_data[channel].to_numpy()[on_lap]
+    return indexed
+
+
+def build_lap_telemetry(laps: pd.DataFrame, car_data: dict) -> pd.DataFrame:
+    laps = laps.dropna(subset=["DriverNumber", "LapNumber", "LapStartTime", "Time"])
+    frames = []
+    for driver_number, driver_laps in laps.groupby("DriverNumber", sort=True):
+        driver_car_data = car_data.get(str(driver_number))
+        if driver_car_data is None or driver_car_data.empty:
+            continue
+
+        driver_laps = driver_laps.sort_values("LapStartTime")
+        indexed = _index_driver_car_data(driver_car_data, driver_laps)
+        indexed.insert(0, "Driver", str(driver_laps["Driver"].iloc[0]))
+        frames.append(indexed)
+
+    if not frames:
+        raise ValueError("No car telemetry is available for this session.")
+
+    telemetry = pd.concat(frames, ignore_index=True)
+    telemetry["LapIndex"] = (
+        telemetry.groupby(["Driver", "LapNumber"], sort=False).ngroup().astype(np.int64)
+    )
+    telemetry["LapKey"] = telemetry["LapIndex"] * LAP_KEY_STRIDE + telemetry["Distance"]
+    return telemetry
+
+
+@session_cache("lap_telemetry")
+def get_lap_telemetry(session) -> pd.DataFrame:
+    """Every car-data sample of the session with its lap and lap distance."""
+    return build_lap_telemetry(session.laps, session.car_data)
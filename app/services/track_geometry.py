@@ -0,0 +1,240 @@
+"""Per-layout track geometry: rotated centreline, distance mapping and corners."""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from app.services.cache import session_cache
+from app.services.sessions import CACHE_DIR
+
+
+# Next to FastF1's cache unless set explicitly
+GEOMETRY_CACHE_DIR = Path(os.getenv("F1_GEOMETRY_CACHE_DIR", CACHE_DIR / "geometry"))
+RESAMPLE_STEP = 5.0
+
+_LAYOUTS: dict[str, TrackGeometry] = {}
+_LAYOUTS_LOCK = threading.Lock()
+_LAYOUT_KEY_LOCKS: dict[str, threading.Lock] = {}
+
+
+def _rotate(x, y, rotation: float) -> tuple[np.ndarray, np.ndarray]:
+    angle = np.deg2rad(rotation)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    return (
+        x * np.cos(angle) - y * np.sin(angle),
+        x * np.sin(angle) + y * np.cos(angle),
+    )
+
+
+@dataclass(frozen=True)
+class TrackGeometry:
+    """Centreline of one circuit layout, already rotated for display.
+
+    ``distance`` is in metres from the start/finish line and matches the
+    ``Distance`` channel of car telemetry. ``x``/``y`` use FastF1 position
+    units after rotation, so raw X/Y data goes through :meth:`rotate` first.
+    """
+
+    layout_key: str
+    rotation: float
+    distance: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    corners: pd.DataFrame
+    _tree: cKDTree = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_tree", cKDTree(np.column_stack([self.x, self.y])))
+
+    @property
+    def length(self) -> float:
+        return float(self.distance[-1])
+
+    def rotate(self, x, y) -> tuple[np.ndarray, np.ndarray]:
+        return _rotate(x, y, self.rotation)
+
+    def xy_at(self, distance) -> tuple[np.ndarray, np.ndarray]:
+        wrapped = np.mod(distance, self.length)
+        return np.interp(wrapped, self.distance, self.x), np.interp(
+            wrapped, self.distance, self.y
+        )
+
+    def snap(self, x, y, rotated: bool = False) -> np.ndarray:
+        """Track distance of each X/Y sample via a KD-tree nearest-point lookup."""
+        if not rotated:
+            x, y = self.rotate(x, y)
+        points = np.column_stack([x, y])
+        _, nearest = self._tree.query(points)
+
+        # Project onto the segment leaving the nearest centreline point
+        following = np.minimum(nearest + 1, len(self.distance) - 1)
+        segment = np.column_stack(
+            [self.x[following] - self.x[nearest], self.y[following] - self.y[nearest]]
+        )
+        offset = points - np.column_stack([self.x[nearest], self.y[nearest]])
+        segment_length = np.einsum("ij,ij->i", segment, segment)
+        fraction = np.clip(
+            np.einsum("ij,ij->i", offset, segment) / np.where(segment_length > 0, segment_length, 1),
+            0,
+            1,
+        )
+        return self.distance[nearest] + fraction * (
+            self.distance[following] - self.distance[nearest]
+        )
+
+    def save(self, path: Path):
+        """Write to a temporary file and swap it in, so readers never see a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.partial.npz")
+        np.savez_compressed(
+            partial,
+            layout_key=self.layout_key,
+            rotation=self.rotation,
+            distance=self.distance,
+            x=self.x,
+            y=self.y,
+            corner_label=self.corners["Corner"].to_numpy(dtype=str),
+            corner_distance=self.corners["Distance"].to_numpy(dtype=float),
+            corner_x=self.corners["X"].to_numpy(dtype=float),
+            corner_y=self.corners["Y"].to_numpy(dtype=float),
+        )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: Path) -> TrackGeometry:
+        with np.load(path) as data:
+            return cls(
+                layout_key=str(data["layout_key"]),
+                rotation=float(data["rotation"]),
+                distance=data["distance"],
+                x=data["x"],
+                y=data["y"],
+                corners=pd.DataFrame(
+                    {
+                        "Corner": data["corner_label"],
+                        "Distance": data["corner_distance"],
+                        "X": data["corner_x"],
+                        "Y": data["corner_y"],
+                    }
+                ),
+            )
+
+
+def _get_circuit_info(session):
+    try:
+        return session.get_circuit_info()
+    except Exception:
+        return None
+
+
+def get_layout_key(session, circuit_info=None) -> str:
+    try:
+        circuit = str(session.session_info["Meeting"]["Circuit"]["Key"])
+    except Exception:
+        circuit = str(session.event.get("Location", "unknown")).lower().replace(" ", "_")
+
+    # Corner positions are fixed per layout, so they tell layouts apart
+    signature = hashlib.sha1()
+    if circuit_info is not None:
+        corners = circuit_info.corners
+        signature.update(np.round(corners[["X", "Y"]].to_numpy(dtype=float)).tobytes())
+        signature.update(str(round(float(circuit_info.rotation), 1)).encode())
+    return f"{circuit}_{signature.hexdigest()[:10]}"
+
+
+def build_track_geometry(
+    reference_lap, circuit_info, layout_key: str, step: float = RESAMPLE_STEP
+) -> TrackGeometry:
+    position = reference_lap.get_pos_data()[["X", "Y"]].dropna()
+    if len(position) < 10:
+        raise ValueError("Not enough position data to build the track geometry.")
+
+    rotation = float(circuit_info.rotation) if circuit_info is not None else 0.0
+    x, y = _rotate(position["X"], position["Y"], rotation)
+
+    # Path length in position units, scaled to the lap's telemetry distance
+    path = np.r_[0.0, np.cumsum(np.hypot(np.diff(x), np.diff(y)))]
+    try:
+        lap_length = float(reference_lap.get_car_data().add_distance()["Distance"].iloc[-1])
+    except Exception:
+        lap_length = path[-1] / 10.0
+    path *= lap_length / path[-1]
+
+    keep = np.r_[True, np.diff(path) > 0]
+    distance = np.arange(0.0, path[keep][-1], step)
+    geometry = TrackGeometry(
+        layout_key=layout_key,
+        rotation=rotation,
+        distance=distance,
+        x=np.interp(distance, path[keep], x[keep]),
+        y=np.interp(distance, path[keep], y[keep]),
+        corners=pd.DataFrame(columns=["Corner", "Distance", "X", "Y"]),
+    )
+
+    if circuit_info is None or circuit_info.corners.empty:
+        return geometry
+
+    corners = circuit_info.corners
+    corner_x, corner_y = geometry.rotate(corners["X"], corners["Y"])
+    letters = corners["Letter"].fillna("").astype(str)
+    return replace(
+        geometry,
+        corners=pd.DataFrame(
+            {
+                "Corner": [
+                    f"{int(number)}{letter}"
+                    for number, letter in zip(corners["Number"], letters)
+                ],
+                "Distance": geometry.snap(corner_x, corner_y, rotated=True),
+                "X": corner_x,
+                "Y": corner_y,
+            }
+        ).sort_values("Distance", ignore_index=True),
+    )
+
+
+def _load_or_build_layout(session) -> TrackGeometry:
+    circuit_info = _get_circuit_info(session)
+    layout_key = get_layout_key(session, circuit_info)
+
+    with _LAYOUTS_LOCK:
+        geometry = _LAYOUTS.get(layout_key)
+        if geometry is not None:
+            return geometry
+        key_lock = _LAYOUT_KEY_LOCKS.setdefault(layout_key, threading.Lock())
+
+    # Only sessions of the same layout wait for its build
+    with key_lock:
+        with _LAYOUTS_LOCK:
+            geometry = _LAYOUTS.get(layout_key)
+        if geometry is not None:
+            return geometry
+
+        path = GEOMETRY_CACHE_DIR / f"{layout_key}.npz"
+        if path.exists():
+            geometry = TrackGeometry.load(path)
+        else:
+            reference_lap = session.laps.pick_fastest()
+            if reference_lap is None:
+                raise ValueError("No reference lap is available to build the track geometry.")
+            geometry = build_track_geometry(reference_lap, circuit_info, layout_key)
+            geometry.save(path)
+
+        with _LAYOUTS_LOCK:
+            _LAYOUTS[layout_key] = geometry
+            _LAYOUT_KEY_LOCKS.pop(layout_key, None)
+        return geometry
+
+
+@session_cache("track_geometry")
+def get_track_geometry(session) -> TrackGeometry:
+    """Geometry for the session's layout, built once and reused across sessions."""
+    return _load_or_build_layout(session)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import gc
+import os
+import tracemalloc
+
+import streamlit as st
+
+from app.services.cache import get_session_caches
+from app.services.diagnostics import (
+    get_cache_stats,
+    get_resident_sessions,
+    get_top_allocations,
+    process_rss_bytes,
+    start_tracing,
+    stop_tracing,
+)
+from app.services.sessions import get_session_store
+
+
+ADMIN_ENABLED = bool(os.getenv("F1_ADMIN"))
+
+
+def _session_label(key: tuple) -> str:
+    return f"{key[0]} {key[1]} {key[2]}"
+
+
+def render_session_actions(store):
+    keys = list(store.entries())
+    if not keys:
+        return
+    key = st.selectbox("Resident session", keys, format_func=_session_label)
+    pin_col, unpin_col, evict_col = st.columns(3)
+    if pin_col.button("Pin", use_container_width=True):
+        store.pin(key, True)
+        st.rerun()
+    if unpin_col.button("Unpin", use_container_width=True):
+        store.pin(key, False)
+        st.rerun()
+    if evict_col.button("Evict", use_container_width=True):
+        store.evict(key)
+        gc.collect()
+        st.rerun()
+
+
+def render_admin_page():
+    store = get_session_store()
+    rss = process_rss_bytes()
+    resident = get_resident_sessions(store)
+
+    metric_cols = st.columns(3)
+    metric_cols[0].metric("Process RSS", f"{rss / 1e6:,.0f} MB" if rss else "n/a")
+    metric_cols[1].metric("Resident Sessions", f"{len(resident)} / {store.max_sessions}")
+    metric_cols[2].metric(
+        "Session Tables", f"{resident['TotalMB'].sum():,.0f} MB" if not resident.empty else "0 MB"
+    )
+
+    st.markdown("#### Resident Sessions")
+    if resident.empty:
+        st.caption("No sessions are loaded.")
+    else:
+        st.dataframe(resident, hide_index=True, use_container_width=True)
+    render_session_actions(store)
+
+    st.markdown("#### Derived Data Caches")
+    st.dataframe(
+        get_cache_stats().style.format({"HitRate": "{:.0%}"}, na_rep="-"),
+        hide_index=True,
+        use_container_width=True,
+    )
+    if st.button("Clear Derived Caches"):
+        for cache in get_session_caches().values():
+            cache.evict()
+        gc.collect()
+        st.rerun()
+
+    st.markdown("#### Allocation Sites")
+    tracing = st.toggle("Trace allocations", value=tracemalloc.is_tracing())
+    if tracing and not tracemalloc.is_tracing():
+        start_tracing()
+    elif not tracing and tracemalloc.is_tracing():
+        stop_tracing()
+
+    if tracing:
+        traced, peak = tracemalloc.get_traced_memory()
+        st.caption(
+            f"Traced {traced / 1e6:,.0f} MB (peak {peak / 1e6:,.0f} MB); "
+            "changes are relative to the previous refresh."
+        )
+        st.dataframe(get_top_allocations(), hide_index=True, use_container_width=True)
+    else:
+        st.caption("Allocation tracing is off; allocations made before it starts are not traced.")
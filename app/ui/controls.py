@@ -3,6 +3,10 @@ from __future__ import annotations
 import streamlit as st
 
 from app.models.state import AnalysisSelection, DriverSelection, SessionSelection
+from app.plots.interactive import INTERACTIVE_CHARTS
+from app.services.corners import CORNER_METRICS, get_session_corners
+from app.services.historical import HISTORICAL_SESSION_TYPES, HistoricalSession, is_historical
+from app.services.lap_classes import LAP_FILTERS
 from app.utils.validation import RACE_ONLY_ANALYSES
 
 
@@ -12,7 +16,9 @@ def render_session_controls(get_available_events):
     event_name = st.selectbox("Grand Prix", events, label_visibility="collapsed")
     session_type = st.selectbox(
         "Session",
-        ["FP1", "FP2", "FP3", "Sprint", "Q", "R"],
+        HISTORICAL_SESSION_TYPES
+        if is_historical(year)
+        else ["FP1", "FP2", "FP3", "Sprint", "Q", "R"],
         label_visibility="collapsed",
     )
     return SessionSelection(year=year, event_name=event_name, session_type=session_type)
@@ -20,17 +26,15 @@ def render_session_controls(get_available_events):
 
 def render_driver_controls(drivers_info: dict[str, str]) -> DriverSelection:
     driver_names = list(drivers_info.keys())
-    driver1_name = st.selectbox(
-        "Driver 1", driver_names, label_visibility="collapsed"
+    selected_names = st.multiselect(
+        "Drivers", driver_names, default=driver_names[:2], label_visibility="collapsed"
     )
-    remaining_drivers = [name for name in driver_names if name != driver1_name]
-    driver2_name = st.selectbox(
-        "Driver 2", remaining_drivers, label_visibility="collapsed"
-    )
-    return DriverSelection(driver1_name=driver1_name, driver2_name=driver2_name)
+    return DriverSelection(driver_names=tuple(selected_names))
 
 
-def get_analysis_options(session_type: str) -> list[str]:
+def get_analysis_options(session_type: str, session=None) -> list[str]:
+    if isinstance(session, HistoricalSession):
+        return session.analysis_options()
     base_options = [
         "Lap Times",
         "Sector Comparison",
@@ -38,55 +42,97 @@ def get_analysis_options(session_type: str) -> list[str]:
         "Fastest Sectors",
         "Full Telemetry",
         "Corner-Annotated Speed Trace",
+        "Corner Comparison",
+        "Cross-Year Comparison",
         "Gear Shifts On Track",
         "Speed Map",
+        "Speed Heatmap",
+        "Season Overview",
         "Weather and Track Evolution",
     ]
     if session_type == "Q":
-        return base_options + ["Qualifying Overview"]
+        return base_options + ["Ideal Lap Leaderboard", "Qualifying Overview"]
     if session_type in {"Sprint", "R"}:
         return base_options + [
             "Lap Time Distribution",
+            "Overtakes and Battles",
+            "Pit Stop Analysis",
             "Position Changes",
+            "Race Trace",
+            "Stint Pace Model",
             "Team Pace Comparison",
             "Tyre Strategy",
         ]
     return base_options
 
 
+def render_dashboard_controls(
+    session, session_type: str, driver_codes: tuple[str, ...], analysis_options: list[str]
+) -> AnalysisSelection:
+    dashboard_analyses = tuple(
+        st.multiselect(
+            "Panels",
+            analysis_options,
+            default=analysis_options[:4],
+            label_visibility="collapsed",
+        )
+    )
+    st.caption("Panels use default settings and the first selected driver for track maps.")
+
+    corner = None
+    if "Corner Comparison" in dashboard_analyses:
+        try:
+            corner = get_session_corners(session)["Corner"].iloc[0]
+        except (ValueError, IndexError):
+            corner = None
+
+    generate_plot = st.button("Generate Dashboard", use_container_width=True)
+    return AnalysisSelection(
+        session_type=session_type,
+        analysis_type=dashboard_analyses[0] if dashboard_analyses else "",
+        driver_codes=driver_codes,
+        driver_for_map=driver_codes[0] if driver_codes else None,
+        use_fastest_laps=True,
+        driver_laps=(),
+        generate_plot=generate_plot,
+        corner=corner,
+        dashboard_analyses=dashboard_analyses,
+    )
+
+
 def render_analysis_controls(
     session,
     session_type: str,
     drivers_info: dict[str, str],
-    driver1_name: str,
-    driver2_name: str,
+    driver_names: tuple[str, ...],
     analysis_options: list[str],
 ) -> AnalysisSelection:
-    driver1_code = drivers_info[driver1_name]
-    driver2_code = drivers_info[driver2_name]
+    driver_codes = tuple(drivers_info[name] for name in driver_names)
+    if st.toggle("Dashboard Grid"):
+        return render_dashboard_controls(session, session_type, driver_codes, analysis_options)
+
     analysis_type = st.selectbox(
         "Analysis Type", analysis_options, label_visibility="collapsed"
     )
 
     use_fastest_laps = True
-    driver1_lap = None
-    driver2_lap = None
+    driver_laps = ()
     driver_for_map = None
 
     if analysis_type == "Fastest Sectors":
         use_fastest_laps = st.checkbox("Use Fastest Laps", value=True)
         if not use_fastest_laps:
-            laps_d1 = session.laps.pick_driver(driver1_code)["LapNumber"].dropna().astype(int)
-            laps_d2 = session.laps.pick_driver(driver2_code)["LapNumber"].dropna().astype(int)
-            driver1_lap = st.selectbox(
-                f"Lap ({driver1_code})",
-                laps_d1.tolist(),
-                label_visibility="collapsed",
-            )
-            driver2_lap = st.selectbox(
-                f"Lap ({driver2_code})",
-                laps_d2.tolist(),
-                label_visibility="collapsed",
+            laps = session.laps[session.laps["Driver"].isin(driver_codes)]
+            lap_numbers = laps.dropna(subset=["LapNumber"]).groupby("Driver")["LapNumber"]
+            driver_laps = tuple(
+                st.selectbox(
+                    f"Lap ({code})",
+                    lap_numbers.get_group(code).astype(int).tolist()
+                    if code in lap_numbers.groups
+                    else [],
+                    label_visibility="collapsed",
+                )
+                for code in driver_codes
             )
 
     if analysis_type in {
@@ -94,10 +140,60 @@ def render_analysis_controls(
         "Gear Shifts On Track",
         "Corner-Annotated Speed Trace",
     }:
-        selected_driver = st.radio(
-            "Driver Selection", [driver1_name, driver2_name], horizontal=True
+        selected_driver = st.radio("Driver Selection", driver_names, horizontal=True)
+        driver_for_map = drivers_info[selected_driver] if selected_driver else None
+
+    start_fuel_kg = 100.0
+    fuel_seconds_per_kg = 0.03
+    if analysis_type == "Stint Pace Model":
+        start_fuel_kg = st.slider("Start Fuel (kg)", 50.0, 110.0, 100.0, step=1.0)
+        fuel_seconds_per_kg = st.slider(
+            "Fuel Effect (s/kg)", 0.0, 0.06, 0.03, step=0.005, format="%.3f"
+        )
+
+    corner = None
+    corner_metric = "CornerTime"
+    if analysis_type == "Corner Comparison":
+        try:
+            corner_labels = get_session_corners(session)["Corner"].tolist()
+        except ValueError:
+            corner_labels = []
+        corner = st.selectbox("Corner", corner_labels, label_visibility="collapsed")
+        corner_metric = st.selectbox(
+            "Metric",
+            list(CORNER_METRICS),
+            format_func=CORNER_METRICS.get,
+            label_visibility="collapsed",
         )
-        driver_for_map = drivers_info[selected_driver]
+
+    lap_filter = "All Pace Laps"
+    if analysis_type in {"Lap Time Distribution", "Stint Pace Model", "Team Pace Comparison"}:
+        lap_filter = st.selectbox(
+            "Lap Filter", list(LAP_FILTERS), label_visibility="collapsed"
+        )
+
+    compare_years = ()
+    if analysis_type == "Cross-Year Comparison":
+        current_year = int(session.event.year)
+        compare_years = tuple(
+            st.multiselect(
+                "Compare With Seasons",
+                list(range(current_year - 1, 2017, -1)),
+                default=list(range(current_year - 1, max(current_year - 4, 2017), -1)),
+                label_visibility="collapsed",
+            )
+        )
+
+    heatmap_drivers = ()
+    if analysis_type == "Speed Heatmap":
+        selected_names = st.multiselect(
+            "Drivers (all if empty)", list(drivers_info), label_visibility="collapsed"
+        )
+        heatmap_drivers = tuple(drivers_info[name] for name in selected_names)
+
+    interactive = False
+    if analysis_type in INTERACTIVE_CHARTS:
+        interactive = st.toggle("Interactive Chart")
 
     if analysis_type in RACE_ONLY_ANALYSES and session_type not in {"Sprint", "R"}:
         st.caption("This analysis is only available for race-like sessions.")
@@ -107,11 +203,17 @@ def render_analysis_controls(
     return AnalysisSelection(
         session_type=session_type,
         analysis_type=analysis_type,
-        driver1_code=driver1_code,
-        driver2_code=driver2_code,
+        driver_codes=driver_codes,
         driver_for_map=driver_for_map,
         use_fastest_laps=use_fastest_laps,
-        driver1_lap=driver1_lap,
-        driver2_lap=driver2_lap,
+        driver_laps=driver_laps,
         generate_plot=generate_plot,
+        start_fuel_kg=start_fuel_kg,
+        fuel_seconds_per_kg=fuel_seconds_per_kg,
+        corner=corner,
+        corner_metric=corner_metric,
+        heatmap_drivers=heatmap_drivers,
+        lap_filter=lap_filter,
+        compare_years=compare_years,
+        interactive=interactive,
     )
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import time
+
+import streamlit as st
+
+from app.plots.comparison import figure_to_png_bytes
+from app.services.dashboard import panel_selections, plan_inputs, render_panels
+from app.utils.validation import validate_analysis_selection
+
+
+DASHBOARD_COLUMNS = 2
+
+
+def render_dashboard(session, selection, render):
+    selections = panel_selections(selection)
+    if not selections:
+        st.info("Select at least one panel for the dashboard.")
+        return
+
+    shared = plan_inputs(panel.analysis_type for panel in selections)
+    status = st.empty()
+    status.caption(
+        f"Rendering {len(selections)} panels"
+        + (f", sharing {', '.join(shared)}" if shared else "")
+        + "..."
+    )
+
+    columns = st.columns(DASHBOARD_COLUMNS)
+    placeholders = {}
+    for index, panel in enumerate(selections):
+        with columns[index % DASHBOARD_COLUMNS]:
+            placeholders[panel.analysis_type] = st.empty()
+            placeholders[panel.analysis_type].info(f"{panel.analysis_type}: rendering...")
+
+    started = time.perf_counter()
+    slowest = 0.0
+    for result in render_panels(
+        session, selections, render, figure_to_png_bytes, validate_analysis_selection
+    ):
+        analysis = result.selection.analysis_type
+        slowest = max(slowest, result.seconds)
+        with placeholders[analysis].container():
+            st.markdown(f"**{analysis}**")
+            if result.error is not None:
+                st.error(f"Error generating plot: {result.error}")
+            else:
+                st.image(result.image, use_container_width=True)
+                st.caption(f"{result.seconds:.1f}s")
+
+    status.caption(
+        f"Rendered {len(selections)} panels in {time.perf_counter() - started:.1f}s "
+        f"(slowest panel {slowest:.1f}s)"
+    )
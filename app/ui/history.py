@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import streamlit as st
+
+from app.services.history import (
+    get_championship_standings,
+    get_circuit_results,
+    get_history_store,
+    get_pit_stop_history,
+    get_race_context,
+)
+
+
+def render_history_panel(session):
+    if get_history_store() is None:
+        return
+
+    year = int(session.event.year)
+    round_number = int(session.event.get("RoundNumber", 0) or 0)
+    race = get_race_context(year, round_number)
+
+    with st.expander("Historical Context", expanded=False):
+        if race is None:
+            st.info("This event is not in the local Ergast history store.")
+            return
+
+        standings_tab, circuit_tab, pit_tab = st.tabs(
+            ["Championship", "Past Results Here", "Pit Stop History"]
+        )
+
+        with standings_tab:
+            driver_standings, constructor_standings = get_championship_standings(
+                year, round_number - 1
+            )
+            if driver_standings.empty:
+                st.caption("No standings before this round.")
+            else:
+                st.caption(f"Standings before round {round_number}")
+                left, right = st.columns(2)
+                left.dataframe(driver_standings, hide_index=True, use_container_width=True)
+                right.dataframe(
+                    constructor_standings, hide_index=True, use_container_width=True
+                )
+
+        with circuit_tab:
+            past_results = get_circuit_results(int(race["circuit_id"]), year)
+            if past_results.empty:
+                st.caption(f"No earlier races at {race['circuit_name']}.")
+            else:
+                st.dataframe(past_results, hide_index=True, use_container_width=True)
+
+        with pit_tab:
+            pit_history = get_pit_stop_history(int(race["circuit_id"]), year)
+            if pit_history.empty:
+                st.caption("No pit stop data for earlier races at this circuit.")
+            else:
+                st.dataframe(pit_history, hide_index=True, use_container_width=True)
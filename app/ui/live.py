@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import streamlit as st
+
+from app.plots.comparison import figure_to_png_bytes
+from app.plots.live import plot_live_overview
+from app.services.live import LiveReplay
+
+
+LIVE_FILE = os.getenv("F1_LIVE_FILE", "")
+REFRESH_SECONDS = 1.0
+
+
+def _get_replay(path: str, speed: float) -> LiveReplay:
+    replay = st.session_state.get("live_replay")
+    if replay is None or replay.path != Path(path):
+        if replay is not None:
+            replay.close()
+        replay = LiveReplay(Path(path), speed=speed)
+        st.session_state["live_replay"] = replay
+        st.session_state["live_figure"] = None
+    replay.speed = speed
+    return replay
+
+
+def render_live_controls():
+    path = st.text_input(
+        "Recorded live-timing file",
+        value=LIVE_FILE,
+        placeholder="Recorded live-timing file",
+        label_visibility="collapsed",
+    )
+    speed = st.select_slider("Replay speed", options=[1, 2, 5, 10, 30, 60], value=10)
+    restart = st.button("Restart Replay", use_container_width=True)
+    return path, float(speed), restart
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def render_live_replay(path: str, speed: float):
+    replay = _get_replay(path, speed)
+    completed_laps = replay.advance()
+
+    # Only redraw when a lap finished; other ticks reuse the last image
+    if completed_laps or st.session_state.get("live_figure") is None:
+        try:
+            fig = plot_live_overview(replay.state, title=replay.path.stem)
+        except ValueError as exc:
+            st.info(str(exc))
+        else:
+            st.session_state["live_figure"] = figure_to_png_bytes(fig)
+
+    if st.session_state.get("live_figure") is not None:
+        st.image(st.session_state["live_figure"], use_container_width=True)
+
+    status = "finished" if replay.finished else f"{replay.replay_seconds:,.0f}s replayed"
+    st.caption(
+        f"{replay.messages:,} messages, {len(replay.state.laps):,} laps - {status} - "
+        f"last update {replay.last_update_seconds * 1000:.1f} ms"
+    )
+    laps = replay.state.laps
+    if not laps.empty:
+        latest = laps.drop_duplicates("DriverNumber", keep="last").sort_values("Position")
+        st.dataframe(
+            latest[
+                [
+                    "Position",
+                    "Driver",
+                    "LapNumber",
+                    "LapTime",
+                    "GapToLeader",
+                    "Interval",
+                    "Compound",
+                    "TyreLife",
+                ]
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+def render_live_mode():
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.markdown("### Live Replay")
+        path, speed, restart = render_live_controls()
+
+    with col2:
+        if not path:
+            st.info("Enter the path of a live-timing recording to replay.")
+            return
+        if not Path(path).is_file():
+            st.error(f"Recording not found: {path}")
+            return
+        if restart and "live_replay" in st.session_state:
+            st.session_state.pop("live_replay").close()
+        render_live_replay(path, speed)
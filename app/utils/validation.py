@@ -5,13 +5,25 @@ from app.models.state import AnalysisSelection
 
 RACE_ONLY_ANALYSES = {
     "Lap Time Distribution",
+    "Overtakes and Battles",
+    "Pit Stop Analysis",
     "Position Changes",
+    "Race Trace",
+    "Stint Pace Model",
     "Team Pace Comparison",
     "Tyre Strategy",
 }
 
 QUALIFYING_ONLY_ANALYSES = {"Qualifying Overview"}
 
+DRIVER_COMPARISON_ANALYSES = {
+    "Lap Times",
+    "Sector Comparison",
+    "Fastest Lap",
+    "Fastest Sectors",
+    "Full Telemetry",
+}
+
 
 def validate_analysis_selection(selection: AnalysisSelection) -> str | None:
     if (
@@ -26,6 +38,12 @@ def validate_analysis_selection(selection: AnalysisSelection) -> str | None:
     ):
         return "This analysis is only available for Qualifying sessions."
 
+    if (
+        selection.analysis_type in DRIVER_COMPARISON_ANALYSES
+        and len(selection.driver_codes) < 2
+    ):
+        return "Please select at least two drivers to compare."
+
     if (
         selection.analysis_type
         in {"Speed Map", "Gear Shifts On Track", "Corner-Annotated Speed Trace"}
@@ -33,8 +51,11 @@ def validate_analysis_selection(selection: AnalysisSelection) -> str | None:
     ):
         return "Please select a driver for this single-driver track analysis."
 
+    if selection.analysis_type == "Corner Comparison" and not selection.corner:
+        return "No corner information is available for this circuit."
+
     if selection.analysis_type == "Fastest Sectors" and not selection.use_fastest_laps:
-        if selection.driver1_lap is None or selection.driver2_lap is None:
-            return "Please choose a lap for both drivers."
+        if any(lap is None for lap in selection.driver_laps):
+            return "Please choose a lap for every selected driver."
 
     return None
@@ -1,11 +1,270 @@
+import argparse
+import hashlib
+import io
 import os
+import re
+import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import pandas as pd
 import psycopg2
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
+CHUNK_SIZE = int(os.getenv("LOADER_CHUNK_SIZE", "100000"))
+MAX_WORKERS = int(os.getenv("LOADER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Ergast CSV layout: source file, tables it references and explicit dtypes for
+# every column so chunks never need type inference. Dates and times are kept
+# as strings and parsed by PostgreSQL during COPY.
+TABLE_SPECS = {
+    "seasons": {
+        "file": "data/seasons.csv",
+        "key": ["year"],
+        "depends_on": [],
+        "dtypes": {"year": "Int64", "url": "string"},
+    },
+    "circuits": {
+        "file": "data/circuits.csv",
+        "key": ["circuit_id"],
+        "depends_on": [],
+        "serial": "circuit_id",
+        "dtypes": {
+            "circuitId": "Int64",
+            "circuitRef": "string",
+            "name": "string",
+            "location": "string",
+            "country": "string",
+            "lat": "float64",
+            "lng": "float64",
+            "alt": "Int64",
+            "url": "string",
+        },
+    },
+    "constructors": {
+        "file": "data/constructors.csv",
+        "key": ["constructor_id"],
+        "depends_on": [],
+        "serial": "constructor_id",
+        "dtypes": {
+            "constructorId": "Int64",
+            "constructorRef": "string",
+            "name": "string",
+            "nationality": "string",
+            "url": "string",
+        },
+    },
+    "drivers": {
+        "file": "data/drivers.csv",
+        "key": ["driver_id"],
+        "depends_on": [],
+        "serial": "driver_id",
+        "dtypes": {
+            "driverId": "Int64",
+            "driverRef": "string",
+            "number": "Int64",
+            "code": "string",
+            "forename": "string",
+            "surname": "string",
+            "dob": "string",
+            "nationality": "string",
+            "url": "string",
+        },
+    },
+    "status": {
+        "file": "data/status.csv",
+        "key": ["status_id"],
+        "depends_on": [],
+        "serial": "status_id",
+        "dtypes": {"statusId": "Int64", "status": "string"},
+    },
+    "races": {
+        "file": "data/races.csv",
+        "key": ["race_id"],
+        "depends_on": ["seasons", "circuits"],
+        "serial": "race_id",
+        "dtypes": {
+            "raceId": "Int64",
+            "year": "Int64",
+            "round": "Int64",
+            "circuitId": "Int64",
+            "name": "string",
+            "date": "string",
+            "time": "string",
+            "url": "string",
+            "fp1_date": "string",
+            "fp1_time": "string",
+            "fp2_date": "string",
+            "fp2_time": "string",
+            "fp3_date": "string",
+            "fp3_time": "string",
+            "quali_date": "string",
+            "quali_time": "string",
+            "sprint_date": "string",
+            "sprint_time": "string",
+        },
+    },
+    "constructor_results": {
+        "file": "data/constructor_results.csv",
+        "key": ["constructor_results_id"],
+        "depends_on": ["races", "constructors"],
+        "serial": "constructor_results_id",
+        "dtypes": {
+            "constructorResultsId": "Int64",
+            "raceId": "Int64",
+            "constructorId": "Int64",
+            "points": "float64",
+            "status": "string",
+        },
+    },
+    "constructor_standings": {
+        "file": "data/constructor_standings.csv",
+        "key": ["constructor_standings_id"],
+        "depends_on": ["races", "constructors"],
+        "serial": "constructor_standings_id",
+        "dtypes": {
+            "constructorStandingsId": "Int64",
+            "raceId": "Int64",
+            "constructorId": "Int64",
+            "points": "float64",
+            "position": "Int64",
+            "positionText": "string",
+            "wins": "Int64",
+        },
+    },
+    "driver_standings": {
+        "file": "data/driver_standings.csv",
+        "key": ["driver_standings_id"],
+        "depends_on": ["races", "drivers"],
+        "serial": "driver_standings_id",
+        "dtypes": {
+            "driverStandingsId": "Int64",
+            "raceId": "Int64",
+            "driverId": "Int64",
+            "points": "float64",
+            "position": "Int64",
+            "positionText": "string",
+            "wins": "Int64",
+        },
+    },
+    "qualifying": {
+        "file": "data/qualifying.csv",
+        "key": ["qualify_id"],
+        "depends_on": ["races", "drivers", "constructors"],
+        "serial": "qualify_id",
+        "dtypes": {
+            "qualifyId": "Int64",
+            "raceId": "Int64",
+            "driverId": "Int64",
+            "constructorId": "Int64",
+            "number": "Int64",
+            "position": "Int64",
+            "q1": "string",
+            "q2": "string",
+            "q3": "string",
+        },
+    },
+    "results": {
+        "file": "data/results.csv",
+        "key": ["result_id"],
+        "depends_on": ["races", "drivers", "constructors", "status"],
+        "serial": "result_id",
+        "dtypes": {
+            "resultId": "Int64",
+            "raceId": "Int64",
+            "driverId": "Int64",
+            "constructorId": "Int64",
+            "number": "Int64",
+            "grid": "Int64",
+            "position": "Int64",
+            "positionText": "string",
+            "positionOrder": "Int64",
+            "points": "float64",
+            "laps": "Int64",
+            "time": "string",
+            "milliseconds": "Int64",
+            "fastestLap": "Int64",
+            "rank": "Int64",
+            "fastestLapTime": "string",
+            "fastestLapSpeed": "string",
+            "statusId": "Int64",
+        },
+    },
+    "lap_times": {
+        "file": "data/lap_times.csv",
+        "key": ["race_id", "driver_id", "lap"],
+        "depends_on": ["races", "drivers"],
+        "dtypes": {
+            "raceId": "Int64",
+            "driverId": "Int64",
+            "lap": "Int64",
+            "position": "Int64",
+            "time": "string",
+            "milliseconds": "Int64",
+        },
+    },
+    "pit_stops": {
+        "file": "data/pit_stops.csv",
+        "key": ["race_id", "driver_id", "stop"],
+        "depends_on": ["races", "drivers"],
+        "dtypes": {
+            "raceId": "Int64",
+            "driverId": "Int64",
+            "stop": "Int64",
+            "lap": "Int64",
+            "time": "string",
+            "duration": "string",
+            "milliseconds": "Int64",
+        },
+    },
+}
+
+# Secondary indexes are only built once the bulk load is done so COPY does not
+# have to maintain them row by row.
+POST_LOAD_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_races_year_round ON races (year, round)",
+    "CREATE INDEX IF NOT EXISTS idx_races_circuit ON races (circuit_id)",
+    "CREATE INDEX IF NOT EXISTS idx_results_driver ON results (driver_id)",
+    "CREATE INDEX IF NOT EXISTS idx_results_constructor ON results (constructor_id)",
+    "CREATE INDEX IF NOT EXISTS idx_qualifying_driver ON qualifying (driver_id)",
+    "CREATE INDEX IF NOT EXISTS idx_driver_standings_driver ON driver_standings (driver_id)",
+    "CREATE INDEX IF NOT EXISTS idx_lap_times_driver ON lap_times (driver_id)",
+    "CREATE INDEX IF NOT EXISTS idx_pit_stops_driver ON pit_stops (driver_id)",
+]
+
+# Ergast only ever appends to these files, so incremental loads fingerprint
+# them in fixed row blocks and resume from the first block that changed.
+APPEND_ONLY_TABLES = {"lap_times", "results", "pit_stops"}
+BLOCK_ROWS = int(os.getenv("LOADER_BLOCK_ROWS", "50000"))
+
+LOAD_STATE_DDL = """
+CREATE TABLE IF NOT EXISTS etl_load_state (
+    table_name VARCHAR(255) PRIMARY KEY,
+    file_sha256 CHAR(64) NOT NULL,
+    row_count BIGINT NOT NULL,
+    block_rows INT NOT NULL,
+    block_hashes TEXT[] NOT NULL,
+    loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+# Foreign keys dropped for a bulk load, kept until they are back and validated
+# so a failed or interrupted load can still restore them on the next run
+SAVED_FOREIGN_KEYS_DDL = """
+CREATE TABLE IF NOT EXISTS etl_foreign_keys (
+    table_name VARCHAR(255) NOT NULL,
+    constraint_name VARCHAR(255) NOT NULL,
+    definition TEXT NOT NULL,
+    PRIMARY KEY (table_name, constraint_name)
+)
+"""
+
+
+def to_column_name(csv_column):
+    # Ergast CSVs use camelCase (raceId), the schema uses snake_case (race_id)
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", csv_column).lower()
+
 
 def test_connection():
     load_dotenv()
@@ -47,12 +306,7 @@ def wait_for_db(engine, max_attempts=5):
     return False
 
 
-def load_data():
-    # Test connection first
-    if not test_connection():
-        print("Failed to establish basic connection. Exiting...")
-        return
-
+def create_db_engine():
     # Load environment variables
     load_dotenv()
 
@@ -71,59 +325,443 @@ def load_data():
         f"Connection URL (without password): {connection_url.replace(db_params['password'], '****')}"
     )
 
-    engine = create_engine(connection_url, connect_args={"connect_timeout": 10})
+    # One pooled connection per loader worker plus one for schema changes
+    return create_engine(
+        connection_url,
+        pool_size=MAX_WORKERS + 1,
+        connect_args={"connect_timeout": 10},
+    )
+
+
+def read_csv_chunks(table, file, skip_rows=0):
+    spec = TABLE_SPECS[table]
+    return pd.read_csv(
+        file,
+        dtype=spec["dtypes"],
+        usecols=list(spec["dtypes"]),
+        na_values=["\\N"],
+        keep_default_na=False,
+        skiprows=range(1, skip_rows + 1) if skip_rows else None,
+        chunksize=CHUNK_SIZE,
+    )
+
+
+def copy_chunk(cursor, table, chunk):
+    columns = ", ".join(to_column_name(column) for column in chunk.columns)
+    buffer = io.StringIO()
+    chunk.to_csv(buffer, index=False, header=False, na_rep="\\N")
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        buffer,
+    )
+
+
+def copy_table(engine, table, file):
+    started = time.perf_counter()
+    fingerprint = fingerprint_file(file)
+    rows = 0
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            for chunk in read_csv_chunks(table, file):
+                copy_chunk(cursor, table, chunk)
+                rows += len(chunk)
+            save_load_state(cursor, table, fingerprint)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return {
+        "table": table,
+        "rows": rows,
+        "bytes": os.path.getsize(file),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def fingerprint_file(file):
+    file_hash = hashlib.sha256()
+    block_hash = hashlib.sha256()
+    block_hashes = []
+    row_count = 0
+    with open(file, "rb") as handle:
+        file_hash.update(handle.readline())
+        for line in handle:
+            file_hash.update(line)
+            block_hash.update(line)
+            row_count += 1
+            if row_count % BLOCK_ROWS == 0:
+                block_hashes.append(block_hash.hexdigest())
+                block_hash = hashlib.sha256()
+    if row_count % BLOCK_ROWS:
+        block_hashes.append(block_hash.hexdigest())
+
+    return {
+        "file_sha256": file_hash.hexdigest(),
+        "row_count": row_count,
+        "block_hashes": block_hashes,
+    }
+
+
+def get_load_state(cursor, table):
+    cursor.execute(
+        "SELECT file_sha256, row_count, block_rows, block_hashes "
+        "FROM etl_load_state WHERE table_name = %s",
+        (table,),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return {
+        "file_sha256": row[0],
+        "row_count": row[1],
+        "block_rows": row[2],
+        "block_hashes": list(row[3]),
+    }
+
+
+def save_load_state(cursor, table, fingerprint):
+    cursor.execute(
+        """
+        INSERT INTO etl_load_state
+            (table_name, file_sha256, row_count, block_rows, block_hashes, loaded_at)
+        VALUES (%s, %s, %s, %s, %s, now())
+        ON CONFLICT (table_name) DO UPDATE SET
+            file_sha256 = EXCLUDED.file_sha256,
+            row_count = EXCLUDED.row_count,
+            block_rows = EXCLUDED.block_rows,
+            block_hashes = EXCLUDED.block_hashes,
+            loaded_at = EXCLUDED.loaded_at
+        """,
+        (
+            table,
+            fingerprint["file_sha256"],
+            fingerprint["row_count"],
+            BLOCK_ROWS,
+            fingerprint["block_hashes"],
+        ),
+    )
+
+
+def get_resume_row(table, state, fingerprint):
+    # None means the file is unchanged; otherwise the first data row to reload
+    if state is not None and state["file_sha256"] == fingerprint["file_sha256"]:
+        return None
+    if state is None or table not in APPEND_ONLY_TABLES or state["block_rows"] != BLOCK_ROWS:
+        return 0
+
+    unchanged_blocks = 0
+    for old_hash, new_hash in zip(state["block_hashes"], fingerprint["block_hashes"]):
+        if old_hash != new_hash:
+            break
+        unchanged_blocks += 1
+    return unchanged_blocks * BLOCK_ROWS
+
+
+def upsert_table(engine, table, file):
+    started = time.perf_counter()
+    spec = TABLE_SPECS[table]
+    fingerprint = fingerprint_file(file)
+    columns = [to_column_name(column) for column in spec["dtypes"]]
+    updates = [column for column in columns if column not in spec["key"]]
+    column_list = ", ".join(columns)
+    stage = f"stage_{table}"
+    rows = 0
+    changed = 0
+
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            skip_rows = get_resume_row(table, get_load_state(cursor, table), fingerprint)
+            if skip_rows is not None:
+                cursor.execute(
+                    f"CREATE TEMP TABLE {stage} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                for chunk in read_csv_chunks(table, file, skip_rows):
+                    copy_chunk(cursor, stage, chunk)
+                    rows += len(chunk)
+
+                # Only rows that are new or actually differ are written
+                cursor.execute(
+                    f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM {stage}
+                    ON CONFLICT ({", ".join(spec["key"])}) DO UPDATE SET
+                        {", ".join(f"{column} = EXCLUDED.{column}" for column in updates)}
+                    WHERE ({", ".join(f"{table}.{column}" for column in updates)})
+                        IS DISTINCT FROM
+                        ({", ".join(f"EXCLUDED.{column}" for column in updates)})
+                    """
+                )
+                changed = cursor.rowcount
+                save_load_state(cursor, table, fingerprint)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return {
+        "table": table,
+        "rows": rows,
+        "changed": changed,
+        "skipped": skip_rows is None,
+        "bytes": os.path.getsize(file) * rows / max(fingerprint["row_count"], 1),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def get_foreign_keys(conn, tables):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f' AND conrelid::regclass::text = ANY(%s)
+            """,
+            (list(tables),),
+        )
+        return cursor.fetchall()
+
+
+def save_foreign_keys(conn, tables):
+    """Record the live foreign keys of ``tables`` and return every saved one.
+
+    Keys saved by an earlier load that never restored them are included, as
+    they are no longer in ``pg_constraint``.
+    """
+    with conn.cursor() as cursor:
+        for table, name, definition in get_foreign_keys(conn, tables):
+            cursor.execute(
+                """
+                INSERT INTO etl_foreign_keys (table_name, constraint_name, definition)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (table_name, constraint_name) DO UPDATE SET
+                    definition = EXCLUDED.definition
+                """,
+                (table, name, re.sub(r"\s+NOT VALID$", "", definition)),
+            )
+        cursor.execute(
+            "SELECT table_name, constraint_name, definition FROM etl_foreign_keys "
+            "WHERE table_name = ANY(%s) ORDER BY table_name, constraint_name",
+            (list(tables),),
+        )
+        foreign_keys = cursor.fetchall()
+    conn.commit()
+    return foreign_keys
+
+
+def drop_foreign_keys(conn, foreign_keys):
+    with conn.cursor() as cursor:
+        for table, name, _ in foreign_keys:
+            cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+    conn.commit()
+
+
+def restore_foreign_keys(conn, foreign_keys, validate=True):
+    """Re-add saved foreign keys; unvalidated ones stay saved for the next load.
+
+    Over partly loaded tables ``validate=False`` adds them ``NOT VALID``, so
+    new rows are checked but missing parents do not block the restore.
+    """
+    with conn.cursor() as cursor:
+        for table, name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+            cursor.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+                + ("" if validate else " NOT VALID")
+            )
+            if validate:
+                cursor.execute(
+                    "DELETE FROM etl_foreign_keys "
+                    "WHERE table_name = %s AND constraint_name = %s",
+                    (table, name),
+                )
+    conn.commit()
+
+
+def finalize_tables(conn, tables):
+    with conn.cursor() as cursor:
+        for statement in POST_LOAD_INDEXES:
+            cursor.execute(statement)
+
+        # COPY writes explicit ids, so move SERIAL sequences past them
+        for table in tables:
+            serial = TABLE_SPECS[table].get("serial")
+            if serial:
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', '{serial}'), "
+                    f"COALESCE(MAX({serial}), 1)) FROM {table}"
+                )
+    conn.commit()
+
+    # ANALYZE cannot run inside a transaction block
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f"ANALYZE {table}")
+    conn.autocommit = False
+
+
+def run_in_dependency_order(tables, load_table):
+    """Load ``tables`` concurrently, each once the tables it references have loaded.
+
+    Returns the load stats and the failures by table; tables depending on a
+    failed table are not loaded and are reported as failures too.
+    """
+    pending = {table: set(TABLE_SPECS[table]["depends_on"]) & set(tables) for table in tables}
+    done = set()
+    failures = {}
+    stats = []
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        running = {}
+        while pending or running:
+            for table, deps in list(pending.items()):
+                failed_deps = deps & set(failures)
+                if failed_deps:
+                    del pending[table]
+                    failures[table] = f"skipped, depends on {', '.join(sorted(failed_deps))}"
+                    print(f"Skipping {table}: {failures[table]}")
+
+            ready = [table for table, deps in pending.items() if deps <= done]
+            for table in ready:
+                del pending[table]
+                running[executor.submit(load_table, table)] = table
+
+            if not running:
+                if not pending:
+                    break
+                raise RuntimeError(f"Unresolvable table dependencies: {sorted(pending)}")
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                table = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Error loading {table}: {str(e)}")
+                    print("Full error:", e.__class__.__name__)
+                    failures[table] = f"{e.__class__.__name__}: {e}"
+                    continue
+                done.add(table)
+                if result is not None:
+                    stats.append(result)
+
+    return stats, failures
+
+
+def print_throughput(stats):
+    print("\nLoad throughput:")
+    print(f"{'table':<24}{'rows':>12}{'seconds':>10}{'rows/s':>12}{'MB/s':>8}")
+    for item in sorted(stats, key=lambda entry: entry["seconds"], reverse=True):
+        seconds = max(item["seconds"], 1e-9)
+        print(
+            f"{item['table']:<24}{item['rows']:>12}{item['seconds']:>10.2f}"
+            f"{item['rows'] / seconds:>12.0f}{item['bytes'] / seconds / 1e6:>8.1f}"
+        )
+
+
+def load_data(incremental=False):
+    """Load every available CSV; returns whether all of them loaded."""
+    # Test connection first
+    if not test_connection():
+        print("Failed to establish basic connection. Exiting...")
+        return False
+
+    engine = create_db_engine()
 
     # Wait for database to be ready
     if not wait_for_db(engine):
         print("Could not connect to database after multiple attempts")
-        return
-
-    # Define loading order based on dependencies
-    data_files = {
-        "seasons": "data/seasons.csv",
-        "circuits": "data/circuits.csv",
-        "constructors": "data/constructors.csv",
-        "drivers": "data/drivers.csv",
-        "status": "data/status.csv",
-        "races": "data/races.csv",
-        "constructor_results": "data/constructor_results.csv",
-        "constructor_standings": "data/constructor_standings.csv",
-        "driver_standings": "data/driver_standings.csv",
-        "qualifying": "data/qualifying.csv",
-        "results": "data/results.csv",
-        "lap_times": "data/lap_times.csv",
-        "pit_stops": "data/pit_stops.csv",
-    }
+        return False
+
+    tables = []
+    for table, spec in TABLE_SPECS.items():
+        if os.path.exists(spec["file"]):
+            tables.append(table)
+        else:
+            print(f"Warning: {spec['file']} not found, skipping...")
+
+    admin_conn = engine.raw_connection()
+    try:
+        with admin_conn.cursor() as cursor:
+            cursor.execute(LOAD_STATE_DDL)
+            cursor.execute(SAVED_FOREIGN_KEYS_DDL)
+        admin_conn.commit()
+
+        started = time.perf_counter()
+        if incremental:
+            stats, failures = load_incremental(engine, tables)
+        else:
+            stats, failures = load_bulk(engine, admin_conn, tables)
+        finalize_tables(
+            admin_conn,
+            [item["table"] for item in stats if not item.get("skipped")],
+        )
+    finally:
+        admin_conn.close()
+
+    print_throughput(stats)
+    print(f"Total load time: {time.perf_counter() - started:.2f}s")
+
+    if failures:
+        print("\nFailed tables:")
+        for table, reason in sorted(failures.items()):
+            print(f"  {table}: {reason}")
+    return not failures
+
 
-    # Load into database in order
-    for table, file in data_files.items():
-        if os.path.exists(file):
-            print(f"\nProcessing {table}...")
-            try:
-                print(f"Reading {file}...")
-                df = pd.read_csv(file)
-                print(f"Found {len(df)} rows")
-
-                # Convert column names to lowercase
-                df.columns = df.columns.str.lower()
-                print(f"Columns: {', '.join(df.columns)}")
-
-                print(f"Loading {table} into database...")
-                df.to_sql(table, engine, if_exists="append", index=False)
-                print(f"Successfully loaded {table}!")
-
-                # Verify the data
-                result = pd.read_sql(f"SELECT COUNT(*) as count FROM {table}", engine)
-                print(f"Verified {result['count'].iloc[0]} rows in database")
-
-            except Exception as e:
-                print(f"Error loading {table}: {str(e)}")
-                print("Full error:", e.__class__.__name__)
-                if hasattr(e, "orig"):
-                    print("Original error:", e.orig)
+def load_bulk(engine, admin_conn, tables):
+    def load_table(table):
+        print(f"Loading {table} from {TABLE_SPECS[table]['file']}...")
+        result = copy_table(engine, table, TABLE_SPECS[table]["file"])
+        print(f"Successfully loaded {result['rows']} rows into {table}")
+        return result
+
+    # Foreign keys are checked once after the bulk load instead of per row
+    foreign_keys = save_foreign_keys(admin_conn, tables)
+    drop_foreign_keys(admin_conn, foreign_keys)
+    failures = None
+    try:
+        stats, failures = run_in_dependency_order(tables, load_table)
+    finally:
+        if failures == {}:
+            print("\nRestoring foreign keys and building indexes...")
+            restore_foreign_keys(admin_conn, foreign_keys)
         else:
-            print(f"Warning: {file} not found, skipping...")
+            print("\nSome tables failed; foreign keys are restored NOT VALID until a full reload.")
+            restore_foreign_keys(admin_conn, foreign_keys, validate=False)
+    return stats, failures
+
+
+def load_incremental(engine, tables):
+    def load_table(table):
+        result = upsert_table(engine, table, TABLE_SPECS[table]["file"])
+        if result["skipped"]:
+            print(f"{table} is unchanged, skipping...")
+        else:
+            print(
+                f"Staged {result['rows']} rows for {table}, "
+                f"{result['changed']} inserted or updated"
+            )
+        return result
+
+    # Foreign keys stay in place; dependency order keeps parents ahead of children
+    return run_in_dependency_order(tables, load_table)
 
 
 if __name__ == "__main__":
-    load_data()
+    parser = argparse.ArgumentParser(description="Load the Ergast CSVs into PostgreSQL.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only load new or changed rows, tracked in etl_load_state",
+    )
+    args = parser.parse_args()
+    sys.exit(0 if load_data(incremental=args.incremental) else 1)
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import cross_year
+
+
+def _session(year, event_name="Testville Grand Prix", location="Testville"):
+    lap = {"Driver": f"D{year % 100:02d}", "LapNumber": 12}
+    return SimpleNamespace(
+        event={"EventName": event_name, "Location": location},
+        laps=SimpleNamespace(pick_fastest=lambda: lap),
+    )
+
+
+@pytest.fixture
+def seasons(monkeypatch):
+    cross_year._cross_year_laps.clear()
+    available = {}
+    loads = []
+
+    def load_sessions(requests):
+        loads.append(list(requests))
+        sessions, errors = {}, {}
+        for request in requests:
+            session = available.get(request[0])
+            if isinstance(session, Exception):
+                errors[request] = session
+            else:
+                sessions[request] = session
+        return sessions, errors
+
+    geometry = SimpleNamespace(length=100.0)
+    monkeypatch.setattr(cross_year, "load_sessions", load_sessions)
+    monkeypatch.setattr(cross_year, "get_track_geometry", lambda session: geometry)
+    monkeypatch.setattr(
+        cross_year,
+        "align_lap_to_geometry",
+        lambda lap, geometry, distance: (np.full(len(distance), 250.0), distance / 50.0),
+    )
+    yield available, loads
+    cross_year._cross_year_laps.clear()
+
+
+def test_seasons_held_elsewhere_are_skipped(seasons):
+    available, _ = seasons
+    available.update(
+        {
+            2024: _session(2024),
+            2023: _session(2023),
+            2021: _session(2021, "Elsewhere Grand Prix", "Elsewhere"),
+        }
+    )
+
+    aligned, skipped = cross_year.get_cross_year_laps(
+        (2021, 2023, 2024), "Testville Grand Prix", "R", "Testville"
+    )
+
+    assert aligned.drivers == ["2024 D24", "2023 D23"]
+    assert skipped == {2021: "Elsewhere Grand Prix at Elsewhere, not Testville"}
+
+
+def test_load_failures_are_retried_on_the_next_call(seasons):
+    available, loads = seasons
+    available.update({2024: _session(2024), 2023: ConnectionError("timed out")})
+    request = ((2023, 2024), "Testville Grand Prix", "R", "Testville")
+
+    _, skipped = cross_year.get_cross_year_laps(*request)
+    assert skipped == {2023: "timed out"}
+
+    available[2023] = _session(2023)
+    aligned, skipped = cross_year.get_cross_year_laps(*request)
+    assert skipped == {}
+    assert aligned.drivers == ["2024 D24", "2023 D23"]
+
+    # Complete results are cached
+    cross_year.get_cross_year_laps(*request)
+    assert len(loads) == 2
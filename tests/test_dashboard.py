@@ -0,0 +1,123 @@
+import threading
+from dataclasses import dataclass
+
+import pytest
+
+from app.plots.comparison import figure_to_png_bytes
+from app.plots.rendering import subplots
+from app.services import dashboard
+
+
+@dataclass(frozen=True)
+class Selection:
+    analysis_type: str
+
+
+class StubSession:
+    pass
+
+
+@pytest.fixture
+def shared_inputs(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def compute(session):
+        with lock:
+            calls.append(session)
+        return "shared"
+
+    monkeypatch.setitem(dashboard.SHARED_INPUTS, "lap_telemetry", compute)
+    monkeypatch.setattr(dashboard, "prepare_dataset", lambda session, selection: None)
+    return calls
+
+
+def render(session, selection):
+    fig, ax = subplots(figsize=(2, 2))
+    ax.plot([0, 1], [1, 0])
+    ax.set_title(selection.analysis_type)
+    return fig
+
+
+def test_plan_inputs_lists_each_input_once():
+    assert dashboard.plan_inputs(["Fastest Lap", "Full Telemetry", "Speed Map"]) == [
+        "lap_telemetry",
+        "track_geometry",
+    ]
+    assert dashboard.plan_inputs(["Unknown"]) == []
+
+
+def test_panels_share_inputs_and_render_concurrently(shared_inputs):
+    session = StubSession()
+    selections = [Selection("Fastest Lap"), Selection("Full Telemetry"), Selection("Lap Times")]
+    # Every panel must be inside render() at once, which a global figure lock would prevent
+    barrier = threading.Barrier(len(selections), timeout=10)
+
+    def render_together(session, selection):
+        barrier.wait()
+        return render(session, selection)
+
+    results = list(
+        dashboard.render_panels(
+            session, selections, render_together, figure_to_png_bytes, lambda selection: None
+        )
+    )
+
+    assert shared_inputs == [session]
+    assert sorted(result.selection.analysis_type for result in results) == sorted(
+        selection.analysis_type for selection in selections
+    )
+    for result in results:
+        assert result.error is None
+        assert result.image.startswith(b"\x89PNG")
+
+
+def test_panel_errors_are_reported_per_panel(shared_inputs):
+    def validate(selection):
+        return "Not for this session." if selection.analysis_type == "Lap Times" else None
+
+    def render_or_fail(session, selection):
+        if selection.analysis_type == "Full Telemetry":
+            raise ValueError("No position data.")
+        return render(session, selection)
+
+    results = {
+        result.selection.analysis_type: result
+        for result in dashboard.render_panels(
+            StubSession(),
+            [Selection("Lap Times"), Selection("Full Telemetry"), Selection("Fastest Lap")],
+            render_or_fail,
+            figure_to_png_bytes,
+            validate,
+        )
+    }
+
+    assert str(results["Lap Times"].error) == "Not for this session."
+    assert str(results["Full Telemetry"].error) == "No position data."
+    assert results["Fastest Lap"].error is None
+    assert results["Fastest Lap"].image
+
+
+def test_no_selections_render_nothing():
+    assert list(dashboard.render_panels(StubSession(), [], render, figure_to_png_bytes, None)) == []
+
+
+def test_panels_over_the_artist_budget_are_rasterised(shared_inputs):
+    def render_dense(session, selection):
+        fig, ax = subplots(figsize=(2, 2))
+        for offset in range(2000):
+            ax.plot([0, 1], [offset, offset + 1])
+        return fig
+
+    figures = []
+
+    def to_image(fig):
+        figures.append(fig)
+        return b""
+
+    (result,) = dashboard.render_panels(
+        StubSession(), [Selection("Lap Times")], render_dense, to_image, lambda selection: None
+    )
+
+    assert result.error is None
+    assert all(line.get_rasterized() for line in figures[0].axes[0].lines)
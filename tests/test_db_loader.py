@@ -0,0 +1,162 @@
+import importlib.util
+import re
+from pathlib import Path
+
+import pytest
+
+
+LOADER_PATH = Path(__file__).resolve().parents[1] / "old_db" / "src" / "db_loader.py"
+
+
+@pytest.fixture
+def db_loader():
+    spec = importlib.util.spec_from_file_location("db_loader", LOADER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Catalog:
+    """The few statements the loader runs on its admin connection, over two dicts.
+
+    ``constraints`` stands in for ``pg_constraint`` and ``saved`` for the
+    ``etl_foreign_keys`` table; changes apply on commit like a transaction.
+    """
+
+    def __init__(self, constraints):
+        self.constraints = dict(constraints)
+        self.saved = {}
+        self._pending = None
+
+    def cursor(self):
+        return Cursor(self)
+
+    def state(self):
+        if self._pending is None:
+            self._pending = (dict(self.constraints), dict(self.saved))
+        return self._pending
+
+    def commit(self):
+        if self._pending is not None:
+            self.constraints, self.saved = self._pending
+            self._pending = None
+
+    def rollback(self):
+        self._pending = None
+
+
+class Cursor:
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        constraints, saved = self.catalog.state()
+        sql = " ".join(sql.split())
+        if sql.startswith("SELECT conrelid"):
+            self.rows = [
+                (table, name, definition + ("" if valid else " NOT VALID"))
+                for (table, name), (definition, valid) in constraints.items()
+                if table in params[0]
+            ]
+        elif sql.startswith("INSERT INTO etl_foreign_keys"):
+            saved[params[:2]] = params[2]
+        elif sql.startswith("SELECT table_name, constraint_name, definition"):
+            self.rows = sorted(
+                (table, name, definition)
+                for (table, name), definition in saved.items()
+                if table in params[0]
+            )
+        elif sql.startswith("DELETE FROM etl_foreign_keys"):
+            saved.pop(tuple(params), None)
+        elif match := re.fullmatch(r"ALTER TABLE (\w+) DROP CONSTRAINT IF EXISTS (\w+)", sql):
+            constraints.pop(match.groups(), None)
+        elif match := re.fullmatch(
+            r"ALTER TABLE (\w+) ADD CONSTRAINT (\w+) (.+?)( NOT VALID)?", sql
+        ):
+            table, name, definition, not_valid = match.groups()
+            constraints[(table, name)] = (definition, not_valid is None)
+        else:
+            raise AssertionError(f"Unexpected statement: {sql}")
+
+    def fetchall(self):
+        return self.rows
+
+
+FOREIGN_KEYS = {
+    ("races", "races_year_fkey"): ("FOREIGN KEY (year) REFERENCES seasons(year)", True),
+    ("results", "results_race_id_fkey"): (
+        "FOREIGN KEY (race_id) REFERENCES races(race_id)",
+        True,
+    ),
+    ("results", "results_driver_id_fkey"): (
+        "FOREIGN KEY (driver_id) REFERENCES drivers(driver_id)",
+        True,
+    ),
+}
+TABLES = ["seasons", "circuits", "drivers", "races", "results"]
+
+
+def _copy_table(failing=()):
+    def copy_table(engine, table, file):
+        if table in failing:
+            raise RuntimeError(f"{table}.csv is truncated")
+        return {"table": table, "rows": 1, "bytes": 1, "seconds": 0.0}
+
+    return copy_table
+
+
+def test_failed_load_keeps_foreign_keys_for_the_next_reload(db_loader, monkeypatch):
+    catalog = Catalog(FOREIGN_KEYS)
+
+    monkeypatch.setattr(db_loader, "copy_table", _copy_table(failing={"drivers"}))
+    _, failures = db_loader.load_bulk(None, catalog, TABLES)
+
+    assert set(failures) == {"drivers", "results"}
+    # Back, but unchecked over the partly loaded tables, and still saved
+    assert catalog.constraints == {
+        key: (definition, False) for key, (definition, _) in FOREIGN_KEYS.items()
+    }
+    assert set(catalog.saved) == set(FOREIGN_KEYS)
+
+    monkeypatch.setattr(db_loader, "copy_table", _copy_table())
+    _, failures = db_loader.load_bulk(None, catalog, TABLES)
+
+    assert failures == {}
+    assert catalog.constraints == FOREIGN_KEYS
+    assert catalog.saved == {}
+
+
+def test_interrupted_load_restores_foreign_keys_on_the_next_run(db_loader, monkeypatch):
+    catalog = Catalog(FOREIGN_KEYS)
+    # A load that died right after dropping the constraints
+    db_loader.drop_foreign_keys(catalog, db_loader.save_foreign_keys(catalog, TABLES))
+    assert catalog.constraints == {}
+
+    monkeypatch.setattr(db_loader, "copy_table", _copy_table())
+    _, failures = db_loader.load_bulk(None, catalog, TABLES)
+
+    assert failures == {}
+    assert catalog.constraints == FOREIGN_KEYS
+    assert catalog.saved == {}
+
+
+def test_unexpected_errors_still_restore_foreign_keys(db_loader, monkeypatch):
+    catalog = Catalog(FOREIGN_KEYS)
+
+    def crash(tables, load_table):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(db_loader, "run_in_dependency_order", crash)
+    with pytest.raises(KeyboardInterrupt):
+        db_loader.load_bulk(None, catalog, TABLES)
+
+    assert set(catalog.constraints) == set(FOREIGN_KEYS)
+    assert not any(valid for _, valid in catalog.constraints.values())
+    assert set(catalog.saved) == set(FOREIGN_KEYS)
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from app.services import history
+
+
+@pytest.fixture
+def history_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "history.sqlite"
+    monkeypatch.setattr(history, "HISTORY_DB_PATH", db_path)
+    monkeypatch.setattr(history, "_STORES", {})
+    return db_path
+
+
+def _build(db_path, value, mtime_ns):
+    # Written aside and renamed into place, like build_history_store
+    staging = db_path.with_suffix(".tmp")
+    with closing(sqlite3.connect(staging)) as conn:
+        conn.execute("CREATE TABLE meta (value INTEGER)")
+        conn.execute("INSERT INTO meta VALUES (?)", (value,))
+        conn.commit()
+    os.replace(staging, db_path)
+    os.utime(db_path, ns=(mtime_ns, mtime_ns))
+
+
+def _value(store):
+    return int(store.query("SELECT value FROM meta").iloc[0, 0])
+
+
+def _closed(conn):
+    try:
+        conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+def test_rebuild_closes_the_previous_store(history_db):
+    _build(history_db, 1, 1_000_000_000)
+    first = history.get_history_store()
+    assert _value(first) == 1
+    assert history.get_history_store() is first
+    connections = list(first._idle)
+
+    _build(history_db, 2, 2_000_000_000)
+    second = history.get_history_store()
+
+    assert second is not first
+    assert _value(second) == 2
+    assert all(_closed(conn) for conn in connections)
+    # A query cached under the old version must not reopen the old pool
+    assert history._open_history_store(history_db, 1_000_000_000) is second
+
+
+def test_connection_in_use_is_closed_when_returned(history_db):
+    _build(history_db, 1, 1_000_000_000)
+    store = history.get_history_store()
+
+    with store.connection() as conn:
+        store.close()
+        assert conn.execute("SELECT value FROM meta").fetchone() == (1,)
+    assert _closed(conn)
+    # Late callers still get an answer from a one-off connection
+    assert _value(store) == 1
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from app.services.ideal_lap import build_minisector_times, get_valid_timed_laps
+from app.services.telemetry import build_lap_telemetry
+
+
+def _session_frames(sample_step=0.27):
+    # Car data is sampled off the lap boundaries, like the live feed
+    laps, car_data = [], {}
+    for number, driver in (("1", "AAA"), ("2", "BBB")):
+        start = 10.0
+        for lap_number, lap_time in enumerate((91.3, 90.8, 92.1), start=1):
+            laps.append(
+                {
+                    "Driver": driver,
+                    "DriverNumber": number,
+                    "LapNumber": float(lap_number),
+                    "LapStartTime": pd.to_timedelta(start, unit="s"),
+                    "Time": pd.to_timedelta(start + lap_time, unit="s"),
+                    "LapTime": pd.to_timedelta(lap_time, unit="s"),
+                    "Deleted": False,
+                }
+            )
+            start += lap_time
+        seconds = np.arange(10.0 + 0.11 * int(number), start, sample_step)
+        car_data[number] = pd.DataFrame(
+            {
+                "SessionTime": pd.to_timedelta(seconds, unit="s"),
+                "Speed": 200.0 + 40.0 * np.sin(seconds / 7.0),
+            }
+        )
+    return pd.DataFrame(laps), car_data
+
+
+def test_minisectors_add_up_to_lap_time():
+    laps, car_data = _session_frames()
+    timed = get_valid_timed_laps(laps)
+    times = build_minisector_times(build_lap_telemetry(laps, car_data), timed, count=25)
+
+    merged = times.merge(
+        timed.assign(LapNumber=timed["LapNumber"].astype(int)), on=["Driver", "LapNumber"]
+    )
+    minisectors = merged[list(range(1, 26))]
+    assert len(merged) == len(laps)
+    assert (minisectors >= 0).all().all()
+    np.testing.assert_allclose(
+        minisectors.sum(axis=1), merged["LapTime"].dt.total_seconds(), atol=1e-9
+    )
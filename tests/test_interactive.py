@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.state import AnalysisSelection
+from app.plots.interactive import build_interactive_chart, decimate_series
+
+
+class Event(dict):
+    year = 2024
+
+
+def _session(**tables):
+    return SimpleNamespace(event=Event(EventName="Testville Grand Prix"), **tables)
+
+
+def _selection(analysis_type, drivers=()):
+    return AnalysisSelection("R", analysis_type, tuple(drivers), None, True, (), True)
+
+
+def test_decimate_series_keeps_short_series():
+    frame = pd.DataFrame({"Driver": ["A"] * 10, "Distance": np.arange(10.0), "Speed": np.arange(10.0)})
+    assert decimate_series(frame, "Distance", "Speed", ["Driver"], max_points=20).equals(frame)
+
+
+def test_decimate_series_bounds_points_and_keeps_extremes():
+    distance = np.arange(20_000.0)
+    speed = np.sin(distance / 300.0) * 100
+    speed[12_345] = 500.0
+    frame = pd.DataFrame(
+        {
+            "Driver": np.repeat(["A", "B"], len(distance)),
+            "Distance": np.tile(distance, 2),
+            "Speed": np.tile(speed, 2),
+        }
+    )
+
+    decimated = decimate_series(frame, "Distance", "Speed", ["Driver"], max_points=400)
+
+    counts = decimated.groupby("Driver").size()
+    assert (counts <= 400).all()
+    for _, series in decimated.groupby("Driver"):
+        assert series["Speed"].max() == 500.0
+        assert series["Speed"].min() == speed.min()
+        assert series["Distance"].is_monotonic_increasing
+
+
+def test_lap_time_chart_covers_selected_drivers():
+    laps = pd.DataFrame(
+        {
+            "Driver": ["AAA", "AAA", "BBB", "CCC"],
+            "LapNumber": [1.0, 2.0, 1.0, 1.0],
+            "LapTime": pd.to_timedelta([91.2, 90.4, None, 92.0], unit="s"),
+        }
+    )
+    data, spec = build_interactive_chart(_session(laps=laps), _selection("Lap Times", ["AAA", "BBB"]))
+
+    assert data["Driver"].tolist() == ["AAA", "AAA"]
+    assert data["LapTime"].tolist() == pytest.approx([91.2, 90.4])
+    assert spec["encoding"]["color"]["scale"]["domain"] == ["AAA", "BBB"]
+    assert spec["params"][0]["bind"] == "scales"
+
+
+def test_weather_chart_needs_weather_data():
+    with pytest.raises(ValueError, match="No weather data"):
+        build_interactive_chart(
+            _session(weather_data=pd.DataFrame()), _selection("Weather and Track Evolution")
+        )
+
+
+def test_weather_chart_labels_available_metrics():
+    weather = pd.DataFrame(
+        {
+            "Time": pd.to_timedelta(np.arange(0, 600, 60), unit="s"),
+            "TrackTemp": np.linspace(30, 35, 10),
+            "AirTemp": np.linspace(20, 21, 10),
+        }
+    )
+    data, spec = build_interactive_chart(
+        _session(weather_data=weather), _selection("Weather and Track Evolution")
+    )
+
+    assert set(data["Metric"]) == {"Track Temp (C)", "Air Temp (C)"}
+    assert len(data) == 20
+    assert spec["title"] == "2024 Testville Grand Prix Weather and Track Evolution"
@@ -0,0 +1,177 @@
+import pickle
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.plots.rendering import subplots
+from app.services import render_jobs
+from app.services.render_jobs import (
+    Overloaded,
+    RenderService,
+    fixture_name,
+    fixture_session_loader,
+    parse_render_request,
+)
+
+
+def _payload(**fields):
+    return {
+        "year": 2024,
+        "event_name": "Testville Grand Prix",
+        "session_type": "R",
+        "analysis_type": "Lap Times",
+        **fields,
+    }
+
+
+def _job(analysis="Lap Times", output="png", **fields):
+    return parse_render_request(
+        _payload(**{"driver_codes": ["AAA", "BBB"], **fields}, analysis_type=analysis, format=output)
+    )
+
+
+class GatedRender:
+    """Stub ``render`` that blocks until released and counts its calls."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, session, selection):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(10)
+        fig, ax = subplots(figsize=(1, 1))
+        ax.plot([0, 1], [0, 1])
+        return fig
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    session = SimpleNamespace(name="R")
+    path = tmp_path / fixture_name(2024, "Testville Grand Prix", "R")
+    path.write_bytes(pickle.dumps(session))
+    return tmp_path
+
+
+@pytest.fixture
+def make_service(session_dir):
+    services = []
+
+    def make(render, **limits):
+        service = RenderService(fixture_session_loader(session_dir), render, **limits)
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.shutdown()
+
+
+def test_parse_render_request_rejects_bad_payloads():
+    with pytest.raises(ValueError, match="JSON object"):
+        parse_render_request([])
+    with pytest.raises(ValueError, match="Missing request fields: event_name"):
+        parse_render_request({**_payload(), "event_name": ""})
+    with pytest.raises(ValueError, match="Unknown request fields: colour"):
+        _job(colour="red")
+    with pytest.raises(ValueError, match="Unsupported format"):
+        _job(output="svg")
+    with pytest.raises(ValueError, match="Unknown analysis type"):
+        parse_render_request(_payload(analysis_type="Bogus"), ["Lap Times"])
+
+
+def test_identical_jobs_share_one_render(make_service):
+    render = GatedRender()
+    service = make_service(render, workers=1, queue_size=0, client_limit=2)
+
+    first, first_shared = service.submit("a", _job())
+    second, second_shared = service.submit("b", _job())
+    render.release.set()
+
+    assert (first_shared, second_shared) == (False, True)
+    assert first is second
+    assert first.result(10).body.startswith(b"\x89PNG")
+    assert render.calls == 1
+    assert service.stats["deduplicated"] == 1
+
+
+def test_distinct_jobs_beyond_capacity_are_rejected(make_service):
+    render = GatedRender()
+    service = make_service(render, workers=1, queue_size=1, client_limit=5)
+
+    service.submit("a", _job())
+    service.submit("a", _job(driver_codes=["AAA", "CCC"]))
+    with pytest.raises(Overloaded, match="queue is full"):
+        service.submit("a", _job(driver_codes=["BBB", "CCC"]))
+    # Joining a job already in flight needs no new slot
+    service.submit("b", _job())
+    render.release.set()
+
+    assert service.stats["rejected_queue"] == 1
+
+
+def test_client_limit_counts_waiting_renders(make_service):
+    render = GatedRender()
+    service = make_service(render, workers=2, queue_size=2, client_limit=1)
+
+    service.submit("a", _job())
+    with pytest.raises(Overloaded, match="1 renders in progress"):
+        service.submit("a", _job())
+    service.submit("b", _job())
+    render.release.set()
+
+    assert service.stats["rejected_client"] == 1
+
+
+def test_timed_out_render_releases_the_client(make_service):
+    render = GatedRender()
+    service = make_service(render, workers=1, queue_size=1, client_limit=1)
+
+    with pytest.raises(FutureTimeoutError):
+        service.render("a", _job(), timeout=0.05)
+    assert service.snapshot()["active_clients"] == 0
+
+    # The client may wait again, and shares the render still running
+    render.release.set()
+    result, shared = service.render("a", _job(), timeout=10)
+    assert shared
+    assert result.content_type == "image/png"
+
+
+def test_png_output_skips_the_dataset(make_service, monkeypatch):
+    monkeypatch.setattr(
+        render_jobs, "prepare_dataset", lambda *args: pytest.fail("dataset built for png")
+    )
+    render = GatedRender()
+    render.release.set()
+    service = make_service(render)
+
+    result, _ = service.render("a", _job(), timeout=10)
+    assert result.body.startswith(b"\x89PNG")
+
+
+def test_csv_output_comes_from_the_dataset(make_service, monkeypatch):
+    monkeypatch.setattr(
+        render_jobs,
+        "prepare_dataset",
+        lambda session, selection: pd.DataFrame({"Driver": ["AAA"], "LapTime": [91.2]}),
+    )
+    service = make_service(lambda *args: pytest.fail("figure rendered for csv"))
+
+    result, _ = service.render("a", _job(output="csv"), timeout=10)
+    assert result.content_type == "text/csv"
+    assert result.body.decode().splitlines()[0] == "Driver,LapTime"
+
+
+def test_invalid_selections_fail_with_value_error(make_service):
+    service = make_service(lambda *args: pytest.fail("rendered an invalid selection"))
+
+    with pytest.raises(ValueError, match="only available for Qualifying"):
+        service.render("a", _job("Qualifying Overview"), timeout=10)
+    with pytest.raises(ValueError, match="No fixture session"):
+        service.render("a", _job(year=2023), timeout=10)
@@ -0,0 +1,57 @@
+from contextlib import closing
+from functools import partial
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.plots import season as season_plot
+from app.services import season
+
+
+def _session(year=2024):
+    return SimpleNamespace(event=SimpleNamespace(year=year))
+
+
+@pytest.fixture
+def season_db(tmp_path, monkeypatch):
+    db_path = tmp_path / "season.sqlite"
+    monkeypatch.setattr(
+        season_plot, "get_season_summaries", partial(season.get_season_summaries, db_path=db_path)
+    )
+    monkeypatch.setattr(season_plot, "get_team_color", lambda session, driver: "#888888")
+    # Rendering must never fetch or process sessions
+    monkeypatch.setattr(season, "get_pending_sessions", lambda *args: pytest.fail("updated"))
+    return db_path
+
+
+def _summary(round_number, session_type, rows):
+    summary = pd.DataFrame(
+        rows, columns=["driver", "team", "position", "teammate_gap", "pace_rank"]
+    )
+    summary["year"] = 2024
+    summary["round"] = round_number
+    summary["session_type"] = session_type
+    summary["event_name"] = f"Round {round_number}"
+    return summary.reindex(columns=season._SUMMARY_COLUMNS)
+
+
+def test_season_overview_reads_persisted_summaries(season_db):
+    with closing(season._connect(season_db)) as conn:
+        for round_number in (1, 2):
+            qualifying = [("AAA", "Red", 1, -0.1, None), ("BBB", "Red", 2, 0.1, None)]
+            race = [("AAA", "Red", 1, None, 2), ("BBB", "Red", 2, None, 1)]
+            for session_type, rows in (("Q", qualifying), ("R", race)):
+                season.save_session_summary(
+                    conn,
+                    _summary(round_number, session_type, rows),
+                    (2024, round_number, session_type),
+                )
+
+    fig = season_plot.plot_season_overview(_session())
+    assert fig._suptitle.get_text() == "2024 Season Overview, 2 rounds"
+
+
+def test_season_overview_without_summaries_points_to_the_update(season_db):
+    with pytest.raises(ValueError, match="python -m app.services.season 2023"):
+        season_plot.plot_season_overview(_session(2023))
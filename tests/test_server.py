@@ -0,0 +1,194 @@
+import http.client
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app import server
+from app.plots.rendering import subplots
+from app.services.render_jobs import RenderService
+
+
+PAYLOAD = {
+    "year": 2024,
+    "event_name": "Testville Grand Prix",
+    "session_type": "R",
+    "analysis_type": "Lap Times",
+    "driver_codes": ["AAA", "BBB"],
+}
+
+
+class GatedRender:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def __call__(self, session, selection):
+        assert self.release.wait(10)
+        fig, ax = subplots(figsize=(1, 1))
+        ax.plot([0, 1], [0, 1])
+        return fig
+
+
+def _load_session(year, event_name, session_type):
+    if year != 2024:
+        raise ValueError(f"No fixture session for {year}.")
+    return SimpleNamespace(name=session_type)
+
+
+@pytest.fixture
+def serve():
+    running = []
+
+    def start(render, **limits):
+        service = RenderService(_load_session, render, **limits)
+        httpd = server.make_server(service, host="127.0.0.1", port=0)
+        threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+        running.append((httpd, service))
+        return service, httpd.server_address[1]
+
+    yield start
+    for httpd, service in running:
+        httpd.shutdown()
+        httpd.server_close()
+        service.shutdown()
+
+
+def _request(port, method, path, body=None, client="tests"):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    if body is not None and not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    connection.request(method, path, body=body, headers={"X-Client-Id": client})
+    response = connection.getresponse()
+    result = response.status, dict(response.getheaders()), response.read()
+    connection.close()
+    return result
+
+
+def _render_in_background(port, client):
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(_request(port, "POST", "/render", PAYLOAD, client))
+    )
+    thread.start()
+    return thread, results
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 10
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_renders_png_and_reports_health(serve):
+    render = GatedRender()
+    render.release.set()
+    service, port = serve(render)
+
+    status, headers, body = _request(port, "POST", "/render", PAYLOAD)
+    assert status == 200
+    assert headers["Content-Type"] == "image/png"
+    assert headers["X-Deduplicated"] == "0"
+    assert float(headers["X-Render-Seconds"]) >= 0
+    assert body.startswith(b"\x89PNG")
+
+    status, _, body = _request(port, "GET", "/health")
+    assert status == 200
+    assert json.loads(body)["submitted"] == 1
+
+
+def test_identical_requests_are_deduplicated(serve):
+    render = GatedRender()
+    service, port = serve(render, workers=1, queue_size=0)
+
+    first, first_results = _render_in_background(port, "a")
+    _wait_for(lambda: service.stats["submitted"] == 1)
+    second, second_results = _render_in_background(port, "b")
+    _wait_for(lambda: service.stats["deduplicated"] == 1)
+    render.release.set()
+    first.join(10)
+    second.join(10)
+
+    (first_status, first_headers, first_body), = first_results
+    (second_status, second_headers, second_body), = second_results
+    assert (first_status, second_status) == (200, 200)
+    assert (first_headers["X-Deduplicated"], second_headers["X-Deduplicated"]) == ("0", "1")
+    assert first_body == second_body
+
+
+def test_overloaded_requests_get_429(serve):
+    render = GatedRender()
+    service, port = serve(render, workers=1, queue_size=0, client_limit=1)
+
+    waiting, results = _render_in_background(port, "a")
+    _wait_for(lambda: service.stats["submitted"] == 1)
+
+    # Same client over its limit, then another client with a new job over capacity
+    status, headers, body = _request(port, "POST", "/render", PAYLOAD, "a")
+    assert status == 429
+    assert headers["Retry-After"] == str(server.RETRY_AFTER_SECONDS)
+    assert "renders in progress" in json.loads(body)["error"]
+
+    other_job = {**PAYLOAD, "driver_codes": ["CCC"]}
+    status, headers, body = _request(port, "POST", "/render", other_job, "b")
+    assert status == 429
+    assert json.loads(body)["error"] == "The render queue is full."
+
+    render.release.set()
+    waiting.join(10)
+    assert results[0][0] == 200
+
+
+def test_timed_out_request_gets_504_and_frees_the_client(serve, monkeypatch):
+    monkeypatch.setattr(server, "RENDER_TIMEOUT_SECONDS", 0.05)
+    render = GatedRender()
+    service, port = serve(render, client_limit=1)
+
+    status, _, _ = _request(port, "POST", "/render", PAYLOAD, "a")
+    assert status == 504
+    assert service.snapshot()["active_clients"] == 0
+
+    monkeypatch.setattr(server, "RENDER_TIMEOUT_SECONDS", 10)
+    render.release.set()
+    assert _request(port, "POST", "/render", PAYLOAD, "a")[0] == 200
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        (b"{not json", "Expecting property name"),
+        ([], "must be a JSON object"),
+        ({**PAYLOAD, "analysis_type": "Bogus"}, "Unknown analysis type"),
+        ({**PAYLOAD, "format": "svg"}, "Unsupported format"),
+    ],
+)
+def test_bad_requests_get_400(serve, body, message):
+    _, port = serve(GatedRender())
+
+    status, _, response = _request(port, "POST", "/render", body)
+    assert status == 400
+    assert message in json.loads(response)["error"]
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        ({**PAYLOAD, "analysis_type": "Qualifying Overview"}, "only available for Qualifying"),
+        ({**PAYLOAD, "year": 2023}, "No fixture session"),
+    ],
+)
+def test_unrenderable_requests_get_422(serve, body, message):
+    _, port = serve(GatedRender())
+
+    status, _, response = _request(port, "POST", "/render", body)
+    assert status == 422
+    assert message in json.loads(response)["error"]
+
+
+def test_unknown_paths_get_404(serve):
+    _, port = serve(GatedRender())
+
+    assert _request(port, "GET", "/render")[0] == 404
+    assert _request(port, "POST", "/health", PAYLOAD)[0] == 404
@@ -0,0 +1,87 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import sessions
+
+
+class StubSession:
+    f1_api_support = True
+    api_path = "/static/2024/2024-03-02_Testville_Grand_Prix/2024-03-02_Race/"
+
+    def __init__(self):
+        self.loaded = 0
+
+    def load(self):
+        self.loaded += 1
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sessions, "CACHE_DIR", tmp_path)
+    # Sizing the cache walks every file in it
+    monkeypatch.setattr(
+        sessions.ff1.Cache, "get_cache_info", lambda: pytest.fail("cache directory walked")
+    )
+    return tmp_path
+
+
+def _api(calls, names=("feed_a", "feed_b", "feed_c")):
+    def make(name):
+        def function(api_path):
+            calls.append((name, threading.current_thread().name))
+            if name == "feed_c":
+                raise RuntimeError("feed is down")
+
+        function.__name__ = name
+        return function
+
+    return SimpleNamespace(**{name: make(name) for name in names})
+
+
+def test_components_are_fetched_in_threads_before_load(cache_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(sessions, "ff1_api", _api(calls))
+    monkeypatch.setattr(
+        sessions, "SESSION_COMPONENTS", {"one": ("feed_a",), "two": ("feed_b", "feed_c")}
+    )
+    session = StubSession()
+
+    timings = sessions.load_session_components(session, max_workers=2)
+
+    assert session.loaded == 1
+    assert set(timings) == {"one", "two", "assemble"}
+    assert sorted(name for name, _ in calls) == ["feed_a", "feed_b", "feed_c"]
+    assert all(thread.startswith("fastf1-load") for _, thread in calls)
+    assert sessions.get_load_timings(session) == timings
+    # The probe only reads the cache
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_cached_components_are_skipped(cache_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(sessions, "ff1_api", _api(calls))
+    monkeypatch.setattr(sessions, "SESSION_COMPONENTS", {"one": ("feed_a",), "two": ("feed_b",)})
+    session = StubSession()
+    directory = cache_dir / "2024/2024-03-02_Testville_Grand_Prix/2024-03-02_Race"
+    directory.mkdir(parents=True)
+    (directory / "feed_a.ff1pkl").write_bytes(b"")
+
+    timings = sessions.load_session_components(session)
+
+    assert [name for name, _ in calls] == ["feed_b"]
+    assert set(timings) == {"two", "assemble"}
+
+
+def test_missing_api_functions_fall_back_to_load(cache_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(sessions, "ff1_api", _api(calls, names=("feed_a",)))
+    monkeypatch.setattr(sessions, "SESSION_COMPONENTS", {"one": ("feed_a",), "two": ("gone",)})
+    session = StubSession()
+
+    timings = sessions.load_session_components(session)
+
+    assert calls == []
+    assert session.loaded == 1
+    assert set(timings) == {"assemble"}